@@ -39,7 +39,9 @@ from tensorboard.backend import experiment_id
 from tensorboard.backend import experimental_plugin
 from tensorboard.backend import http_util
 from tensorboard.backend import path_prefix
+from tensorboard.backend import response_cache
 from tensorboard.backend import security_validator
+from tensorboard.compat.tensorflow_stub.io import gfile
 from tensorboard.plugins import base_plugin
 from tensorboard.plugins.core import core_plugin
 from tensorboard.util import tb_logging
@@ -49,6 +51,7 @@ DATA_PREFIX = "/data"
 PLUGIN_PREFIX = "/plugin"
 PLUGINS_LISTING_ROUTE = "/plugins_listing"
 PLUGIN_ENTRY_ROUTE = "/plugin_entry.html"
+CACHE_STATS_ROUTE = "/cache_stats"
 
 EXPERIMENTAL_PLUGINS_QUERY_PARAM = "experimentalPlugin"
 
@@ -143,6 +146,7 @@ def TensorBoardWSGIApp(
         experimental_plugins,
         auth_providers,
         experimental_middlewares,
+        response_cache_max_bytes=flags.response_cache_max_bytes,
     )
 
 
@@ -181,6 +185,7 @@ class TensorBoardWSGI:
         experimental_plugins=None,
         auth_providers=None,
         experimental_middlewares=None,
+        response_cache_max_bytes=0,
     ):
         """Constructs TensorBoardWSGI instance.
 
@@ -201,6 +206,9 @@ class TensorBoardWSGI:
           experimental_middlewares: Optional list of WSGI middlewares to apply
             directly around the core TensorBoard app itself. Defaults to `[]`.
             This parameter is experimental and may be reworked or removed.
+          response_cache_max_bytes: Maximum total size of the responses of
+            data routes to cache in memory until `data_provider` reports new
+            data, or 0 to disable the cache. Defaults to 0.
 
         Returns:
           A WSGI application for the set of all TBPlugin instances.
@@ -221,6 +229,9 @@ class TensorBoardWSGI:
         self._experimental_plugins = frozenset(experimental_plugins or ())
         self._auth_providers = auth_providers or {}
         self._extra_middlewares = list(experimental_middlewares or [])
+        self._response_cache_max_bytes = response_cache_max_bytes
+        # The `ResponseCache` of the app, if enabled; see `_create_wsgi_app`.
+        self._response_cache = None
         if self._path_prefix.endswith("/"):
             # Should have been fixed by `fix_flags`.
             raise ValueError(
@@ -233,6 +244,7 @@ class TensorBoardWSGI:
             # active.
             DATA_PREFIX + PLUGINS_LISTING_ROUTE: self._serve_plugins_listing,
             DATA_PREFIX + PLUGIN_ENTRY_ROUTE: self._serve_plugin_entry,
+            DATA_PREFIX + CACHE_STATS_ROUTE: self._serve_cache_stats,
         }
         unordered_prefix_routes = {}
 
@@ -325,6 +337,11 @@ class TensorBoardWSGI:
         app = self._route_request
         for middleware in self._extra_middlewares:
             app = middleware(app)
+        if self._data_provider is not None and self._response_cache_max_bytes:
+            app = response_cache.ResponseCacheMiddleware(
+                app, self._data_provider, self._response_cache_max_bytes
+            )
+            self._response_cache = app.cache
         app = auth_context_middleware.AuthContextMiddleware(
             app, self._auth_providers
         )
@@ -395,6 +412,36 @@ class TensorBoardWSGI:
             csp_scripts_sha256s=[script_sha],
         )
 
+    @wrappers.Request.application
+    def _serve_cache_stats(self, request):
+        """Serves a JSON object describing the use of in-memory caches.
+
+        This is meant for debugging. The object has the counters of the
+        response cache (or null if it is disabled), of the pool of local
+        file descriptors used to read event files, and of the caches of
+        each plugin, as given by `TBPlugin.cache_stats`.
+
+        Args:
+          request: The werkzeug.Request object.
+
+        Returns:
+          A werkzeug.Response object.
+        """
+        response_cache_stats = None
+        if self._response_cache is not None:
+            response_cache_stats = self._response_cache.stats()
+        plugin_cache_stats = {}
+        for plugin in self._plugins:
+            stats = plugin.cache_stats()
+            if stats:
+                plugin_cache_stats[plugin.plugin_name] = stats
+        result = {
+            "response_cache": response_cache_stats,
+            "local_file_pool": gfile.local_file_pool().stats(),
+            "plugins": plugin_cache_stats,
+        }
+        return http_util.Respond(request, result, "application/json")
+
     @wrappers.Request.application
     def _serve_plugins_listing(self, request):
         """Serves an object mapping plugin name to whether it is enabled.
@@ -21,6 +21,8 @@ import time
 
 
 from tensorboard.backend.event_processing import data_provider
+from tensorboard.backend.event_processing import ingest_cache
+from tensorboard.backend.event_processing import inotify_watcher
 from tensorboard.backend.event_processing import plugin_event_multiplexer
 from tensorboard.backend.event_processing import tag_types
 from tensorboard.compat import tf
@@ -30,6 +32,7 @@ from tensorboard.plugins.histogram import metadata as histogram_metadata
 from tensorboard.plugins.image import metadata as image_metadata
 from tensorboard.plugins.pr_curve import metadata as pr_curve_metadata
 from tensorboard.plugins.scalar import metadata as scalar_metadata
+from tensorboard.util import io_util
 from tensorboard.util import tb_logging
 
 
@@ -63,19 +66,34 @@ class LocalDataIngester(ingester.DataIngester):
         """
         tensor_size_guidance = dict(DEFAULT_TENSOR_SIZE_GUIDANCE)
         tensor_size_guidance.update(flags.samples_per_plugin)
+        cache = None
+        if flags.ingest_cache:
+            cache = ingest_cache.IngestCache(
+                flags.ingest_cache_dir or ingest_cache.default_cache_dir(),
+                flags.ingest_cache_max_bytes,
+            )
         self._multiplexer = plugin_event_multiplexer.EventMultiplexer(
             size_guidance=DEFAULT_SIZE_GUIDANCE,
             tensor_size_guidance=tensor_size_guidance,
             purge_orphaned_data=flags.purge_orphaned_data,
             max_reload_threads=flags.max_reload_threads,
+            decode_threads=flags.decode_threads,
             event_file_active_filter=_get_event_file_active_filter(flags),
             detect_file_replacement=flags.detect_file_replacement,
+            verify_crc=flags.verify_crc,
+            ingest_cache=cache,
+            max_reload_backoff_secs=flags.reload_max_backoff,
         )
         self._data_provider = data_provider.MultiplexerDataProvider(
             self._multiplexer, flags.logdir or flags.logdir_spec
         )
         self._reload_interval = flags.reload_interval
         self._reload_task = flags.reload_task
+        self._reload_watcher = flags.reload_watcher
+        # With `--reload_watcher=inotify`, the `InotifyWatcher` of the
+        # paths in `_watched_paths`; owned by the reload task.
+        self._watcher = None
+        self._watched_paths = set()
         if flags.logdir:
             self._path_to_run = {os.path.expanduser(flags.logdir): None}
         else:
@@ -97,15 +115,15 @@ class LocalDataIngester(ingester.DataIngester):
         """Starts ingesting data based on the ingester flag configuration."""
 
         def _reload():
+            if self._reload_watcher == "inotify" and self._reload_interval:
+                self._watcher = self._create_watcher()
             while True:
                 start = time.time()
                 logger.info("TensorBoard reload process beginning")
-                for path, name in self._path_to_run.items():
-                    self._multiplexer.AddRunsFromDirectory(path, name)
-                logger.info(
-                    "TensorBoard reload process: Reload the whole Multiplexer"
-                )
-                self._multiplexer.Reload()
+                if self._watcher is not None:
+                    self._reload_changed()
+                else:
+                    self._reload_all()
                 duration = time.time() - start
                 logger.info(
                     "TensorBoard done reloading. Load took %0.3f secs", duration
@@ -139,6 +157,83 @@ class LocalDataIngester(ingester.DataIngester):
         else:
             raise ValueError("unrecognized reload_task: %s" % self._reload_task)
 
+    def _reload_all(self):
+        """Walks all logdirs for new runs and reloads all runs."""
+        for path, name in self._path_to_run.items():
+            self._multiplexer.AddRunsFromDirectory(path, name)
+        logger.info("TensorBoard reload process: Reload the whole Multiplexer")
+        self._multiplexer.Reload()
+
+    def _create_watcher(self):
+        """Returns a new `InotifyWatcher`, or None to poll instead."""
+        for path in self._path_to_run:
+            if io_util.IsCloudPath(path) or _get_filesystem_scheme(path):
+                logger.warning(
+                    "Cannot watch non-local logdir %s; polling instead", path
+                )
+                return None
+        try:
+            return inotify_watcher.InotifyWatcher()
+        except (inotify_watcher.UnsupportedError, OSError) as e:
+            logger.warning("Cannot use inotify (%s); polling instead", e)
+            return None
+
+    def _reload_changed(self):
+        """Adds and reloads only the runs in directories that changed.
+
+        Logdirs are walked in full when they are first watched (including
+        once they come into existence), and whenever the watcher may have
+        missed changes.
+        """
+        if self._watcher.RescanNeeded():
+            logger.warning("Changes to logdirs were lost; walking them again")
+            self._watcher.Close()
+            self._watcher = self._create_watcher()
+            self._watched_paths = set()
+            if self._watcher is None:
+                self._reload_all()
+                return
+        dirty = self._watcher.TakeDirtyDirectories()
+        walked = False
+        for path, name in self._path_to_run.items():
+            if path in self._watched_paths:
+                prefix = os.path.join(path, "")
+                self._multiplexer.AddRunsFromDirectory(
+                    path,
+                    name,
+                    subdirectories=[
+                        d for d in dirty if d == path or d.startswith(prefix)
+                    ],
+                )
+                continue
+            try:
+                # Watch before walking, so that no change is missed.
+                self._watcher.AddTree(path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            except OSError as e:
+                logger.warning(
+                    "Cannot watch %s (%s); polling instead. Consider raising "
+                    "fs.inotify.max_user_watches.",
+                    path,
+                    e,
+                )
+                self._watcher.Close()
+                self._watcher = None
+                self._reload_all()
+                return
+            self._watched_paths.add(path)
+            self._multiplexer.AddRunsFromDirectory(path, name)
+            walked = True
+        if walked:
+            self._multiplexer.Reload()
+        else:
+            logger.info(
+                "TensorBoard reload process: Reload %d changed directories",
+                len(dirty),
+            )
+            self._multiplexer.ReloadPaths(dirty)
+
 
 def _get_event_file_active_filter(flags):
     """Returns a predicate for whether an event file load timestamp is active.
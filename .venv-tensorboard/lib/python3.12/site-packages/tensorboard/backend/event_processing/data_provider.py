@@ -20,8 +20,12 @@ import collections
 import json
 import random
 
+import numpy as np
+
 from tensorboard import errors
+from tensorboard.backend.event_processing import downsampling
 from tensorboard.compat.proto import summary_pb2
+from tensorboard.compat.proto import types_pb2
 from tensorboard.data import provider
 from tensorboard.util import tb_logging
 from tensorboard.util import tensor_util
@@ -99,6 +103,11 @@ class MultiplexerDataProvider(provider.DataProvider):
         # mostly harmless.
         return self._multiplexer.ActivePlugins()
 
+    def data_generation(self, ctx=None, *, experiment_id):
+        self._validate_context(ctx)
+        self._validate_experiment_id(experiment_id)
+        return self._multiplexer.Generation()
+
     def list_runs(self, ctx=None, *, experiment_id):
         self._validate_context(ctx)
         self._validate_experiment_id(experiment_id)
@@ -129,6 +138,7 @@ class MultiplexerDataProvider(provider.DataProvider):
         plugin_name,
         downsample=None,
         run_tag_filter=None,
+        downsample_strategy=None,
     ):
         self._validate_context(ctx)
         self._validate_experiment_id(experiment_id)
@@ -136,7 +146,18 @@ class MultiplexerDataProvider(provider.DataProvider):
         index = self._index(
             plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_SCALAR
         )
-        return self._read(_convert_scalar_event, index, downsample)
+        self._mark_requested(run_tag_filter, index)
+        result = {}
+        for run, tags_for_run in index.items():
+            result_for_run = {}
+            result[run] = result_for_run
+            for tag in tags_for_run:
+                columns = self._multiplexer.ScalarColumns(run, tag)
+                result_for_run[tag] = _convert_scalar_columns(
+                    columns,
+                    _scalar_indices(columns, downsample, downsample_strategy),
+                )
+        return result
 
     def read_last_scalars(
         self,
@@ -154,14 +175,47 @@ class MultiplexerDataProvider(provider.DataProvider):
         run_tag_to_last_scalar_datum = collections.defaultdict(dict)
         for run, tags_for_run in index.items():
             for tag, metadata in tags_for_run.items():
-                events = self._multiplexer.Tensors(run, tag)
-                if events:
-                    run_tag_to_last_scalar_datum[run][tag] = (
-                        _convert_scalar_event(events[-1])
-                    )
+                columns = self._multiplexer.ScalarColumns(run, tag)
+                if len(columns[0]):
+                    (datum,) = _convert_scalar_columns(columns, [-1])
+                    run_tag_to_last_scalar_datum[run][tag] = datum
 
         return run_tag_to_last_scalar_datum
 
+    def read_scalar_columns(
+        self,
+        ctx=None,
+        *,
+        experiment_id,
+        plugin_name,
+        downsample=None,
+        run_tag_filter=None,
+        downsample_strategy=None,
+    ):
+        self._validate_context(ctx)
+        self._validate_experiment_id(experiment_id)
+        self._validate_downsample(downsample)
+        index = self._index(
+            plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_SCALAR
+        )
+        self._mark_requested(run_tag_filter, index)
+        result = {}
+        for run, tags_for_run in index.items():
+            result_for_run = {}
+            result[run] = result_for_run
+            for tag in tags_for_run:
+                columns = self._multiplexer.ScalarColumns(run, tag)
+                (steps, wall_times, values) = columns
+                indices = _scalar_indices(
+                    columns, downsample, downsample_strategy
+                )
+                result_for_run[tag] = provider.ScalarColumns(
+                    steps=steps[indices],
+                    wall_times=wall_times[indices],
+                    values=values[indices],
+                )
+        return result
+
     def list_tensors(
         self, ctx=None, *, experiment_id, plugin_name, run_tag_filter=None
     ):
@@ -187,8 +241,22 @@ class MultiplexerDataProvider(provider.DataProvider):
         index = self._index(
             plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_TENSOR
         )
+        self._mark_requested(run_tag_filter, index)
         return self._read(_convert_tensor_event, index, downsample)
 
+    def _mark_requested(self, run_tag_filter, index):
+        """Prioritizes reloading the runs of a read that names its runs.
+
+        Reads of all runs, such as those of dashboards that show every
+        run, do not count as requests for any run in particular.
+
+        Args:
+          run_tag_filter: An `provider.RunTagFilter`, or `None`.
+          index: The result of `self._index(...)` for the read.
+        """
+        if run_tag_filter is not None and run_tag_filter.runs is not None:
+            self._multiplexer.MarkRunsRequested(index)
+
     def _index(self, plugin_name, run_tag_filter, data_class_filter):
         """List time series and metadata matching the given filters.
 
@@ -254,17 +322,11 @@ class MultiplexerDataProvider(provider.DataProvider):
             result_for_run = {}
             result[run] = result_for_run
             for tag, summary_metadata in tag_to_metadata.items():
-                max_step = None
-                max_wall_time = None
-                for event in self._multiplexer.Tensors(run, tag):
-                    if max_step is None or max_step < event.step:
-                        max_step = event.step
-                    if max_wall_time is None or max_wall_time < event.wall_time:
-                        max_wall_time = event.wall_time
+                stats = self._multiplexer.TagStats(run, tag)
                 summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
                 result_for_run[tag] = construct_time_series(
-                    max_step=max_step,
-                    max_wall_time=max_wall_time,
+                    max_step=stats.max_step,
+                    max_wall_time=stats.max_wall_time,
                     plugin_content=summary_metadata.plugin_data.content,
                     description=summary_metadata.summary_description,
                     display_name=summary_metadata.display_name,
@@ -272,18 +334,18 @@ class MultiplexerDataProvider(provider.DataProvider):
         return result
 
     def _read(self, convert_event, index, downsample):
-        """Helper to read scalar or tensor data from the multiplexer.
+        """Helper to read tensor data from the multiplexer.
 
         Args:
           convert_event: Takes `plugin_event_accumulator.TensorEvent` to
-            either `provider.ScalarDatum` or `provider.TensorDatum`.
+            `provider.TensorDatum`.
           index: The result of `self._index(...)`.
           downsample: Non-negative `int`; how many samples to return per
             time series.
 
         Returns:
           A dict of dicts of values returned by `convert_event` calls,
-          suitable to be returned from `read_scalars` or `read_tensors`.
+          suitable to be returned from `read_tensors`.
         """
         result = {}
         for run, tags_for_run in index.items():
@@ -308,21 +370,11 @@ class MultiplexerDataProvider(provider.DataProvider):
             result_for_run = {}
             result[run] = result_for_run
             for tag, metadata in tag_to_metadata.items():
-                max_step = None
-                max_wall_time = None
-                max_length = None
-                for event in self._multiplexer.Tensors(run, tag):
-                    if max_step is None or max_step < event.step:
-                        max_step = event.step
-                    if max_wall_time is None or max_wall_time < event.wall_time:
-                        max_wall_time = event.wall_time
-                    length = _tensor_size(event.tensor_proto)
-                    if max_length is None or length > max_length:
-                        max_length = length
+                stats = self._multiplexer.TagStats(run, tag)
                 result_for_run[tag] = provider.BlobSequenceTimeSeries(
-                    max_step=max_step,
-                    max_wall_time=max_wall_time,
-                    max_length=max_length,
+                    max_step=stats.max_step,
+                    max_wall_time=stats.max_wall_time,
+                    max_length=stats.max_length,
                     plugin_content=metadata.plugin_data.content,
                     description=metadata.summary_description,
                     display_name=metadata.display_name,
@@ -344,6 +396,7 @@ class MultiplexerDataProvider(provider.DataProvider):
         index = self._index(
             plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_BLOB_SEQUENCE
         )
+        self._mark_requested(run_tag_filter, index)
         result = {}
         for run, tags in index.items():
             result_for_run = {}
@@ -375,13 +428,11 @@ class MultiplexerDataProvider(provider.DataProvider):
         summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
         if summary_metadata.data_class != summary_pb2.DATA_CLASS_BLOB_SEQUENCE:
             raise errors.NotFoundError(blob_key)
-        tensor_events = self._multiplexer.Tensors(run, tag)
         # In case of multiple events at this step, take first (arbitrary).
-        matching_step = next((e for e in tensor_events if e.step == step), None)
+        matching_step = self._multiplexer.TensorAtStep(run, tag, step)
         if not matching_step:
             raise errors.NotFoundError("%s: no such step %r" % (blob_key, step))
-        tensor = tensor_util.make_ndarray(matching_step.tensor_proto)
-        return tensor[index]
+        return _blob_at_index(matching_step.tensor_proto, index)
 
 
 # TODO(davidsoergel): deduplicate with other implementations
@@ -444,13 +495,27 @@ def _decode_blob_key(key):
     return (experiment_id, plugin_name, run, tag, step, index)
 
 
-def _convert_scalar_event(event):
-    """Helper for `read_scalars`."""
-    return provider.ScalarDatum(
-        step=event.step,
-        wall_time=event.wall_time,
-        value=tensor_util.make_ndarray(event.tensor_proto).item(),
-    )
+def _convert_scalar_columns(columns, indices):
+    """Helper for `read_scalars` and `read_last_scalars`.
+
+    Args:
+      columns: A tuple `(steps, wall_times, values)` of NumPy arrays, as
+        returned by `ScalarColumns`.
+      indices: A sequence of indices into the arrays of points to return.
+
+    Returns:
+      A list of `provider.ScalarDatum`s, one per index.
+    """
+    indices = np.asarray(indices, dtype=np.intp)
+    (steps, wall_times, values) = columns
+    return [
+        provider.ScalarDatum(step=step, wall_time=wall_time, value=value)
+        for (step, wall_time, value) in zip(
+            steps[indices].tolist(),
+            wall_times[indices].tolist(),
+            values[indices].tolist(),
+        )
+    ]
 
 
 def _convert_tensor_event(event):
@@ -504,6 +569,29 @@ def _tensor_size(tensor_proto):
     return result
 
 
+def _blob_at_index(tensor_proto, index):
+    """Extract a single element of a blob sequence tensor.
+
+    This is equivalent to `make_ndarray(tensor_proto)[index]`, but for the
+    usual encoding of blob sequences it reads just the requested element
+    rather than copying all blobs into a new array.
+
+    Args:
+      tensor_proto: A rank-1 `tensorboard.compat.proto.tensor_pb2.TensorProto`.
+      index: An `int` index into the tensor.
+
+    Returns:
+      The blob, as `bytes`.
+    """
+    if (
+        tensor_proto.dtype == types_pb2.DT_STRING
+        and len(tensor_proto.tensor_shape.dim) == 1
+        and len(tensor_proto.string_val) == _tensor_size(tensor_proto)
+    ):
+        return tensor_proto.string_val[index]
+    return tensor_util.make_ndarray(tensor_proto)[index]
+
+
 def _downsample(xs, k):
     """Downsample `xs` to at most `k` elements.
 
@@ -527,12 +615,45 @@ def _downsample(xs, k):
       `min(k, len(xs))` and that is guaranteed to include the last
       element of `xs`, uniformly selected among such subsequences.
     """
+    return [xs[i] for i in _downsample_indices(len(xs), k)]
+
+
+def _scalar_indices(columns, k, strategy):
+    """Returns the indices of the points of a scalar series to keep.
+
+    Args:
+      columns: A tuple `(steps, wall_times, values)` of NumPy arrays, as
+        returned by `ScalarColumns`.
+      k: A non-negative integer; the number of points to keep.
+      strategy: A `provider.DownsampleStrategy`, or `None` for the
+        default of `UNIFORM`.
+
+    Returns:
+      A sorted 1-D array of at most `k` indices into the columns.
+    """
+    (steps, _, values) = columns
+    if strategy == provider.DownsampleStrategy.LTTB:
+        return downsampling.lttb_indices(steps, values, k)
+    if strategy == provider.DownsampleStrategy.M4:
+        return downsampling.m4_indices(steps, values, k)
+    return np.asarray(_downsample_indices(len(steps), k), dtype=np.intp)
+
 
-    if k > len(xs):
-        return list(xs)
+def _downsample_indices(n, k):
+    """Returns the indices of the elements that `_downsample` would keep.
+
+    Args:
+      n: The length of the sequence to downsample.
+      k: A non-negative integer.
+
+    Returns:
+      A sorted list of `min(k, n)` indices into a sequence of length `n`.
+    """
+    if k > n:
+        return list(range(n))
     if k == 0:
         return []
-    indices = random.Random(0).sample(range(len(xs) - 1), k - 1)
+    indices = random.Random(0).sample(range(n - 1), k - 1)
     indices.sort()
-    indices += [len(xs) - 1]
-    return [xs[i] for i in indices]
+    indices += [n - 1]
+    return indices
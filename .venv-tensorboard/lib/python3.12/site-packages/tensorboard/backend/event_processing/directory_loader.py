@@ -101,6 +101,48 @@ class DirectoryLoader:
             else:
                 logger.info("Ignoring error during file loading: %s" % e)
 
+    def SaveState(self):
+        """Returns the position of this loader as plain data.
+
+        Returns:
+          A dict that can later be passed to `RestoreState` on a loader for
+          the same directory, or None if some file loader cannot save its
+          state. The "files" entry lists every file that has been read.
+        """
+        loader_states = {}
+        for path, loader in self._loaders.items():
+            loader_state = loader.SaveState()
+            if loader_state is None:
+                return None
+            loader_states[path] = loader_state
+        inactive = sorted(
+            path
+            for (path, timestamp) in self._max_timestamps.items()
+            if timestamp is _INACTIVE
+        )
+        max_timestamps = {
+            path: timestamp
+            for (path, timestamp) in self._max_timestamps.items()
+            if timestamp is not _INACTIVE
+        }
+        return {
+            "loaders": loader_states,
+            "max_timestamps": max_timestamps,
+            "inactive": inactive,
+            "files": sorted(set(loader_states) | set(self._max_timestamps)),
+        }
+
+    def RestoreState(self, state):
+        """Resumes loading from a position returned by `SaveState`."""
+        self._loaders = {}
+        for path, loader_state in state["loaders"].items():
+            loader = self._loader_factory(path)
+            loader.RestoreState(loader_state)
+            self._loaders[path] = loader
+        self._max_timestamps = dict(state["max_timestamps"])
+        for path in state["inactive"]:
+            self._max_timestamps[path] = _INACTIVE
+
     def _LoadPath(self, path):
         """Generator for values from a single path's loader.
 
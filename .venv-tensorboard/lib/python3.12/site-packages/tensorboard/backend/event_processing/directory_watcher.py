@@ -152,6 +152,40 @@ class DirectoryWatcher:
             # Advance to the next path and start over.
             self._SetPath(next_path)
 
+    def SaveState(self):
+        """Returns the position of this watcher as plain data.
+
+        Returns:
+          A dict that can later be passed to `RestoreState` on a watcher for
+          the same directory, or None if the current loader cannot save its
+          state. The "files" entry lists every file that has been read.
+        """
+        loader_state = None
+        if self._loader is not None:
+            loader_state = self._loader.SaveState()
+            if loader_state is None:
+                return None
+        files = sorted(self._finalized_sizes)
+        if self._path is not None and self._path not in self._finalized_sizes:
+            files.append(self._path)
+        return {
+            "path": self._path,
+            "loader": loader_state,
+            "finalized_sizes": dict(self._finalized_sizes),
+            "ooo_writes_detected": self._ooo_writes_detected,
+            "files": files,
+        }
+
+    def RestoreState(self, state):
+        """Resumes watching from a position returned by `SaveState`."""
+        self._finalized_sizes = dict(state["finalized_sizes"])
+        self._ooo_writes_detected = state["ooo_writes_detected"]
+        self._path = state["path"]
+        self._loader = None
+        if self._path is not None:
+            self._loader = self._loader_factory(self._path)
+            self._loader.RestoreState(state["loader"])
+
     # The number of paths before the current one to check for out of order writes.
     _OOO_WRITE_CHECK_COUNT = 20
 
@@ -0,0 +1,142 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Shape-preserving downsampling of scalar time series.
+
+Both functions here take the points of a series as parallel NumPy arrays
+and return the sorted indices of the points to keep, including the first
+and the last point if `k` leaves room for them, so that callers can
+gather any number of columns with the same indices.
+"""
+
+
+import numpy as np
+
+
+def lttb_indices(x, y, k):
+    """Selects points by Largest-Triangle-Three-Buckets.
+
+    The points between the first and the last are split into `k - 2`
+    buckets of equal count. From each bucket, the point forming the
+    largest triangle with the point selected from the previous bucket and
+    the average of the next bucket is kept. This preserves the visual
+    shape of the series, including isolated spikes.
+
+    See: Sveinn Steinarsson, "Downsampling Time Series for Visual
+    Representation" (2013).
+
+    Args:
+      x: A 1-D array of the x-coordinates (e.g., steps) of the points.
+      y: A 1-D array of the y-coordinates (values) of the points, of the
+        same length as `x`.
+      k: A non-negative integer; the maximum number of points to keep.
+
+    Returns:
+      A sorted 1-D `intp` array of `min(k, len(x))` indices.
+    """
+    n = len(x)
+    if k >= n:
+        return np.arange(n)
+    if k < 3:
+        return np.array([0, n - 1][2 - k :], dtype=np.intp)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket `i` holds the points `edges[i]:edges[i + 1]`.
+    edges = np.linspace(1, n - 1, k - 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[: n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[: n - 1], edges[:-1]) / counts
+    # The "next bucket" of the last bucket is the last point alone.
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+    result = np.empty(k, dtype=np.intp)
+    result[0] = 0
+    result[-1] = n - 1
+    a = 0
+    for i in range(k - 2):
+        lo = edges[i]
+        hi = edges[i + 1]
+        (ax, ay) = (x[a], y[a])
+        # Twice the area of the triangle (a, point, mean of next bucket),
+        # up to sign; the constant factor does not affect the argmax.
+        areas = np.abs(
+            (ax - mean_x[i]) * (y[lo:hi] - ay)
+            - (ax - x[lo:hi]) * (mean_y[i] - ay)
+        )
+        a = lo + int(np.argmax(areas))
+        result[i + 1] = a
+    return result
+
+
+def m4_indices(x, y, k):
+    """Selects the first, last, minimum and maximum point of each bucket.
+
+    The x-range of the series is split into `k // 4` buckets of equal
+    width (e.g., one per pixel column of a chart), and from each bucket
+    the first and last point and the points with the smallest and largest
+    y are kept. Rendering the kept points as a line gives the same pixels
+    as rendering all points. NaN values are ignored when selecting the
+    extrema.
+
+    If `x` is not sorted, points are assigned to buckets by x but "first"
+    and "last" refer to positions in the input. If all points have the
+    same x, points are bucketed by position instead.
+
+    See: Uwe Jugel et al., "M4: A Visualization-Oriented Time Series Data
+    Aggregation" (VLDB 2014).
+
+    Args:
+      x: A 1-D array of the x-coordinates (e.g., steps) of the points.
+      y: A 1-D array of the y-coordinates (values) of the points, of the
+        same length as `x`.
+      k: A non-negative integer; the maximum number of points to keep.
+
+    Returns:
+      A sorted 1-D `intp` array of at most `k` indices.
+    """
+    n = len(x)
+    if k >= n:
+        return np.arange(n)
+    if k < 4:
+        return lttb_indices(x, y, k)
+    num_buckets = k // 4
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    (x_min, x_max) = (np.min(x), np.max(x))
+    if not (np.isfinite(x_min) and np.isfinite(x_max)) or x_min == x_max:
+        x = np.arange(n, dtype=np.float64)
+        (x_min, x_max) = (0.0, n - 1.0)
+    buckets = ((x - x_min) * (num_buckets / (x_max - x_min))).astype(np.intp)
+    np.minimum(buckets, num_buckets - 1, out=buckets)
+    # Group the points by bucket, keeping them in input order within each
+    # bucket, so that each bucket is a contiguous range of `order`.
+    if np.all(buckets[1:] >= buckets[:-1]):
+        order = np.arange(n)
+    else:
+        order = np.argsort(buckets, kind="stable")
+        buckets = buckets[order]
+        y = y[order]
+    starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+    ends = np.append(starts[1:], n) - 1
+    sizes = ends - starts + 1
+    positions = np.arange(n)
+    kept = [starts, ends]
+    for reduce_fn in (np.fmin, np.fmax):
+        extrema = reduce_fn.reduceat(y, starts)
+        is_extremum = y == np.repeat(extrema, sizes)
+        candidates = np.where(is_extremum, positions, n)
+        first_extremum = np.minimum.reduceat(candidates, starts)
+        # Buckets with only NaN values have no extremum.
+        kept.append(np.where(first_extremum < n, first_extremum, starts))
+    return np.unique(order[np.concatenate(kept)])
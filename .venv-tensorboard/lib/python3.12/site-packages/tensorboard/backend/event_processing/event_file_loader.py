@@ -15,12 +15,18 @@
 
 """Functionality for loading events from a record file."""
 
+import collections
+import concurrent.futures
 import contextlib
+import functools
+import itertools
+import threading
 
 from tensorboard import data_compat
 from tensorboard import dataclass_compat
 from tensorboard.compat import tf
 from tensorboard.compat.proto import event_pb2
+from tensorboard.compat.proto import summary_pb2
 from tensorboard.util import platform_util
 from tensorboard.util import tb_logging
 
@@ -49,15 +55,36 @@ def _silence_deprecation_warnings():
         return _NULLCONTEXT
 
 
-def _make_tf_record_iterator(file_path):
-    """Returns an iterator over TF records for the given tfrecord file."""
+def _make_tf_record_iterator(file_path, verify_crc=None, start_offset=0):
+    """Returns an iterator over TF records for the given tfrecord file.
+
+    Args:
+      file_path: file path of the tfrecord file to read
+      verify_crc: Optional string, one of "all", "header" or "none", to
+        control which record checksums the stub reader verifies. Only
+        honored by the stub implementation; TensorFlow readers always
+        verify all checksums.
+      start_offset: byte offset of the record at which to start reading.
+        Not supported by the `tf_record_iterator` fallback.
+    """
     # If we don't have TF at all, use the stub implementation.
     if tf.__version__ == "stub":
         # TODO(#1711): Reshape stub implementation to fit tf_record_iterator API
         # rather than needlessly emulating the old PyRecordReader_New API.
         logger.debug("Opening a stub record reader pointing at %s", file_path)
+        py_record_reader_new = tf.pywrap_tensorflow.PyRecordReader_New
+        if verify_crc is not None:
+            py_record_reader_new = functools.partial(
+                py_record_reader_new, verify_crc=verify_crc
+            )
         return _PyRecordReaderIterator(
-            tf.pywrap_tensorflow.PyRecordReader_New, file_path
+            py_record_reader_new, file_path, start_offset
+        )
+    if verify_crc not in (None, "all"):
+        logger.debug(
+            "Ignoring verify_crc=%r for %s: only supported by the stub reader",
+            verify_crc,
+            file_path,
         )
     # If PyRecordReader exists, use it, otherwise use tf_record_iterator().
     # Check old first, then new, since tf_record_iterator existed previously but
@@ -74,8 +101,15 @@ def _make_tf_record_iterator(file_path):
         py_record_reader_new = None
     if py_record_reader_new:
         logger.debug("Opening a PyRecordReader pointing at %s", file_path)
-        return _PyRecordReaderIterator(py_record_reader_new, file_path)
+        return _PyRecordReaderIterator(
+            py_record_reader_new, file_path, start_offset
+        )
     else:
+        if start_offset:
+            raise ValueError(
+                "Cannot start reading %s at offset %d with tf_record_iterator"
+                % (file_path, start_offset)
+            )
         logger.debug("Opening a tf_record_iterator pointing at %s", file_path)
         # TODO(#1711): Find non-deprecated replacement for tf_record_iterator.
         with _silence_deprecation_warnings():
@@ -85,16 +119,20 @@ def _make_tf_record_iterator(file_path):
 class _PyRecordReaderIterator:
     """Python iterator for TF Records based on PyRecordReader."""
 
-    def __init__(self, py_record_reader_new, file_path):
+    def __init__(self, py_record_reader_new, file_path, start_offset=0):
         """Constructs a _PyRecordReaderIterator for the given file path.
 
         Args:
           py_record_reader_new: pywrap_tensorflow.PyRecordReader_New
           file_path: file path of the tfrecord file to read
+          start_offset: byte offset of the record at which to start reading
         """
         with tf.compat.v1.errors.raise_exception_on_not_ok_status() as status:
             self._reader = py_record_reader_new(
-                tf.compat.as_bytes(file_path), 0, tf.compat.as_bytes(""), status
+                tf.compat.as_bytes(file_path),
+                start_offset,
+                tf.compat.as_bytes(""),
+                status,
             )
         if not self._reader:
             raise IOError(
@@ -113,11 +151,23 @@ class _PyRecordReaderIterator:
 
     next = __next__  # for python2 compatibility
 
+    def offset(self):
+        """Returns the file offset just past the last record yielded."""
+        return self._reader.offset()
+
 
 class RawEventFileLoader:
-    """An iterator that yields Event protos as serialized bytestrings."""
+    """An iterator that yields Event protos as serialized bytestrings.
 
-    def __init__(self, file_path, detect_file_replacement=False):
+    With the stub (non-TensorFlow) record reader, records are yielded as
+    read-only `memoryview`s into the reader's block buffer rather than as
+    `bytes`, to avoid a copy per record. Callers that need to retain a
+    record should convert it with `bytes(...)`.
+    """
+
+    def __init__(
+        self, file_path, detect_file_replacement=False, verify_crc=None
+    ):
         """Constructs a RawEventFileLoader for the given file path.
 
         Args:
@@ -127,13 +177,17 @@ class RawEventFileLoader:
               that the file has grown, it will reopen the file entirely (while
               preserving the current offset) before attempting to read from it.
               Otherwise, Load() will simply poll at EOF for new data.
+          verify_crc: Optional string, one of "all", "header" or "none",
+              controlling which record checksums are verified on read. If not
+              provided, all checksums are verified.
         """
         if file_path is None:
             raise ValueError("A file path is required")
         self._file_path = platform_util.readahead_file_path(file_path)
         self._detect_file_replacement = detect_file_replacement
+        self._verify_crc = verify_crc
         self._file_size = None
-        self._iterator = _make_tf_record_iterator(self._file_path)
+        self._iterator = _make_tf_record_iterator(self._file_path, verify_crc)
         if self._detect_file_replacement and not hasattr(
             self._iterator, "reopen"
         ):
@@ -228,6 +282,26 @@ class RawEventFileLoader:
             self._file_size = previous_size
         return False
 
+    def SaveState(self):
+        """Returns the read position of this loader as plain data.
+
+        Returns:
+          A dict that can later be passed to `RestoreState` on a loader for
+          the same file, or None if the underlying record reader cannot
+          report its offset.
+        """
+        try:
+            offset = self._iterator.offset()
+        except AttributeError:
+            return None
+        return {"offset": offset, "files": [self._file_path]}
+
+    def RestoreState(self, state):
+        """Resumes reading from a position returned by `SaveState`."""
+        self._iterator = _make_tf_record_iterator(
+            self._file_path, self._verify_crc, state["offset"]
+        )
+
 
 class LegacyEventFileLoader(RawEventFileLoader):
     """An iterator that yields parsed Event protos."""
@@ -251,7 +325,17 @@ class EventFileLoader(LegacyEventFileLoader):
     Specifically, this includes `data_compat` and `dataclass_compat`.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, decode_threads=0, **kwargs):
+        """Constructs an EventFileLoader.
+
+        Args:
+          *args: Passed through to `RawEventFileLoader`.
+          decode_threads: Optional number of worker threads used to parse
+            and `data_compat`-migrate records in batches, pipelined with
+            reading. If 0 or None, records are decoded serially on the
+            calling thread. Events are yielded in file order either way.
+          **kwargs: Passed through to `RawEventFileLoader`.
+        """
         super().__init__(*args, **kwargs)
         # Track initial metadata for each tag, for `dataclass_compat`.
         # This is meant to be tracked per run, not per event file, so
@@ -265,8 +349,19 @@ class EventFileLoader(LegacyEventFileLoader):
         # file but does not clear the tag cache. This is considered
         # sufficiently improbable that we don't take extra mitigations.
         self._initial_metadata = {}  # from tag name to `SummaryMetadata`
+        self._decode_threads = decode_threads or 0
+        # Pipelined mode state. Batches of records that have been read but
+        # not yet yielded live here across `Load` calls, so that callers
+        # that stop iterating early (e.g., to peek at the first event) do
+        # not drop them.
+        self._pending_batches = collections.deque()  # of `Future`s
+        self._ready_events = collections.deque()  # of migrated `Event`s
 
     def Load(self):
+        if self._decode_threads > 0:
+            for event in self._LoadPipelined():
+                yield event
+            return
         for event in super().Load():
             event = data_compat.migrate_event(event)
             events = dataclass_compat.migrate_event(
@@ -275,6 +370,87 @@ class EventFileLoader(LegacyEventFileLoader):
             for event in events:
                 yield event
 
+    def SaveState(self):
+        if self._pending_batches or self._ready_events:
+            # Records were read ahead of the events yielded so far, so the
+            # reader offset does not describe what the caller has seen.
+            return None
+        state = super().SaveState()
+        if state is not None:
+            state["initial_metadata"] = {
+                tag: metadata.SerializeToString()
+                for (tag, metadata) in self._initial_metadata.items()
+            }
+        return state
+
+    def RestoreState(self, state):
+        super().RestoreState(state)
+        self._initial_metadata = {
+            tag: summary_pb2.SummaryMetadata.FromString(metadata)
+            for (tag, metadata) in state["initial_metadata"].items()
+        }
+
+    def _LoadPipelined(self):
+        """Loads events by decoding record batches on a thread pool.
+
+        The calling thread reads raw records and submits them in batches
+        to a shared executor, which parses them and applies `data_compat`.
+        Completed batches are consumed strictly in submission order, and
+        `dataclass_compat` (which depends on the first metadata seen for
+        each tag) is applied here on the calling thread, in file order.
+        """
+        executor = _get_decode_executor(self._decode_threads)
+        max_pending = 2 * self._decode_threads
+        records = RawEventFileLoader.Load(self)
+        exhausted = False
+        while True:
+            while self._ready_events:
+                yield self._ready_events.popleft()
+            while not exhausted and len(self._pending_batches) < max_pending:
+                batch = list(itertools.islice(records, _DECODE_BATCH_SIZE))
+                if not batch:
+                    exhausted = True
+                    break
+                self._pending_batches.append(
+                    executor.submit(_decode_records, batch)
+                )
+            if not self._pending_batches:
+                break
+            events = self._pending_batches.popleft().result()
+            for event in events:
+                self._ready_events.extend(
+                    dataclass_compat.migrate_event(
+                        event, self._initial_metadata
+                    )
+                )
+
+
+# Number of records per unit of work in pipelined `EventFileLoader` mode.
+_DECODE_BATCH_SIZE = 256
+
+_decode_executors = {}
+_decode_executors_lock = threading.Lock()
+
+
+def _get_decode_executor(num_threads):
+    """Returns a thread pool for decoding records, shared across loaders."""
+    with _decode_executors_lock:
+        executor = _decode_executors.get(num_threads)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=num_threads, thread_name_prefix="EventDecoder"
+            )
+            _decode_executors[num_threads] = executor
+        return executor
+
+
+def _decode_records(records):
+    """Parses serialized `Event`s and applies `data_compat` migration."""
+    return [
+        data_compat.migrate_event(event_pb2.Event.FromString(record))
+        for record in records
+    ]
+
 
 class TimestampedEventFileLoader(EventFileLoader):
     """An iterator that yields (UNIX timestamp float, Event proto) pairs."""
@@ -0,0 +1,222 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""On-disk cache of per-run ingestion state, to speed up restarts.
+
+Each run gets one snapshot file holding the post-sampling state of its
+`EventAccumulator` together with the read position of its event file
+loaders. Snapshots consist only of plain Python data (dicts, lists,
+tuples, strings, bytes and numbers; protos are stored serialized) and
+are read back with an unpickler that refuses to construct any other
+type.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from tensorboard import version
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+# Bump this whenever the layout of snapshot data changes.
+_FORMAT_VERSION = 2
+
+_SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def default_cache_dir():
+    """Returns the default directory for ingestion cache snapshots."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "tensorboard", "ingest")
+
+
+class IngestCache:
+    """A size-bounded directory of per-run ingestion snapshots.
+
+    Snapshots are keyed by run path. When the total size of the cache
+    exceeds `max_bytes`, the least recently used snapshots are evicted,
+    where "use" is either a save or a successful load.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, directory, max_bytes):
+        """Creates an `IngestCache`.
+
+        Args:
+          directory: Local directory in which to store snapshots. Created
+            on first save if it does not exist.
+          max_bytes: Maximum total size in bytes of all snapshots.
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._mutex = threading.Lock()
+        # Sizes of the snapshot files and their total, as of the last scan
+        # of the directory plus our own saves and removals since; guarded
+        # by `_mutex`. The directory is only scanned again once the total
+        # exceeds the limit, so that saving a snapshot does not cost time
+        # proportional to the number of runs.
+        self._sizes = {}
+        self._total_bytes = None
+
+    def Load(self, run_path):
+        """Returns the snapshot saved for `run_path`, or None.
+
+        Args:
+          run_path: The path of the run, as passed to `EventAccumulator`.
+
+        Returns:
+          The dict passed to the latest `Save` for this run, or None if
+          there is no usable snapshot.
+        """
+        filename = self._SnapshotPath(run_path)
+        try:
+            with open(filename, "rb") as f:
+                envelope = _RestrictedUnpickler(f).load()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", filename, e)
+            self._Remove(filename)
+            return None
+        if not (
+            isinstance(envelope, dict)
+            and envelope.get("format_version") == _FORMAT_VERSION
+            and envelope.get("tensorboard_version") == version.VERSION
+            and envelope.get("run_path") == run_path
+        ):
+            logger.info("Discarding stale snapshot %s", filename)
+            self._Remove(filename)
+            return None
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+        return envelope["state"]
+
+    def Save(self, run_path, state):
+        """Stores a snapshot for `run_path`, replacing any previous one.
+
+        Args:
+          run_path: The path of the run, as passed to `EventAccumulator`.
+          state: A dict of plain Python data.
+        """
+        envelope = {
+            "format_version": _FORMAT_VERSION,
+            "tensorboard_version": version.VERSION,
+            "run_path": run_path,
+            "state": state,
+        }
+        data = pickle.dumps(envelope, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self._max_bytes:
+            logger.info(
+                "Not caching %s: snapshot of %d bytes exceeds cache size",
+                run_path,
+                len(data),
+            )
+            self.Remove(run_path)
+            return
+        filename = self._SnapshotPath(run_path)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            # Write to a temporary file and rename, so that readers never
+            # see a partially written snapshot.
+            (fd, temp_filename) = tempfile.mkstemp(
+                dir=self._directory, suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_filename, filename)
+        except OSError as e:
+            logger.warning("Unable to save snapshot for %s: %s", run_path, e)
+            return
+        with self._mutex:
+            over_limit = self._total_bytes is None
+            if not over_limit:
+                self._total_bytes += len(data) - self._sizes.get(filename, 0)
+                self._sizes[filename] = len(data)
+                over_limit = self._total_bytes > self._max_bytes
+        if over_limit:
+            self._Evict()
+
+    def Remove(self, run_path):
+        """Deletes any snapshot saved for `run_path`."""
+        self._Remove(self._SnapshotPath(run_path))
+
+    def _SnapshotPath(self, run_path):
+        digest = hashlib.sha256(run_path.encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, digest + _SNAPSHOT_SUFFIX)
+
+    def _Remove(self, filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        with self._mutex:
+            size = self._sizes.pop(filename, None)
+            if size is not None:
+                self._total_bytes -= size
+
+    def _Evict(self):
+        """Deletes least recently used snapshots until under the limit."""
+        with self._mutex:
+            entries = []
+            try:
+                with os.scandir(self._directory) as it:
+                    for entry in it:
+                        if entry.name.endswith(_SNAPSHOT_SUFFIX):
+                            st = entry.stat()
+                            entries.append(
+                                (st.st_mtime, st.st_size, entry.path)
+                            )
+            except OSError as e:
+                logger.warning("Unable to list %s: %s", self._directory, e)
+                return
+            total = sum(size for (_, size, _) in entries)
+            entries.sort()
+            evicted = 0
+            for _, size, filename in entries:
+                if total <= self._max_bytes:
+                    break
+                logger.info("Evicting snapshot %s", filename)
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+                total -= size
+                evicted += 1
+            self._sizes = {
+                filename: size for (_, size, filename) in entries[evicted:]
+            }
+            self._total_bytes = total
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler that only admits builtin containers and scalars.
+
+    Those are encoded with dedicated pickle opcodes; anything requiring a
+    global lookup (i.e., any class or function) is rejected.
+    """
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(
+            "Refusing to load %s.%s from snapshot" % (module, name)
+        )
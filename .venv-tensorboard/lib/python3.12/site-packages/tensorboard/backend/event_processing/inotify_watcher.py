@@ -0,0 +1,250 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tracks changes to local directory trees with Linux inotify.
+
+Polling a logdir means listing every directory and reading every event
+file on each reload, even though most runs of a large logdir are done.
+An `InotifyWatcher` instead records which directories had files created,
+written, moved or deleted since it was last asked, so that only those
+need to be looked at again.
+
+inotify is accessed through `ctypes`, so this only works on Linux, and
+only for local filesystems (not, e.g., NFS changes made by other hosts).
+"""
+
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+# Constants from <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+
+# `struct inotify_event`, without its trailing name.
+_EVENT_HEADER = struct.Struct("iIII")
+
+_READ_SIZE = 1 << 20
+
+
+class UnsupportedError(Exception):
+    """Raised when inotify cannot be used on this platform."""
+
+    pass
+
+
+def _LoadLibc():
+    if not sys.platform.startswith("linux"):
+        raise UnsupportedError("inotify requires Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise UnsupportedError("libc lacks inotify")
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint32,
+    ]
+    return libc
+
+
+class InotifyWatcher:
+    """Records the directories of local trees whose contents changed.
+
+    A directory is "dirty" if a file or subdirectory was created, written,
+    moved or deleted directly within it, or if it was itself created,
+    moved or deleted. Subdirectories created within a watched tree are
+    watched as they appear, and they and their descendants are dirty.
+
+    Some changes cannot be tracked precisely: the kernel queue may
+    overflow, watched directories may be moved, or the per-user limit on
+    watches may be hit. `RescanNeeded` then returns true, and the caller
+    should look at the trees in full and start over with a new watcher.
+
+    This class is not thread-safe.
+    """
+
+    def __init__(self):
+        """Creates a watcher with no trees watched.
+
+        Raises:
+          UnsupportedError: If inotify is not available.
+          OSError: If an inotify instance cannot be created.
+        """
+        self._libc = _LoadLibc()
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        self._wd_to_path = {}
+        self._dirty = set()
+        self._rescan_needed = False
+
+    def fileno(self):
+        """Returns the inotify file descriptor, e.g. for `select`."""
+        return self._fd
+
+    def Close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def AddTree(self, top):
+        """Watches a directory and all of its subdirectories.
+
+        Args:
+          top: Path of a local directory. Dirty directories within it are
+            reported as paths joined onto `top`, as by `os.walk`.
+
+        Raises:
+          FileNotFoundError: If `top` does not exist.
+          OSError: If watches cannot be added, e.g. because the limit on
+            the number of watches (`fs.inotify.max_user_watches`) is hit.
+        """
+        self._AddWatch(top)
+        for dir_path, dir_names, _ in os.walk(top):
+            for dir_name in dir_names:
+                self._AddWatchIfPresent(os.path.join(dir_path, dir_name))
+
+    def RescanNeeded(self):
+        """Returns whether some changes may not have been recorded."""
+        self._ReadEvents()
+        return self._rescan_needed
+
+    def TakeDirtyDirectories(self, timeout=0):
+        """Returns and forgets the directories that changed.
+
+        Args:
+          timeout: Maximum number of seconds to wait for a first change if
+            none has been recorded yet.
+
+        Returns:
+          A set of directory paths, some of which may no longer exist.
+        """
+        if not self._dirty and timeout > 0:
+            select.select([self._fd], [], [], timeout)
+        self._ReadEvents()
+        dirty = self._dirty
+        self._dirty = set()
+        return dirty
+
+    def _AddWatch(self, path):
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), _WATCH_MASK
+        )
+        if wd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e), path)
+        self._wd_to_path[wd] = path
+
+    def _AddWatchIfPresent(self, path):
+        """Watches a directory unless it has already disappeared."""
+        try:
+            self._AddWatch(path)
+        except OSError as e:
+            if e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                raise
+
+    def _AddNewTree(self, top):
+        """Watches a new subdirectory and marks its whole tree dirty.
+
+        Files may have been created in the tree before it was watched, so
+        all of it is dirty.
+        """
+        try:
+            self._AddWatchIfPresent(top)
+            self._dirty.add(top)
+            for dir_path, dir_names, _ in os.walk(top):
+                for dir_name in dir_names:
+                    path = os.path.join(dir_path, dir_name)
+                    self._AddWatchIfPresent(path)
+                    self._dirty.add(path)
+        except OSError as e:
+            logger.warning("Cannot watch %s: %s", top, e)
+            self._rescan_needed = True
+
+    def _ReadEvents(self):
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            pos = 0
+            while pos < len(data):
+                (wd, mask, _, name_len) = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos : pos + name_len].rstrip(b"\0")
+                pos += name_len
+                self._HandleEvent(wd, mask, name)
+
+    def _HandleEvent(self, wd, mask, name):
+        if mask & _IN_Q_OVERFLOW:
+            self._rescan_needed = True
+            return
+        path = self._wd_to_path.get(wd)
+        if path is None:
+            return
+        if mask & _IN_IGNORED:
+            # The watch was removed, because the directory was deleted.
+            del self._wd_to_path[wd]
+            return
+        if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+            self._dirty.add(path)
+            if mask & _IN_MOVE_SELF:
+                # Paths of watches within the moved tree are now stale.
+                self._rescan_needed = True
+            return
+        self._dirty.add(path)
+        if name and mask & _IN_ISDIR:
+            child = os.path.join(path, os.fsdecode(name))
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._AddNewTree(child)
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                self._dirty.add(child)
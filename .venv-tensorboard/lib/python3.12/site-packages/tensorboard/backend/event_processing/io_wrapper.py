@@ -17,6 +17,8 @@
 import collections
 import os
 import re
+import stat
+import time
 
 
 from tensorboard.compat import tf
@@ -28,6 +30,11 @@ logger = tb_logging.get_logger()
 
 _ESCAPE_GLOB_CHARACTERS_REGEX = re.compile("([*?[])")
 
+# Directories modified this recently before being listed are listed again
+# on the next update, because a later change within the resolution of
+# their filesystem's timestamps would not change their mtime.
+_MTIME_GRANULARITY_NS = 2 * 10**9
+
 
 def PathSeparator(path):
     return "/" if io_util.IsCloudPath(path) else os.sep
@@ -222,3 +229,131 @@ def GetLogdirSubdirectories(path):
         for (subdir, files) in traversal_method(path)
         if any(IsTensorFlowEventsFile(f) for f in files)
     )
+
+
+class LogdirIndex:
+    """An incrementally updated index of the subdirectories of a logdir.
+
+    `GetLogdirSubdirectories` lists every directory of the logdir on each
+    call. For local logdirs, this index instead remembers the mtime,
+    subdirectories and whether there are events files of each directory,
+    and only lists again the directories whose mtime changed, since
+    creating, deleting or renaming an entry changes the mtime of its
+    directory. All other directories only need a `stat`.
+
+    Object stores have no directory mtimes, so for cloud logdirs this
+    falls back to `GetLogdirSubdirectories`.
+
+    This class is not thread-safe.
+    """
+
+    _Entry = collections.namedtuple(
+        "_Entry", ("mtime_ns", "recent", "has_events_files", "children")
+    )
+
+    def __init__(self, path):
+        """Creates an empty index.
+
+        Args:
+          path: The path to a directory under which to find subdirectories.
+        """
+        self._path = path
+        self._is_local = not (io_util.IsCloudPath(path) or "://" in path)
+        # Maps the path of each directory seen by the last update to its
+        # `_Entry`.
+        self._entries = {}
+
+    def GetSubdirectories(self):
+        """Obtains all subdirectories with events files, as of now.
+
+        Returns:
+          A list of paths of all subdirectories each with at least 1 events
+          file directly within the subdirectory, as returned by
+          `GetLogdirSubdirectories`.
+
+        Raises:
+          ValueError: If the path exists and is not a directory.
+        """
+        if not self._is_local:
+            return list(GetLogdirSubdirectories(self._path))
+        try:
+            st = os.stat(self._path)
+        except (FileNotFoundError, NotADirectoryError):
+            self._entries = {}
+            return []
+        if not stat.S_ISDIR(st.st_mode):
+            raise ValueError(
+                "GetLogdirSubdirectories: path exists and is not a "
+                "directory, %s" % self._path
+            )
+        old_entries = self._entries
+        entries = {}
+        stack = [(self._path, st)]
+        while stack:
+            (path, st) = stack.pop()
+            entry = old_entries.get(path)
+            if (
+                entry is None
+                or entry.recent
+                or entry.mtime_ns != st.st_mtime_ns
+            ):
+                entry = self._List(path, st)
+                if entry is None:
+                    continue
+            entries[path] = entry
+            for child in reversed(entry.children):
+                try:
+                    child_st = os.stat(child)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(child_st.st_mode):
+                    stack.append((child, child_st))
+        self._entries = entries
+        return [
+            path for (path, entry) in entries.items() if entry.has_events_files
+        ]
+
+    def _List(self, path, st):
+        """Returns a new `_Entry` for a directory, or None if it is gone."""
+        now_ns = time.time_ns()
+        children = []
+        has_events_files = False
+        try:
+            with os.scandir(path) as it:
+                for dir_entry in it:
+                    try:
+                        is_dir = dir_entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        children.append(dir_entry.path)
+                    elif IsTensorFlowEventsFile(dir_entry.name):
+                        has_events_files = True
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return self._Entry(
+            mtime_ns=st.st_mtime_ns,
+            recent=st.st_mtime_ns >= now_ns - _MTIME_GRANULARITY_NS,
+            has_events_files=has_events_files,
+            children=tuple(children),
+        )
+
+
+def GetLogdirSubdirectoriesAmong(directories):
+    """Obtains the given directories that contain events files.
+
+    Args:
+      directories: An iterable of paths of directories, some of which may
+        not exist.
+
+    Returns:
+      A generator of those of `directories` that exist and have at least 1
+      events file directly within them.
+    """
+    for directory in directories:
+        try:
+            names = tf.io.gfile.listdir(directory)
+        except tf.errors.OpError:
+            continue
+        if any(IsTensorFlowEventsFile(name) for name in names):
+            yield directory
@@ -16,10 +16,15 @@
 
 import collections
 import dataclasses
+import functools
+import os
 import threading
+import time
 
 from typing import Optional
 
+import numpy as np
+
 from tensorboard.backend.event_processing import directory_loader
 from tensorboard.backend.event_processing import directory_watcher
 from tensorboard.backend.event_processing import event_file_loader
@@ -27,13 +32,17 @@ from tensorboard.backend.event_processing import event_util
 from tensorboard.backend.event_processing import io_wrapper
 from tensorboard.backend.event_processing import plugin_asset_util
 from tensorboard.backend.event_processing import reservoir
+from tensorboard.backend.event_processing import scalar_reservoir
 from tensorboard.backend.event_processing import tag_types
 from tensorboard.compat.proto import config_pb2
 from tensorboard.compat.proto import event_pb2
 from tensorboard.compat.proto import graph_pb2
 from tensorboard.compat.proto import meta_graph_pb2
+from tensorboard.compat.proto import summary_pb2
 from tensorboard.compat.proto import tensor_pb2
+from tensorboard.compat.proto import types_pb2
 from tensorboard.util import tb_logging
+from tensorboard.util import tensor_util
 
 
 logger = tb_logging.get_logger()
@@ -55,6 +64,14 @@ STORE_EVERYTHING_SIZE_GUIDANCE = {
 
 _TENSOR_RESERVOIR_KEY = "."  # arbitrary
 
+# Bump this whenever the layout of ingestion cache snapshots changes.
+_SNAPSHOT_VERSION = 3
+
+# Minimum interval between ingestion cache snapshots of a run that is
+# still being written to. A snapshot is also saved whenever a reload
+# finds no new events.
+_SNAPSHOT_INTERVAL_SECS = 60
+
 
 @dataclasses.dataclass(frozen=True)
 class TensorEvent:
@@ -71,6 +88,34 @@ class TensorEvent:
     tensor_proto: tensor_pb2.TensorProto
 
 
+@dataclasses.dataclass(frozen=True)
+class TagStats:
+    """Aggregates over the events currently stored for a tag.
+
+    Attributes:
+      max_step: Largest step of any stored event, or None if there are no
+        events.
+      max_wall_time: Largest wall time of any stored event, or None if
+        there are no events.
+      max_length: Largest number of elements of any stored tensor, or None
+        if there are no events.
+    """
+
+    max_step: Optional[int]
+    max_wall_time: Optional[float]
+    max_length: Optional[int]
+
+
+# Maps dtypes of scalar tensors that `_ScalarValue` can read without
+# `make_ndarray` to the NumPy type and `TensorProto` field of the value.
+_SCALAR_FIELDS = {
+    types_pb2.DT_FLOAT: (np.float32, "float_val"),
+    types_pb2.DT_DOUBLE: (np.float64, "double_val"),
+    types_pb2.DT_INT32: (np.int32, "int_val"),
+    types_pb2.DT_INT64: (np.int64, "int64_val"),
+}
+
+
 class EventAccumulator:
     """An `EventAccumulator` takes an event generator, and accumulates the
     values.
@@ -103,7 +148,10 @@ class EventAccumulator:
           tf events file. The accumulator will load events from this path.
       tensors_by_tag: A dictionary mapping each tag name to a
         reservoir.Reservoir of tensor summaries. Each such reservoir will
-        only use a single key, given by `_TENSOR_RESERVOIR_KEY`.
+        only use a single key, given by `_TENSOR_RESERVOIR_KEY`. Tags whose
+        summary metadata has `DATA_CLASS_SCALAR` are instead mapped to a
+        `scalar_reservoir.ScalarReservoir`, which stores their points in
+        columnar arrays, until a point does not fit its dtype and shape.
 
     @@Tensors
     """
@@ -116,6 +164,9 @@ class EventAccumulator:
         purge_orphaned_data=True,
         event_file_active_filter=None,
         detect_file_replacement=None,
+        verify_crc=None,
+        decode_threads=None,
+        ingest_cache=None,
     ):
         """Construct the `EventAccumulator`.
 
@@ -142,6 +193,17 @@ class EventAccumulator:
           detect_file_replacement: Optional boolean; if True, event file loading
             will try to detect when a file has been replaced with a new version
             that contains additional data, by monitoring the file size.
+          verify_crc: Optional string, one of "all", "header" or "none",
+            controlling which record checksums are verified when reading
+            event files. Defaults to verifying all of them.
+          decode_threads: Optional number of worker threads used to decode
+            events in batches while loading, pipelined with reading. If not
+            provided, events are decoded serially in the reloading thread.
+          ingest_cache: Optional `ingest_cache.IngestCache`. If provided and
+            `path` is local, the accumulated state of this run is restored
+            from the cache on first use, so that only events written since
+            the last snapshot need to be read, and is periodically saved
+            back to it.
         """
         size_guidance = dict(size_guidance or DEFAULT_SIZE_GUIDANCE)
         sizes = {}
@@ -162,6 +224,21 @@ class EventAccumulator:
         self.summary_metadata = {}
         self.tensors_by_tag = {}
         self._tensors_by_tag_lock = threading.Lock()
+        # Maps each tag to a mutable `[max_step, max_wall_time, max_length]`
+        # list of the `TagStats` of its reservoir, maintained as events are
+        # added. A missing entry means that the stats must be recomputed
+        # from the reservoir, e.g. after a purge. Guarded by
+        # `_tag_stats_lock`.
+        self._tag_stats = {}
+        self._tag_stats_lock = threading.Lock()
+        # Maps tags to dicts from each step to the list of stored
+        # `TensorEvent`s at that step, in reservoir order. An index is
+        # built on the first `TensorAtStep` query for a tag and then kept
+        # in sync as events are added; it is dropped when the tag is
+        # purged. Guarded by `_step_index_lock`, which is also held while
+        # adding events to an indexed tag's reservoir.
+        self._step_index = {}
+        self._step_index_lock = threading.Lock()
 
         # Keep a mapping from plugin name to a dict mapping from tag to plugin data
         # content obtained from the SummaryMetadata (metadata field of Value) for
@@ -175,11 +252,29 @@ class EventAccumulator:
         self._plugin_tag_lock = threading.Lock()
 
         self.path = path
-        self._generator = _GeneratorFromPath(
-            path, event_file_active_filter, detect_file_replacement
+        self._generator_factory = functools.partial(
+            _GeneratorFromPath,
+            path,
+            event_file_active_filter,
+            detect_file_replacement,
+            verify_crc,
+            decode_threads,
         )
+        self._generator = self._generator_factory()
         self._generator_mutex = threading.Lock()
 
+        # Snapshots are only supported for local paths, whose files we can
+        # `stat` cheaply to detect modification.
+        if ingest_cache is not None and "://" in path:
+            ingest_cache = None
+        self._ingest_cache = ingest_cache
+        self._snapshot_restored = ingest_cache is None
+        self._snapshot_dirty = False
+        self._last_snapshot_time = time.time()
+        # Incremented after each event is processed or the state is
+        # otherwise replaced; see `Generation`.
+        self._generation = 0
+
         self.purge_orphaned_data = purge_orphaned_data
         self._seen_session_start = False
 
@@ -199,8 +294,15 @@ class EventAccumulator:
           The `EventAccumulator`.
         """
         with self._generator_mutex:
+            self._MaybeRestoreSnapshot()
+            num_events = 0
             for event in self._generator.Load():
                 self._ProcessEvent(event)
+                self._generation += 1
+                num_events += 1
+            if num_events:
+                self._snapshot_dirty = True
+            self._MaybeSaveSnapshot(idle=not num_events)
         return self
 
     def PluginAssets(self, plugin_name):
@@ -232,6 +334,21 @@ class EventAccumulator:
             self.path, plugin_name, asset_name
         )
 
+    def Generation(self):
+        """Returns a counter of changes to the accumulated data.
+
+        The counter increases every time an event is processed or the
+        accumulated state is replaced wholesale, so that anything derived
+        from the data of this accumulator can be reused for as long as the
+        counter keeps its value. It is read without locking: the data may
+        already reflect changes that the returned value does not, but never
+        the other way around.
+
+        Returns:
+          A nonnegative integer.
+        """
+        return self._generation
+
     def FirstEventTimestamp(self):
         """Returns the timestamp in seconds of the first event.
 
@@ -250,9 +367,14 @@ class EventAccumulator:
         if self._first_event_timestamp is not None:
             return self._first_event_timestamp
         with self._generator_mutex:
+            self._MaybeRestoreSnapshot()
+            if self._first_event_timestamp is not None:
+                return self._first_event_timestamp
             try:
                 event = next(self._generator.Load())
                 self._ProcessEvent(event)
+                self._generation += 1
+                self._snapshot_dirty = True
                 return self._first_event_timestamp
 
             except StopIteration:
@@ -263,9 +385,14 @@ class EventAccumulator:
         if self._source_writer is not None:
             return self._source_writer
         with self._generator_mutex:
+            self._MaybeRestoreSnapshot()
+            if self._source_writer is not None:
+                return self._source_writer
             try:
                 event = next(self._generator.Load())
                 self._ProcessEvent(event)
+                self._generation += 1
+                self._snapshot_dirty = True
                 return self._source_writer
             except StopIteration:
                 logger.info(
@@ -325,6 +452,224 @@ class EventAccumulator:
         """
         return dict(self.summary_metadata)
 
+    def _SnapshotConfig(self):
+        """Returns the settings a snapshot must have been taken under."""
+        return {
+            "version": _SNAPSHOT_VERSION,
+            "generator": type(self._generator).__name__,
+            "size_guidance": sorted(self._size_guidance.items()),
+            "tensor_size_guidance": sorted(self._tensor_size_guidance.items()),
+            "purge_orphaned_data": self.purge_orphaned_data,
+        }
+
+    def _MaybeRestoreSnapshot(self):
+        """Restores state from the ingestion cache, if not yet attempted.
+
+        Must be called with `_generator_mutex` held.
+        """
+        if self._snapshot_restored:
+            return
+        self._snapshot_restored = True
+        snapshot = self._ingest_cache.Load(self.path)
+        if snapshot is None:
+            return
+        try:
+            if not self._SnapshotIsCurrent(snapshot):
+                logger.info("Ingestion cache for %s is stale", self.path)
+                self._ingest_cache.Remove(self.path)
+                return
+            self._RestoreSnapshot(snapshot)
+        except Exception as e:
+            logger.warning(
+                "Unable to restore %s from ingestion cache: %s", self.path, e
+            )
+            self._ingest_cache.Remove(self.path)
+            self._ResetState()
+            return
+        logger.info("Restored %s from ingestion cache", self.path)
+
+    def _SnapshotIsCurrent(self, snapshot):
+        """Checks that the event files have only been appended to since."""
+        if snapshot["config"] != self._SnapshotConfig():
+            return False
+        files = snapshot["files"]
+        for filename, (size, mtime_ns) in files.items():
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                return False
+            if stat.st_size < size:
+                return False
+            if stat.st_size == size and stat.st_mtime_ns != mtime_ns:
+                return False
+        if files and not io_wrapper.IsSummaryEventsFile(self.path):
+            # An event file that sorts before the last one already read
+            # would never be picked up by a resumed directory generator.
+            last_file = max(files)
+            for filename in io_wrapper.ListDirectoryAbsolute(self.path):
+                if (
+                    filename < last_file
+                    and filename not in files
+                    and io_wrapper.IsSummaryEventsFile(filename)
+                ):
+                    return False
+        return True
+
+    def _RestoreSnapshot(self, snapshot):
+        """Replaces the accumulated state with that of a snapshot."""
+        state = snapshot["accumulator"]
+        summary_metadata = {
+            tag: summary_pb2.SummaryMetadata.FromString(metadata)
+            for (tag, metadata) in state["summary_metadata"].items()
+        }
+        tensors_by_tag = {}
+        for tag, tensors in state["tensors"].items():
+            if tensors["kind"] == "scalar":
+                tag_reservoir = scalar_reservoir.ScalarReservoir(
+                    tensors["size"]
+                )
+                tag_reservoir.SetState(tensors["bucket"])
+                tensors_by_tag[tag] = tag_reservoir
+                continue
+            bucket = dict(tensors["bucket"])
+            bucket["items"] = [
+                TensorEvent(
+                    wall_time=wall_time,
+                    step=step,
+                    tensor_proto=tensor_pb2.TensorProto.FromString(tensor),
+                )
+                for (wall_time, step, tensor) in bucket["items"]
+            ]
+            tag_reservoir = reservoir.Reservoir(tensors["size"])
+            tag_reservoir.SetBucketState(_TENSOR_RESERVOIR_KEY, bucket)
+            tensors_by_tag[tag] = tag_reservoir
+        self._generator.RestoreState(snapshot["generator"])
+
+        self._first_event_timestamp = state["first_event_timestamp"]
+        self._source_writer = state["source_writer"]
+        self.file_version = state["file_version"]
+        self.most_recent_step = state["most_recent_step"]
+        self.most_recent_wall_time = state["most_recent_wall_time"]
+        self._seen_session_start = state["seen_session_start"]
+        self._graph = state["graph"]
+        self._graph_from_metagraph = state["graph_from_metagraph"]
+        self._meta_graph = state["meta_graph"]
+        self._tagged_metadata = dict(state["tagged_metadata"])
+        self.summary_metadata = summary_metadata
+        with self._plugin_tag_lock:
+            self._plugin_to_tag_to_content = collections.defaultdict(dict)
+            for tag, metadata in summary_metadata.items():
+                plugin_name = metadata.plugin_data.plugin_name
+                if plugin_name:
+                    self._plugin_to_tag_to_content[plugin_name][
+                        tag
+                    ] = metadata.plugin_data.content
+        with self._tensors_by_tag_lock:
+            self.tensors_by_tag = tensors_by_tag
+        with self._tag_stats_lock:
+            self._tag_stats = {}
+        with self._step_index_lock:
+            self._step_index = {}
+        self._generation += 1
+
+    def _ResetState(self):
+        """Discards all accumulated state after a failed restore."""
+        self._generator = self._generator_factory()
+        self._first_event_timestamp = None
+        self._source_writer = None
+        self.file_version = None
+        self.most_recent_step = -1
+        self.most_recent_wall_time = -1
+        self._seen_session_start = False
+        self._graph = None
+        self._graph_from_metagraph = False
+        self._meta_graph = None
+        self._tagged_metadata = {}
+        self.summary_metadata = {}
+        with self._plugin_tag_lock:
+            self._plugin_to_tag_to_content = collections.defaultdict(dict)
+        with self._tensors_by_tag_lock:
+            self.tensors_by_tag = {}
+        with self._tag_stats_lock:
+            self._tag_stats = {}
+        with self._step_index_lock:
+            self._step_index = {}
+        self._generation += 1
+
+    def _MaybeSaveSnapshot(self, idle):
+        """Saves state to the ingestion cache if it is due.
+
+        Must be called with `_generator_mutex` held.
+
+        Args:
+          idle: Whether the last reload found no new events.
+        """
+        if self._ingest_cache is None or not self._snapshot_dirty:
+            return
+        now = time.time()
+        if (
+            not idle
+            and now - self._last_snapshot_time < _SNAPSHOT_INTERVAL_SECS
+        ):
+            return
+        generator_state = self._generator.SaveState()
+        if generator_state is None:
+            return
+        files = {}
+        for filename in generator_state["files"]:
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                return
+            files[filename] = (stat.st_size, stat.st_mtime_ns)
+        tensors = {}
+        for tag, tag_reservoir in list(self.tensors_by_tag.items()):
+            if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+                tensors[tag] = {
+                    "kind": "scalar",
+                    "size": tag_reservoir.size,
+                    "bucket": tag_reservoir.GetState(),
+                }
+                continue
+            try:
+                bucket = tag_reservoir.GetBucketState(_TENSOR_RESERVOIR_KEY)
+            except KeyError:
+                continue
+            bucket["items"] = [
+                (e.wall_time, e.step, e.tensor_proto.SerializeToString())
+                for e in bucket["items"]
+            ]
+            tensors[tag] = {
+                "kind": "tensor",
+                "size": tag_reservoir.size,
+                "bucket": bucket,
+            }
+        snapshot = {
+            "config": self._SnapshotConfig(),
+            "files": files,
+            "generator": generator_state,
+            "accumulator": {
+                "first_event_timestamp": self._first_event_timestamp,
+                "source_writer": self._source_writer,
+                "file_version": self.file_version,
+                "most_recent_step": self.most_recent_step,
+                "most_recent_wall_time": self.most_recent_wall_time,
+                "seen_session_start": self._seen_session_start,
+                "graph": self._graph,
+                "graph_from_metagraph": self._graph_from_metagraph,
+                "meta_graph": self._meta_graph,
+                "tagged_metadata": dict(self._tagged_metadata),
+                "summary_metadata": {
+                    tag: metadata.SerializeToString()
+                    for (tag, metadata) in self.summary_metadata.items()
+                },
+                "tensors": tensors,
+            },
+        }
+        self._ingest_cache.Save(self.path, snapshot)
+        self._snapshot_dirty = False
+        self._last_snapshot_time = now
+
     def _ProcessEvent(self, event):
         """Called whenever an event is loaded."""
         if self._first_event_timestamp is None:
@@ -529,7 +874,97 @@ class EventAccumulator:
         Returns:
           An array of `TensorEvent`s.
         """
-        return self.tensors_by_tag[tag].Items(_TENSOR_RESERVOIR_KEY)
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            return [
+                _ScalarTensorEvent(item, tag_reservoir.shape)
+                for item in tag_reservoir.Items()
+            ]
+        return tag_reservoir.Items(_TENSOR_RESERVOIR_KEY)
+
+    def TagStats(self, tag):
+        """Given a summary tag, return aggregates over its stored events.
+
+        These are maintained incrementally as events are loaded, so this
+        does not need to traverse the events of the tag.
+
+        Args:
+          tag: A string tag associated with the events.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          A `TagStats`.
+        """
+        tag_reservoir = self.tensors_by_tag[tag]
+        with self._tag_stats_lock:
+            stats = self._tag_stats.get(tag)
+            if stats is None:
+                stats = _ComputeTagStats(tag_reservoir)
+                self._tag_stats[tag] = stats
+            return TagStats(*stats)
+
+    def TensorAtStep(self, tag, step):
+        """Given a summary tag and a step, return the tensor at that step.
+
+        This uses a per-tag index from steps to events rather than
+        traversing all events of the tag.
+
+        Args:
+          tag: A string tag associated with the events.
+          step: An integer step.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          The first `TensorEvent` of the tag, in the order returned by
+          `Tensors(tag)`, whose step is `step`; or None if there is none.
+        """
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            return next((e for e in self.Tensors(tag) if e.step == step), None)
+        with self._step_index_lock:
+            index = self._step_index.get(tag)
+            if index is None:
+                index = {}
+                for event in tag_reservoir.Items(_TENSOR_RESERVOIR_KEY):
+                    index.setdefault(event.step, []).append(event)
+                self._step_index[tag] = index
+            events = index.get(step)
+            return events[0] if events else None
+
+    def ScalarColumns(self, tag):
+        """Given a scalar summary tag, return all of its points as arrays.
+
+        This avoids building a `TensorEvent` per point for tags stored in
+        columnar form, which is the case for all tags whose summary
+        metadata has `DATA_CLASS_SCALAR`.
+
+        Args:
+          tag: A string tag associated with the events.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          A tuple `(steps, wall_times, values)` of 1-D NumPy arrays of the
+          same length, in the same order as `Tensors(tag)` would return.
+        """
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            return tag_reservoir.Columns()
+        events = tag_reservoir.Items(_TENSOR_RESERVOIR_KEY)
+        steps = np.array([e.step for e in events], dtype=np.int64)
+        wall_times = np.array([e.wall_time for e in events], dtype=np.float64)
+        values = [
+            tensor_util.make_ndarray(e.tensor_proto).item() for e in events
+        ]
+        # Don't round large ints by mixing them with floats in one array.
+        mixed = len(set(map(type, values))) > 1
+        values = np.array(values, dtype=object if mixed else None)
+        return (steps, wall_times, values)
 
     def _MaybePurgeOrphanedData(self, event):
         """Maybe purge orphaned data due to a TensorFlow crash.
@@ -604,12 +1039,96 @@ class EventAccumulator:
             self._Purge(event, by_tags=True)
 
     def _ProcessTensor(self, tag, wall_time, step, tensor):
-        tv = TensorEvent(wall_time=wall_time, step=step, tensor_proto=tensor)
         with self._tensors_by_tag_lock:
             if tag not in self.tensors_by_tag:
                 reservoir_size = self._GetTensorReservoirSize(tag)
-                self.tensors_by_tag[tag] = reservoir.Reservoir(reservoir_size)
-        self.tensors_by_tag[tag].AddItem(_TENSOR_RESERVOIR_KEY, tv)
+                if self._IsScalarTag(tag):
+                    tag_reservoir = scalar_reservoir.ScalarReservoir(
+                        reservoir_size
+                    )
+                else:
+                    tag_reservoir = reservoir.Reservoir(reservoir_size)
+                with self._tag_stats_lock:
+                    self._tag_stats[tag] = [None, None, None]
+                self.tensors_by_tag[tag] = tag_reservoir
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            try:
+                value = _ScalarValue(tensor)
+            except ValueError:
+                value = None
+            if not tag_reservoir.Accepts(value):
+                tag_reservoir = self._ConvertToTensorReservoir(
+                    tag, tag_reservoir
+                )
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            length = 1
+            evicted = tag_reservoir.AddScalar(wall_time, step, value)
+        else:
+            length = _TensorSize(tensor)
+            tv = TensorEvent(
+                wall_time=wall_time, step=step, tensor_proto=tensor
+            )
+            with self._step_index_lock:
+                evicted = tag_reservoir.AddItem(_TENSOR_RESERVOIR_KEY, tv)
+                index = self._step_index.get(tag)
+                if index is not None:
+                    _UpdateStepIndex(index, tv, evicted)
+        with self._tag_stats_lock:
+            stats = self._tag_stats.get(tag)
+            if stats is None:
+                return
+            (max_step, max_wall_time, max_length) = stats
+            if evicted is not None and (
+                (evicted.step == max_step and step < max_step)
+                or (
+                    evicted.wall_time == max_wall_time
+                    and wall_time < max_wall_time
+                )
+                or (length < max_length and _ItemLength(evicted) == max_length)
+            ):
+                # The evicted event may have been the only one attaining a
+                # maximum, so recompute lazily from the reservoir.
+                del self._tag_stats[tag]
+                return
+            if max_step is None:
+                stats[:] = (step, wall_time, length)
+                return
+            if step > max_step:
+                stats[0] = step
+            if wall_time > max_wall_time:
+                stats[1] = wall_time
+            if length > max_length:
+                stats[2] = length
+
+    def _ConvertToTensorReservoir(self, tag, tag_reservoir):
+        """Moves the points of a scalar tag to a `reservoir.Reservoir`.
+
+        This is for tags with a point that does not fit the dtype and shape
+        of the columnar series, such as an int64 after float32s, so that
+        every point is still returned as written. Sampling continues
+        exactly where the columnar series left off.
+
+        Returns:
+          The new `reservoir.Reservoir` of the tag.
+        """
+        bucket = tag_reservoir.GetBucketState()
+        bucket["items"] = [
+            _ScalarTensorEvent(item, tag_reservoir.shape)
+            for item in bucket["items"]
+        ]
+        result = reservoir.Reservoir(tag_reservoir.size)
+        result.SetBucketState(_TENSOR_RESERVOIR_KEY, bucket)
+        with self._tensors_by_tag_lock:
+            self.tensors_by_tag[tag] = result
+        return result
+
+    def _IsScalarTag(self, tag):
+        summary_metadata = self.summary_metadata.get(tag)
+        return (
+            summary_metadata is not None
+            and summary_metadata.data_class == summary_pb2.DATA_CLASS_SCALAR
+        )
 
     def _GetTensorReservoirSize(self, tag):
         default = self._size_guidance[TENSORS]
@@ -653,11 +1172,19 @@ class EventAccumulator:
                     num_expired += tag_reservoir.FilterItems(
                         _NotExpired, _TENSOR_RESERVOIR_KEY
                     )
+                    with self._tag_stats_lock:
+                        self._tag_stats.pop(value.tag, None)
+                    with self._step_index_lock:
+                        self._step_index.pop(value.tag, None)
         else:
             for tag_reservoir in self.tensors_by_tag.values():
                 num_expired += tag_reservoir.FilterItems(
                     _NotExpired, _TENSOR_RESERVOIR_KEY
                 )
+            with self._tag_stats_lock:
+                self._tag_stats = {}
+            with self._step_index_lock:
+                self._step_index = {}
         if num_expired > 0:
             purge_msg = _GetPurgeMessage(
                 self.most_recent_step,
@@ -669,6 +1196,104 @@ class EventAccumulator:
             logger.warning(purge_msg)
 
 
+def _Max(a, b):
+    """Like `max(a, b)`, but treating None as smaller than anything."""
+    if a is None or b > a:
+        return b
+    return a
+
+
+def _ScalarValue(tensor_proto):
+    """Returns the value of a scalar `TensorProto` as a NumPy scalar.
+
+    This is equivalent to `make_ndarray`, but much faster for the common
+    encodings of scalar summaries.
+
+    Raises:
+      ValueError: If the tensor does not have exactly one element.
+    """
+    field = _SCALAR_FIELDS.get(tensor_proto.dtype)
+    if field is not None and not tensor_proto.tensor_content:
+        (np_type, field_name) = field
+        values = getattr(tensor_proto, field_name)
+        if len(values) == 1 and not tensor_proto.tensor_shape.dim:
+            return np_type(values[0])
+    return tensor_util.make_ndarray(tensor_proto)
+
+
+def _ScalarTensorEvent(item, shape):
+    """Returns a `TensorEvent` for a `ScalarItem` of a series of `shape`."""
+    return TensorEvent(
+        wall_time=item.wall_time,
+        step=item.step,
+        tensor_proto=tensor_util.make_tensor_proto(
+            np.reshape(item.value, shape)
+        ),
+    )
+
+
+def _TensorSize(tensor_proto):
+    """Returns the number of elements of a `TensorProto`, from its shape."""
+    result = 1
+    for dim in tensor_proto.tensor_shape.dim:
+        result *= dim.size
+    return result
+
+
+def _ItemLength(item):
+    """Returns the number of elements of a reservoir item."""
+    if isinstance(item, scalar_reservoir.ScalarItem):
+        return 1
+    return _TensorSize(item.tensor_proto)
+
+
+def _UpdateStepIndex(index, added, evicted):
+    """Updates a step index after adding an event to its tag's reservoir.
+
+    Args:
+      index: A dict from steps to lists of `TensorEvent`s, as stored in
+        `EventAccumulator._step_index`.
+      added: The `TensorEvent` that was added. Since the accumulator's
+        reservoirs always keep the latest item, this is now stored last.
+      evicted: The `TensorEvent` that was evicted to make room, or None.
+    """
+    if evicted is not None:
+        events = index[evicted.step]
+        for i, event in enumerate(events):
+            if event is evicted:
+                del events[i]
+                break
+        if not events:
+            del index[evicted.step]
+    index.setdefault(added.step, []).append(added)
+
+
+def _ComputeTagStats(tag_reservoir):
+    """Computes tag stats from scratch by traversing a tag's reservoir.
+
+    Returns:
+      A `[max_step, max_wall_time, max_length]` list, as stored in
+      `EventAccumulator._tag_stats`.
+    """
+    if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+        (steps, wall_times, _) = tag_reservoir.Columns()
+        if not len(steps):
+            return [None, None, None]
+        return [steps.max().item(), wall_times.max().item(), 1]
+    try:
+        events = tag_reservoir.Items(_TENSOR_RESERVOIR_KEY)
+    except KeyError:
+        return [None, None, None]
+    stats = [None, None, None]
+    for event in events:
+        stats = [
+            _Max(stats[0], event.step),
+            _Max(stats[1], event.wall_time),
+            _Max(stats[2], _TensorSize(event.tensor_proto)),
+        ]
+    return stats
+
+
 def _GetPurgeMessage(
     most_recent_step,
     most_recent_wall_time,
@@ -692,17 +1317,29 @@ def _GetPurgeMessage(
 
 
 def _GeneratorFromPath(
-    path, event_file_active_filter=None, detect_file_replacement=None
+    path,
+    event_file_active_filter=None,
+    detect_file_replacement=None,
+    verify_crc=None,
+    decode_threads=None,
 ):
     """Create an event generator for file or directory at given path string."""
     if not path:
         raise ValueError("path must be a valid string")
     if io_wrapper.IsSummaryEventsFile(path):
-        return event_file_loader.EventFileLoader(path, detect_file_replacement)
+        return event_file_loader.EventFileLoader(
+            path,
+            detect_file_replacement,
+            verify_crc,
+            decode_threads=decode_threads,
+        )
     elif event_file_active_filter:
         loader_factory = (
             lambda path: event_file_loader.TimestampedEventFileLoader(
-                path, detect_file_replacement
+                path,
+                detect_file_replacement,
+                verify_crc,
+                decode_threads=decode_threads,
             )
         )
         return directory_loader.DirectoryLoader(
@@ -713,7 +1350,10 @@ def _GeneratorFromPath(
         )
     else:
         loader_factory = lambda path: event_file_loader.EventFileLoader(
-            path, detect_file_replacement
+            path,
+            detect_file_replacement,
+            verify_crc,
+            decode_threads=decode_threads,
         )
         return directory_watcher.DirectoryWatcher(
             path,
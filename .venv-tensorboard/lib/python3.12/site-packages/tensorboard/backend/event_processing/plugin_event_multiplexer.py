@@ -18,6 +18,7 @@
 import os
 import queue
 import threading
+import time
 
 from typing import Optional
 
@@ -31,6 +32,10 @@ from tensorboard.util import tb_logging
 
 logger = tb_logging.get_logger()
 
+# An idle run is first reloaded again after this many seconds; see
+# `EventMultiplexer.Reload`.
+_MIN_RELOAD_BACKOFF_SECS = 1.0
+
 
 class EventMultiplexer:
     """An `EventMultiplexer` manages access to multiple `EventAccumulator`s.
@@ -79,6 +84,10 @@ class EventMultiplexer:
         max_reload_threads=None,
         event_file_active_filter=None,
         detect_file_replacement=None,
+        verify_crc=None,
+        decode_threads=None,
+        ingest_cache=None,
+        max_reload_backoff_secs=None,
     ):
         """Constructor for the `EventMultiplexer`.
 
@@ -103,11 +112,25 @@ class EventMultiplexer:
           detect_file_replacement: Optional boolean; if True, event file loading
             will try to detect when a file has been replaced with a new version
             that contains additional data, by monitoring the file size.
+          verify_crc: Optional string, one of "all", "header" or "none",
+            controlling which record checksums are verified when reading
+            event files. Defaults to verifying all of them.
+          decode_threads: Optional number of threads used to decode events
+            in batches while loading, shared by all runs. If not provided,
+            each run decodes its events serially in its reloading thread.
+          ingest_cache: Optional `ingest_cache.IngestCache` in which runs
+            snapshot their accumulated state, to resume from on restart.
+          max_reload_backoff_secs: Optional maximum number of seconds that
+            `Reload` may skip a run for while it has no new data. If not
+            provided, every run is reloaded on every `Reload`.
         """
         logger.info("Event Multiplexer initializing.")
         self._accumulators_mutex = threading.Lock()
         self._accumulators = {}
         self._paths = {}
+        # Incremented whenever a run is added, replaced or deleted; guarded
+        # by `_accumulators_mutex`. See `Generation`.
+        self._runs_generation = 0
         self._reload_called = False
         self._size_guidance = (
             size_guidance or event_accumulator.DEFAULT_SIZE_GUIDANCE
@@ -117,6 +140,23 @@ class EventMultiplexer:
         self._max_reload_threads = max_reload_threads or 1
         self._event_file_active_filter = event_file_active_filter
         self._detect_file_replacement = detect_file_replacement
+        self._verify_crc = verify_crc
+        self._decode_threads = decode_threads
+        self._ingest_cache = ingest_cache
+        self._max_reload_backoff_secs = max_reload_backoff_secs or 0
+        # Maps run names to their `_RunSchedule`; guarded by
+        # `_accumulators_mutex`.
+        self._schedules = {}
+        self._last_reload_stats = None
+        # Persistent threads reloading runs from `_reload_queue`, started
+        # by the first `Reload` if `max_reload_threads` is more than 1.
+        self._reload_queue = queue.Queue()
+        self._reload_threads = []
+        self._names_to_delete = set()
+        self._names_to_delete_mutex = threading.Lock()
+        # Maps paths passed to `AddRunsFromDirectory` to their
+        # `io_wrapper.LogdirIndex`.
+        self._logdir_indexes = {}
         if run_path_map is not None:
             logger.info(
                 "Event Multplexer doing initialization load for %s",
@@ -166,15 +206,20 @@ class EventMultiplexer:
                     purge_orphaned_data=self.purge_orphaned_data,
                     event_file_active_filter=self._event_file_active_filter,
                     detect_file_replacement=self._detect_file_replacement,
+                    verify_crc=self._verify_crc,
+                    decode_threads=self._decode_threads,
+                    ingest_cache=self._ingest_cache,
                 )
                 self._accumulators[name] = accumulator
                 self._paths[name] = path
+                self._schedules[name] = _RunSchedule()
+                self._runs_generation += 1
         if accumulator:
             if self._reload_called:
                 accumulator.Reload()
         return self
 
-    def AddRunsFromDirectory(self, path, name=None):
+    def AddRunsFromDirectory(self, path, name=None, subdirectories=None):
         """Load runs from a directory; recursively walks subdirectories.
 
         If path doesn't exist, no-op. This ensures that it is safe to call
@@ -194,6 +239,10 @@ class EventMultiplexer:
             is the concatenation of the parent name and the subdirectory name. If
             name is provided and the directory contains event files, then a run
             is added called "name" and with the events from the path.
+          subdirectories: Optionally, an iterable of the subdirectories of
+            `path` (or `path` itself) that may contain new runs, such as the
+            directories that changed since the last call. If provided, only
+            these directories are looked at, and none are walked.
 
         Raises:
           ValueError: If the path exists and isn't a directory.
@@ -203,7 +252,15 @@ class EventMultiplexer:
         """
         path = os.path.expanduser(path)
         logger.info("Starting AddRunsFromDirectory: %s", path)
-        for subdir in io_wrapper.GetLogdirSubdirectories(path):
+        if subdirectories is None:
+            index = self._logdir_indexes.get(path)
+            if index is None:
+                index = io_wrapper.LogdirIndex(path)
+                self._logdir_indexes[path] = index
+            subdirs = index.GetSubdirectories()
+        else:
+            subdirs = io_wrapper.GetLogdirSubdirectoriesAmong(subdirectories)
+        for subdir in subdirs:
             logger.info("Adding run from directory %s", subdir)
             rpath = os.path.relpath(subdir, path)
             subname = os.path.join(name, rpath) if name else rpath
@@ -212,62 +269,222 @@ class EventMultiplexer:
         return self
 
     def Reload(self):
-        """Call `Reload` on every `EventAccumulator`."""
+        """Call `Reload` on every `EventAccumulator` that is due.
+
+        If `max_reload_backoff_secs` was given, runs are scheduled
+        adaptively: a run that had new data on its last reload is reloaded
+        every time, while a run without new data is reloaded after
+        exponentially increasing intervals, up to `max_reload_backoff_secs`.
+        Runs whose data was read since their last reload (e.g., for a
+        dashboard) are reloaded first, and every time. Otherwise, every run
+        is reloaded.
+        """
         logger.info("Beginning EventMultiplexer.Reload()")
+        start = time.time()
         self._reload_called = True
         # Build a list so we're safe even if the list of accumulators is modified
         # even while we're reloading.
         with self._accumulators_mutex:
             items = list(self._accumulators.items())
-        items_queue = queue.Queue()
-        for item in items:
-            items_queue.put(item)
-
-        # Methods of built-in python containers are thread-safe so long as the GIL
-        # for the thread exists, but we might as well be careful.
-        names_to_delete = set()
-        names_to_delete_mutex = threading.Lock()
-
-        def Worker():
-            """Keeps reloading accumulators til none are left."""
-            while True:
-                try:
-                    name, accumulator = items_queue.get(block=False)
-                except queue.Empty:
-                    # No more runs to reload.
-                    break
-
-                try:
-                    accumulator.Reload()
-                except (OSError, IOError) as e:
-                    logger.error("Unable to reload accumulator %r: %s", name, e)
-                except directory_watcher.DirectoryDeletedError:
-                    with names_to_delete_mutex:
-                        names_to_delete.add(name)
-                finally:
-                    items_queue.task_done()
-
-        if self._max_reload_threads > 1:
-            num_threads = min(self._max_reload_threads, len(items))
-            logger.info("Starting %d threads to reload runs", num_threads)
-            for i in range(num_threads):
-                thread = threading.Thread(target=Worker, name="Reloader %d" % i)
-                thread.daemon = True
-                thread.start()
-            items_queue.join()
+            num_runs = len(items)
+            if self._max_reload_backoff_secs:
+                schedules = self._schedules
+                items = [
+                    (name, accumulator)
+                    for (name, accumulator) in items
+                    if schedules[name].IsDue(start)
+                ]
+                items.sort(key=lambda item: schedules[item[0]].Priority())
+        self._ReloadItems(items)
+        duration = time.time() - start
+        self._last_reload_stats = {
+            "start_time": start,
+            "duration_secs": duration,
+            "runs_reloaded": len(items),
+            "runs_skipped": num_runs - len(items),
+        }
+        logger.info(
+            "Finished with EventMultiplexer.Reload(): reloaded %d of %d runs "
+            "in %.3f secs",
+            len(items),
+            num_runs,
+            duration,
+        )
+        return self
+
+    def ReloadPaths(self, paths):
+        """Call `Reload` on the `EventAccumulator`s of some runs.
+
+        Args:
+          paths: A collection of paths, as passed to `AddRun`. Runs with
+            other paths are not reloaded.
+
+        Returns:
+          The `EventMultiplexer`.
+        """
+        start = time.time()
+        self._reload_called = True
+        paths = frozenset(paths)
+        with self._accumulators_mutex:
+            num_runs = len(self._accumulators)
+            items = [
+                (name, accumulator)
+                for (name, accumulator) in self._accumulators.items()
+                if self._paths[name] in paths
+            ]
+        logger.info("Reloading %d runs with changed paths", len(items))
+        self._ReloadItems(items)
+        self._last_reload_stats = {
+            "start_time": start,
+            "duration_secs": time.time() - start,
+            "runs_reloaded": len(items),
+            "runs_skipped": num_runs - len(items),
+        }
+        return self
+
+    def _ReloadItems(self, items):
+        """Reloads the given `(name, accumulator)` pairs, in order."""
+        if self._max_reload_threads > 1 and items:
+            if not self._reload_threads:
+                logger.info(
+                    "Starting %d threads to reload runs",
+                    self._max_reload_threads,
+                )
+                for i in range(self._max_reload_threads):
+                    thread = threading.Thread(
+                        target=self._ReloadWorker, name="Reloader %d" % i
+                    )
+                    thread.daemon = True
+                    thread.start()
+                    self._reload_threads.append(thread)
+            for item in items:
+                self._reload_queue.put(item)
+            self._reload_queue.join()
         else:
             logger.info(
                 "Reloading runs serially (one after another) on the main "
                 "thread."
             )
-            Worker()
+            for name, accumulator in items:
+                self._ReloadAccumulator(name, accumulator)
 
+        with self._names_to_delete_mutex:
+            names_to_delete = self._names_to_delete
+            self._names_to_delete = set()
         with self._accumulators_mutex:
             for name in names_to_delete:
+                if name not in self._accumulators:
+                    continue
                 logger.warning("Deleting accumulator %r", name)
                 del self._accumulators[name]
-        logger.info("Finished with EventMultiplexer.Reload()")
-        return self
+                del self._schedules[name]
+                self._runs_generation += 1
+
+    def _ReloadWorker(self):
+        """Keeps reloading accumulators from the reload queue."""
+        while True:
+            (name, accumulator) = self._reload_queue.get()
+            try:
+                self._ReloadAccumulator(name, accumulator)
+            except Exception:
+                # Keep serving the queue: `_ReloadItems` waits for every
+                # item, and this thread is not replaced.
+                logger.exception("Unable to reload accumulator %r", name)
+            finally:
+                self._reload_queue.task_done()
+
+    def _ReloadAccumulator(self, name, accumulator):
+        """Reloads one accumulator and reschedules its run."""
+        start = time.time()
+        generation = accumulator.Generation()
+        try:
+            accumulator.Reload()
+        except (OSError, IOError) as e:
+            logger.error("Unable to reload accumulator %r: %s", name, e)
+        except directory_watcher.DirectoryDeletedError:
+            with self._names_to_delete_mutex:
+                self._names_to_delete.add(name)
+            return
+        end = time.time()
+        with self._accumulators_mutex:
+            schedule = self._schedules.get(name)
+            if schedule is not None:
+                schedule.Reloaded(
+                    start,
+                    end,
+                    accumulator.Generation() != generation,
+                    self._max_reload_backoff_secs,
+                )
+
+    def ReloadSchedule(self):
+        """Describes how runs are being reloaded, for debugging.
+
+        Returns:
+          A JSON-compatible dict with the statistics of the latest `Reload`
+          under "last_reload" (or None if there was none) and, under "runs",
+          a dict from run names to their schedules. Times are seconds
+          relative to now, where negative values are in the past.
+        """
+        now = time.time()
+        with self._accumulators_mutex:
+            runs = {
+                name: schedule.Describe(now)
+                for (name, schedule) in self._schedules.items()
+            }
+        last_reload = self._last_reload_stats
+        if last_reload is not None:
+            last_reload = dict(last_reload)
+            last_reload["start_time"] -= now
+        return {
+            "max_reload_backoff_secs": self._max_reload_backoff_secs,
+            "last_reload": last_reload,
+            "runs": runs,
+        }
+
+    def MarkRunsRequested(self, runs):
+        """Prioritizes reloading runs whose data is being looked at.
+
+        `ScalarColumns`, `Tensors` and `TagStats` do not do this by
+        themselves, since they are also used to list or read all runs (as
+        by every dashboard poll), which would defeat the backoff of idle
+        runs. Readers call this for the runs they were asked for by name.
+
+        Args:
+          runs: An iterable of run names. Unknown runs are ignored.
+        """
+        now = time.time()
+        with self._accumulators_mutex:
+            for run in runs:
+                schedule = self._schedules.get(run)
+                if schedule is not None:
+                    schedule.Requested(now)
+
+    def _GetAccumulatorForRead(self, run):
+        """Like `GetAccumulator`, but also prioritizes reloading the run."""
+        with self._accumulators_mutex:
+            accumulator = self._accumulators[run]
+            self._schedules[run].Requested(time.time())
+            return accumulator
+
+    def Generation(self):
+        """Returns a token that changes whenever the loaded data changes.
+
+        Two calls return equal tokens only if no run was added or removed
+        and no `EventAccumulator` ingested new data in between, so the token
+        can be used to key caches of anything derived from the data.
+
+        Returns:
+          A hashable, opaque value.
+        """
+        with self._accumulators_mutex:
+            runs_generation = self._runs_generation
+            accumulators = list(self._accumulators.values())
+        # Within a given set of runs, the accumulator generations only grow,
+        # so their sum identifies the state of the data.
+        return (
+            runs_generation,
+            sum(accumulator.Generation() for accumulator in accumulators),
+        )
 
     def PluginAssets(self, plugin_name):
         """Get index of runs and assets for a given plugin.
@@ -350,7 +567,7 @@ class EventMultiplexer:
         Returns:
           The `GraphDef` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.Graph()
 
     def SerializedGraph(self, run):
@@ -366,7 +583,7 @@ class EventMultiplexer:
         Returns:
           The serialized form of the `GraphDef` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.SerializedGraph()
 
     def MetaGraph(self, run):
@@ -382,7 +599,7 @@ class EventMultiplexer:
         Returns:
           The `MetaGraphDef` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.MetaGraph()
 
     def RunMetadata(self, run, tag):
@@ -400,7 +617,7 @@ class EventMultiplexer:
         Returns:
           The metadata in the form of `RunMetadata` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.RunMetadata(tag)
 
     def Tensors(self, run, tag):
@@ -420,6 +637,60 @@ class EventMultiplexer:
         accumulator = self.GetAccumulator(run)
         return accumulator.Tensors(tag)
 
+    def TagStats(self, run, tag):
+        """Retrieve aggregates over the events of a run and tag.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          An `event_accumulator.TagStats`.
+        """
+        accumulator = self.GetAccumulator(run)
+        return accumulator.TagStats(tag)
+
+    def TensorAtStep(self, run, tag, step):
+        """Retrieve the tensor event of a run and tag at a given step.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+          step: An integer step.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          An `event_accumulator.TensorEvent`, or None if there is no event at
+          the given step.
+        """
+        accumulator = self._GetAccumulatorForRead(run)
+        return accumulator.TensorAtStep(tag, step)
+
+    def ScalarColumns(self, run, tag):
+        """Retrieve the points of a scalar time series as parallel arrays.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          A tuple `(steps, wall_times, values)` of 1-D NumPy arrays. See
+          `event_accumulator.EventAccumulator.ScalarColumns`.
+        """
+        accumulator = self.GetAccumulator(run)
+        return accumulator.ScalarColumns(tag)
+
     def PluginRunToTagToContent(self, plugin_name):
         """Returns a 2-layer dictionary of the form {run: {tag: content}}.
 
@@ -522,3 +793,70 @@ class EventMultiplexer:
         """
         with self._accumulators_mutex:
             return self._accumulators[run]
+
+
+class _RunSchedule:
+    """When a run is to be reloaded next, and why; see `Reload`.
+
+    Guarded by the `_accumulators_mutex` of the multiplexer.
+    """
+
+    def __init__(self):
+        self.next_reload_time = 0.0
+        self.backoff_secs = 0.0
+        self.reloads = 0
+        self.last_reload_start = None
+        self.last_reload_secs = None
+        self.last_change_time = None
+        self.last_request_time = None
+
+    def IsDue(self, now):
+        return now >= self.next_reload_time or self._RequestedSinceReload()
+
+    def Priority(self):
+        """Returns a sort key; runs with smaller keys are reloaded first."""
+        if self._RequestedSinceReload():
+            return (0, -self.last_request_time)
+        if not self.backoff_secs:
+            return (1, 0.0)
+        return (2, self.next_reload_time)
+
+    def Requested(self, now):
+        self.last_request_time = now
+        # A run being looked at is likely to be looked at again soon.
+        self.backoff_secs = 0.0
+        self.next_reload_time = 0.0
+
+    def Reloaded(self, start, end, changed, max_backoff_secs):
+        self.reloads += 1
+        self.last_reload_start = start
+        self.last_reload_secs = end - start
+        if changed:
+            self.last_change_time = end
+            self.backoff_secs = 0.0
+        else:
+            self.backoff_secs = min(
+                max_backoff_secs,
+                max(_MIN_RELOAD_BACKOFF_SECS, 2 * self.backoff_secs),
+            )
+        self.next_reload_time = end + self.backoff_secs
+
+    def Describe(self, now):
+        def Relative(t):
+            return None if t is None else t - now
+
+        return {
+            "next_reload": max(0.0, self.next_reload_time - now),
+            "backoff_secs": self.backoff_secs,
+            "reloads": self.reloads,
+            "last_reload": Relative(self.last_reload_start),
+            "last_reload_secs": self.last_reload_secs,
+            "last_change": Relative(self.last_change_time),
+            "last_request": Relative(self.last_request_time),
+        }
+
+    def _RequestedSinceReload(self):
+        return self.last_request_time is not None and (
+            self.last_reload_start is None
+            or self.last_request_time > self.last_reload_start
+        )
@@ -20,6 +20,8 @@ import collections
 import random
 import threading
 
+import numpy as np
+
 
 class Reservoir:
     """A map-to-arrays container, with deterministic Reservoir Sampling.
@@ -48,7 +50,8 @@ class Reservoir:
 
     See: https://en.wikipedia.org/wiki/Reservoir_sampling
 
-    Adding items has amortized O(1) runtime.
+    Adding items has O(1) runtime, and reading items never waits for items
+    being added.
 
     Fields:
       always_keep_last: Whether the latest seen sample is always at the
@@ -74,9 +77,7 @@ class Reservoir:
         if size < 0 or size != round(size):
             raise ValueError("size must be nonnegative integer, was %s" % size)
         self._buckets = collections.defaultdict(
-            lambda: _ReservoirBucket(
-                size, random.Random(seed), always_keep_last
-            )
+            lambda: _ReservoirBucket(size, seed, always_keep_last)
         )
         # _mutex guards the keys - creating new keys, retrieving by key, etc
         # the internal items are guarded by the ReservoirBuckets' internal mutexes
@@ -132,10 +133,65 @@ class Reservoir:
           key: The key to store the item under.
           item: The item to add to the reservoir.
           f: An optional function to transform the item prior to addition.
+
+        Returns:
+          The (transformed) item that was evicted from the reservoir to make
+          room, or None if no item was evicted.
+        """
+        with self._mutex:
+            bucket = self._buckets[key]
+        return bucket.AddItem(item, f)
+
+    def AddItems(self, key, items, f=lambda x: x):
+        """Add several new items to the Reservoir with the given tag.
+
+        This keeps exactly the same items as calling `AddItem` for each item
+        in turn, but draws the random numbers for all of them at once.
+
+        Args:
+          key: The key to store the items under.
+          items: A sequence of items to add to the reservoir, in order.
+          f: An optional function to transform each item prior to addition.
+
+        Returns:
+          A list of the (transformed) items that were evicted from the
+          reservoir to make room, including any of `items` that were added
+          and then evicted by a later one of `items`.
+        """
+        with self._mutex:
+            bucket = self._buckets[key]
+        return bucket.AddItems(items, f)
+
+    def GetBucketState(self, key):
+        """Return the sampling state of the bucket for the given key.
+
+        Args:
+          key: The key of the bucket.
+
+        Raises:
+          KeyError: If the key is not found in the reservoir.
+
+        Returns:
+          A dict with the bucket's items, the number of items it has seen,
+          and the state of its random number generator, suitable for passing
+          to `SetBucketState` to continue sampling exactly where it left off.
+        """
+        with self._mutex:
+            if key not in self._buckets:
+                raise KeyError("Key %s was not found in Reservoir" % key)
+            bucket = self._buckets[key]
+        return bucket.GetState()
+
+    def SetBucketState(self, key, state):
+        """Replace the bucket for the given key with a saved state.
+
+        Args:
+          key: The key of the bucket.
+          state: A dict as returned by `GetBucketState`.
         """
         with self._mutex:
             bucket = self._buckets[key]
-        bucket.AddItem(item, f)
+        bucket.SetState(state)
 
     def FilterItems(self, filterFn, key=None):
         """Filter items within a Reservoir, using a filtering function.
@@ -161,10 +217,164 @@ class Reservoir:
                 )
 
 
+class ReservoirSampler:
+    """Decides where a reservoir stores each item of a stream.
+
+    A reservoir with room for `max_size` items is an array of that many
+    slots. Until it is full, item `i` of the stream goes to slot `i`. After
+    that, item `i` replaces the item in a slot chosen uniformly at random
+    with probability `max_size / (i + 1)`; otherwise, it replaces the most
+    recently stored item if `always_keep_last` is set, and is dropped if
+    not. Since only the choice of slot is random, replacing an item takes
+    O(1) time; the order of the items is kept by numbering them as they
+    are stored.
+
+    Random numbers are drawn from a NumPy generator seeded with `seed`, a
+    block at a time, and one is used for each item after the reservoir is
+    full. So the slots chosen depend only on the seed and the number of
+    items, not on whether items come one at a time or in batches.
+
+    This class is not thread-safe.
+    """
+
+    # Number of random numbers drawn at a time for `Next`.
+    _BLOCK_SIZE = 256
+
+    def __init__(self, max_size, seed=0, always_keep_last=True):
+        """Creates a sampler for an empty reservoir.
+
+        Args:
+          max_size: The number of slots, or 0 for unbounded.
+          seed: The seed of the random number generator.
+          always_keep_last: Whether items that do not replace a random item
+            replace the most recently stored one.
+        """
+        self.max_size = max_size
+        self.always_keep_last = always_keep_last
+        self.num_items_seen = 0
+        # Number of slots in use, and the slot of the latest stored item.
+        self.length = 0
+        self.last_slot = -1
+        self._generator = np.random.Generator(np.random.PCG64(seed))
+        self._block = []
+        self._block_pos = 0
+
+    def Next(self):
+        """Returns the slot for the next item, or -1 to drop it."""
+        if self.length < self.max_size or self.max_size == 0:
+            slot = self.length
+            self.length += 1
+        else:
+            if self._block_pos == len(self._block):
+                self._block = self._generator.random(self._BLOCK_SIZE).tolist()
+                self._block_pos = 0
+            u = self._block[self._block_pos]
+            self._block_pos += 1
+            r = int(u * (self.num_items_seen + 1))
+            if r < self.max_size:
+                slot = r
+            elif self.always_keep_last:
+                slot = self.last_slot
+            else:
+                slot = -1
+        self.num_items_seen += 1
+        if slot >= 0:
+            self.last_slot = slot
+        return slot
+
+    def NextBatch(self, n):
+        """Returns the slots for the next `n` items, as for `Next`.
+
+        Returns:
+          A 1-D `intp` array of `n` slots, or -1 for items to drop. If a
+          slot occurs more than once, later items replace earlier ones.
+        """
+        slots = np.empty(n, dtype=np.intp)
+        if self.max_size == 0:
+            num_free = n
+        else:
+            num_free = min(n, self.max_size - self.length)
+        slots[:num_free] = np.arange(self.length, self.length + num_free)
+        self.length += num_free
+        m = n - num_free
+        if m:
+            seen = self.num_items_seen + num_free + np.arange(m)
+            u = self._Uniforms(m)
+            r = (u * (seen + 1)).astype(np.intp)
+            sampled = np.where(r < self.max_size, r, -1)
+            if self.always_keep_last:
+                # Items that don't replace a random item replace the latest
+                # stored item: the one before them, since all are stored.
+                previous = slots[num_free - 1] if num_free else self.last_slot
+                source = np.where(sampled >= 0, np.arange(m), -1)
+                np.maximum.accumulate(source, out=source)
+                sampled = np.where(
+                    source >= 0, sampled[np.maximum(source, 0)], previous
+                )
+            slots[num_free:] = sampled
+        self.num_items_seen += n
+        stored = slots[slots >= 0]
+        if len(stored):
+            self.last_slot = int(stored[-1])
+        return slots
+
+    def Filtered(self, num_kept, num_before):
+        """Updates the state after the reservoir has been compacted.
+
+        Args:
+          num_kept: Number of items left, now in slots `0` to `num_kept - 1`
+            in their order of storage.
+          num_before: Number of items before filtering.
+        """
+        self.length = num_kept
+        self.last_slot = num_kept - 1
+        # Estimate a correction to the number of items seen, as the
+        # number of seen items that would have been kept is unknown.
+        prop_remaining = num_kept / float(num_before) if num_before else 0
+        self.num_items_seen = int(round(self.num_items_seen * prop_remaining))
+
+    def GetState(self):
+        """Returns the state of this sampler as plain data."""
+        return {
+            "num_items_seen": self.num_items_seen,
+            "length": self.length,
+            "last_slot": self.last_slot,
+            "generator": self._generator.bit_generator.state,
+            "block": self._block[self._block_pos :],
+        }
+
+    def SetState(self, state):
+        """Restores a state returned by `GetState`."""
+        self.num_items_seen = state["num_items_seen"]
+        self.length = state["length"]
+        self.last_slot = state["last_slot"]
+        self._generator.bit_generator.state = state["generator"]
+        self._block = list(state["block"])
+        self._block_pos = 0
+
+    def _Uniforms(self, m):
+        """Returns the next `m` random numbers in [0, 1) as an array."""
+        pending = self._block[self._block_pos :]
+        self._block = []
+        self._block_pos = 0
+        if len(pending) >= m:
+            self._block = pending[m:]
+            return np.array(pending[:m])
+        return np.concatenate(
+            [np.array(pending), self._generator.random(m - len(pending))]
+        )
+
+
 class _ReservoirBucket:
     """A container for items from a stream, that implements reservoir sampling.
 
-    It always stores the most recent item as its final item.
+    Items are stored in the slots chosen by a `ReservoirSampler`, along
+    with a sequence number giving their order. `Items` returns a snapshot
+    that is computed once after each change, so readers only wait for
+    writers while copying the slots.
+
+    If `always_keep_last` is set, it always stores the most recent item as
+    its final item.
     """
 
     def __init__(self, _max_size, _random=None, always_keep_last=True):
@@ -173,8 +383,9 @@ class _ReservoirBucket:
         Args:
           _max_size: The maximum size the reservoir bucket may grow to. If size is
             zero, the bucket has unbounded size.
-          _random: The random number generator to use. If not specified, defaults to
-            random.Random(0).
+          _random: The seed of the random number generator to use, or a
+            `random.Random` to draw the seed from. If not specified,
+            defaults to 0.
           always_keep_last: Whether the latest seen item should always be included
             in the end of the bucket.
 
@@ -185,61 +396,92 @@ class _ReservoirBucket:
             raise ValueError(
                 "_max_size must be nonnegative int, was %s" % _max_size
             )
-        self.items = []
-        # This mutex protects the internal items, ensuring that calls to Items and
-        # AddItem are thread-safe
+        if _random is None:
+            seed = 0
+        elif isinstance(_random, random.Random):
+            seed = _random.getrandbits(64)
+        else:
+            seed = _random
+        # This mutex protects the slots and the sampler, ensuring that calls
+        # to Items and AddItem are thread-safe.
         self._mutex = threading.Lock()
         self._max_size = _max_size
-        self._num_items_seen = 0
-        if _random is not None:
-            self._random = _random
-        else:
-            self._random = random.Random(0)
+        self._sampler = ReservoirSampler(_max_size, seed, always_keep_last)
+        self._slots = []
+        self._sequence_numbers = []
+        self._next_sequence_number = 0
+        # Whether slot order is storage order, i.e., no item was replaced.
+        self._in_order = True
+        # The items in order, or None if they changed since last computed.
+        self._snapshot = []
         self.always_keep_last = always_keep_last
 
+    @property
+    def items(self):
+        """The items in the bucket; see `Items`."""
+        return self.Items()
+
     def AddItem(self, item, f=lambda x: x):
         """Add an item to the ReservoirBucket, replacing an old item if
         necessary.
 
-        The new item is guaranteed to be added to the bucket, and to be the last
-        element in the bucket. If the bucket has reached capacity, then an old item
-        will be replaced. With probability (_max_size/_num_items_seen) a random item
-        in the bucket will be popped out and the new item will be appended
-        to the end. With probability (1 - _max_size/_num_items_seen)
-        the last item in the bucket will be replaced.
-
-        Since the O(n) replacements occur with O(1/_num_items_seen) likelihood,
-        the amortized runtime is O(1).
+        Until the bucket has reached capacity, the new item is appended.
+        After that, with probability (_max_size/_num_items_seen) a random
+        item in the bucket is evicted and the new item is added at the end.
+        With probability (1 - _max_size/_num_items_seen), the new item
+        replaces the last item in the bucket if `always_keep_last` is set,
+        and is dropped otherwise.
 
         Args:
           item: The item to add to the bucket.
           f: A function to transform item before addition, if it will be kept in
             the reservoir.
+
+        Returns:
+          The item that was evicted to make room, or None if no item was
+          evicted.
         """
+        evicted = None
         with self._mutex:
-            if len(self.items) < self._max_size or self._max_size == 0:
-                self.items.append(f(item))
-            else:
-                r = self._random.randint(0, self._num_items_seen)
-                if r < self._max_size:
-                    self.items.pop(r)
-                    self.items.append(f(item))
-                elif self.always_keep_last:
-                    self.items[-1] = f(item)
-            self._num_items_seen += 1
+            slot = self._sampler.Next()
+            if slot >= 0:
+                evicted = self._Store(slot, f(item))
+        return evicted
+
+    def AddItems(self, items, f=lambda x: x):
+        """Add several items, as `AddItem` for each in turn would.
+
+        Args:
+          items: A sequence of items to add to the bucket.
+          f: A function to transform each item before addition, if it will
+            be kept in the reservoir.
+
+        Returns:
+          The list of items that were evicted to make room, including any
+          of `items` replaced by a later one of `items`.
+        """
+        evicted = []
+        with self._mutex:
+            slots = self._sampler.NextBatch(len(items)).tolist()
+            for item, slot in zip(items, slots):
+                if slot >= 0:
+                    old = self._Store(slot, f(item))
+                    if old is not None:
+                        evicted.append(old)
+        return evicted
 
     def FilterItems(self, filterFn):
         """Filter items in a ReservoirBucket, using a filtering function.
 
         Filtering items from the reservoir bucket must update the
-        internal state variable self._num_items_seen, which is used for determining
-        the rate of replacement in reservoir sampling. Ideally, self._num_items_seen
-        would contain the exact number of items that have ever seen by the
+        number of items seen by the sampler, which is used for determining
+        the rate of replacement in reservoir sampling. Ideally, it would be
+        the exact number of items that have ever seen by the
         ReservoirBucket and satisfy filterFn. However, the ReservoirBucket does not
         have access to all items seen -- it only has access to the subset of items
-        that have survived sampling (self.items). Therefore, we estimate
-        self._num_items_seen by scaling it by the same ratio as the ratio of items
-        not removed from self.items.
+        that have survived sampling. Therefore, we estimate the number of
+        items seen by scaling it by the same ratio as the ratio of items
+        not removed.
 
         Args:
           filterFn: A function that returns True for items to be kept.
@@ -248,20 +490,77 @@ class _ReservoirBucket:
           The number of items removed from the bucket.
         """
         with self._mutex:
-            size_before = len(self.items)
-            self.items = list(filter(filterFn, self.items))
-            size_diff = size_before - len(self.items)
-
-            # Estimate a correction the number of items seen
-            prop_remaining = (
-                len(self.items) / float(size_before) if size_before > 0 else 0
-            )
-            self._num_items_seen = int(
-                round(self._num_items_seen * prop_remaining)
-            )
-            return size_diff
+            items = self._Ordered()
+            kept = list(filter(filterFn, items))
+            self._Reset(kept)
+            self._sampler.Filtered(len(kept), len(items))
+            return len(items) - len(kept)
 
     def Items(self):
-        """Get all the items in the bucket."""
+        """Get all the items in the bucket, in the order they were added."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._mutex:
+                snapshot = self._Ordered()
+                self._snapshot = snapshot
+        return list(snapshot)
+
+    def GetState(self):
+        """Get the items and sampling state of the bucket.
+
+        The items are listed in the order of their slots, not in the order
+        they were added, which is given by their sequence numbers.
+        """
+        with self._mutex:
+            return {
+                "items": list(self._slots),
+                "sequence_numbers": list(self._sequence_numbers),
+                "sampler": self._sampler.GetState(),
+            }
+
+    def SetState(self, state):
+        """Restore items and sampling state saved by `GetState`."""
         with self._mutex:
-            return list(self.items)
+            self._slots = list(state["items"])
+            self._sequence_numbers = list(state["sequence_numbers"])
+            self._next_sequence_number = (
+                max(self._sequence_numbers, default=-1) + 1
+            )
+            self._in_order = self._sequence_numbers == sorted(
+                self._sequence_numbers
+            )
+            self._snapshot = None
+            self._sampler.SetState(state["sampler"])
+
+    def _Store(self, slot, item):
+        """Stores an item in a slot; returns the item it replaced, if any."""
+        self._snapshot = None
+        sequence_number = self._next_sequence_number
+        self._next_sequence_number += 1
+        if slot == len(self._slots):
+            self._slots.append(item)
+            self._sequence_numbers.append(sequence_number)
+            return None
+        evicted = self._slots[slot]
+        self._slots[slot] = item
+        self._sequence_numbers[slot] = sequence_number
+        if slot != len(self._slots) - 1:
+            self._in_order = False
+        return evicted
+
+    def _Ordered(self):
+        """Returns the items in order; requires the mutex."""
+        if self._in_order:
+            return list(self._slots)
+        order = sorted(
+            range(len(self._slots)), key=self._sequence_numbers.__getitem__
+        )
+        return [self._slots[i] for i in order]
+
+    def _Reset(self, items):
+        """Stores `items` in order in slots from 0; requires the mutex."""
+        self._slots = list(items)
+        self._sequence_numbers = list(range(len(items)))
+        self._next_sequence_number = len(items)
+        self._in_order = True
+        self._snapshot = None
@@ -0,0 +1,342 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A reservoir-sampled scalar time series stored in columnar arrays."""
+
+
+import collections
+import threading
+
+import numpy as np
+
+from tensorboard.backend.event_processing import reservoir
+
+
+# Initial capacity of the arrays of a series, in points.
+_INITIAL_CAPACITY = 16
+
+ScalarItem = collections.namedtuple(
+    "ScalarItem", ("wall_time", "step", "value")
+)
+
+
+class ScalarReservoir:
+    """A single scalar time series, with deterministic reservoir sampling.
+
+    This is the columnar counterpart of a single `reservoir.Reservoir`
+    bucket: points are kept in preallocated NumPy arrays of steps (int64),
+    wall times (float64) and values (the dtype of the scalars added, e.g.
+    float32), rather than as one Python object per point. All points of a
+    series have the dtype and shape of the first one; `Accepts` tells
+    whether a value can be added. Points are
+    stored in the slots chosen by a `reservoir.ReservoirSampler`, so given
+    the same size, seed and input, it keeps exactly the same points as a
+    `reservoir.Reservoir`.
+
+    `Columns` returns read-only snapshots that are computed once after
+    each change, so readers only wait for writers while copying the
+    arrays.
+
+    Fields:
+      always_keep_last: Whether the latest seen sample is always at the
+        end of the reservoir.
+      size: An integer of the maximum number of samples, or 0 to keep all
+        of them.
+      shape: The shape of the values of the series, e.g. `()` or `(1,)`,
+        or None if no point was added yet.
+    """
+
+    def __init__(self, size, seed=0, always_keep_last=True):
+        """Creates a new scalar reservoir.
+
+        Args:
+          size: The number of points to keep. If 0, all points will be kept.
+          seed: The seed of the random number generator to use when sampling.
+          always_keep_last: Whether to always keep the latest seen point at
+            the end of the reservoir. Defaults to True.
+
+        Raises:
+          ValueError: If size is negative or not an integer.
+        """
+        if size < 0 or size != round(size):
+            raise ValueError("size must be nonnegative integer, was %s" % size)
+        self.size = size
+        self.always_keep_last = always_keep_last
+        self._sampler = reservoir.ReservoirSampler(size, seed, always_keep_last)
+        # Guards `_sampler` and all of the fields below.
+        self._mutex = threading.Lock()
+        self._length = 0
+        self._steps = np.empty(0, dtype=np.int64)
+        self._wall_times = np.empty(0, dtype=np.float64)
+        self._values = None
+        self.shape = None
+        # Sequence numbers of the points in each slot, giving their order.
+        self._sequence_numbers = np.empty(0, dtype=np.int64)
+        self._next_sequence_number = 0
+        # Whether slot order is insertion order, i.e., no point was replaced.
+        self._in_order = True
+        # The result of `Columns`, or None if the points changed since.
+        self._snapshot = None
+
+    def __len__(self):
+        with self._mutex:
+            return self._length
+
+    def Accepts(self, value):
+        """Tells whether a value can be added to this series as is.
+
+        Args:
+          value: A NumPy scalar or array.
+
+        Returns:
+          True if `value` is a single boolean or number with the same dtype
+          and shape as the points of the series, or if the series is empty.
+        """
+        if not isinstance(value, (np.generic, np.ndarray)):
+            return False
+        if value.size != 1 or value.dtype.kind not in "biuf":
+            return False
+        with self._mutex:
+            return self._values is None or (
+                value.dtype == self._values.dtype and value.shape == self.shape
+            )
+
+    def AddScalar(self, wall_time, step, value):
+        """Adds a point, replacing an old one if the reservoir is full.
+
+        Args:
+          wall_time: Timestamp of the point in seconds.
+          step: Global step of the point.
+          value: A NumPy scalar or array with a single element, which this
+            series `Accepts`.
+
+        Returns:
+          The `ScalarItem` that was evicted to make room, or None if no
+          point was evicted.
+
+        Raises:
+          ValueError: If the series does not accept `value`.
+        """
+        if not self.Accepts(value):
+            raise ValueError(
+                "expected a single value of dtype %s and shape %r, got %r"
+                % (self._values.dtype, self.shape, value)
+                if self._values is not None
+                else "expected a single boolean or number, got %r" % (value,)
+            )
+        evicted = None
+        with self._mutex:
+            if self._values is None:
+                self.shape = value.shape
+            value = value.reshape(())[()]
+            slot = self._sampler.Next()
+            if slot >= 0:
+                if slot < self._length:
+                    evicted = self._Get(slot)
+                    if slot != self._length - 1:
+                        self._in_order = False
+                else:
+                    self._Grow()
+                self._Set(slot, wall_time, step, value)
+        return evicted
+
+    def Columns(self):
+        """Returns the points in this reservoir as parallel arrays.
+
+        Returns:
+          A tuple `(steps, wall_times, values)` of read-only 1-D NumPy
+          arrays of the same length, in insertion order. The arrays are
+          snapshots: they are not affected by later additions.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._mutex:
+            columns = self._OrderedColumns()
+            for column in columns:
+                column.flags.writeable = False
+            self._snapshot = columns
+            return columns
+
+    def Items(self):
+        """Returns the points in this reservoir as `ScalarItem`s."""
+        (steps, wall_times, values) = self.Columns()
+        return [
+            ScalarItem(wall_time=w, step=s, value=v)
+            for (w, s, v) in zip(wall_times.tolist(), steps.tolist(), values)
+        ]
+
+    def FilterItems(self, filterFn, key=None):
+        """Filters points, as `reservoir.Reservoir.FilterItems` does.
+
+        Args:
+          filterFn: A function that takes a `ScalarItem` and returns True
+            for points to be kept.
+          key: Ignored; for interface compatibility with `Reservoir`.
+
+        Returns:
+          The number of points removed.
+        """
+        del key  # Unused.
+        with self._mutex:
+            (steps, wall_times, values) = self._OrderedColumns()
+            size_before = self._length
+            if size_before == 0:
+                self._sampler.Filtered(0, 0)
+                return 0
+            keep = np.fromiter(
+                (
+                    bool(filterFn(ScalarItem(wall_time=w, step=s, value=v)))
+                    for (w, s, v) in zip(
+                        wall_times.tolist(), steps.tolist(), values
+                    )
+                ),
+                dtype=bool,
+                count=size_before,
+            )
+            n = int(np.count_nonzero(keep))
+            # Store the points in order, in slots from 0.
+            self._steps[:n] = steps[keep]
+            self._wall_times[:n] = wall_times[keep]
+            self._values[:n] = values[keep]
+            self._sequence_numbers[:n] = np.arange(n)
+            self._next_sequence_number = n
+            self._length = n
+            self._in_order = True
+            self._snapshot = None
+            self._sampler.Filtered(n, size_before)
+            return size_before - n
+
+    def GetBucketState(self):
+        """Returns the points and sampling state as a reservoir bucket would.
+
+        Returns:
+          A dict like that of `reservoir.Reservoir.GetBucketState`, whose
+          items are `ScalarItem`s in slot order. Once the items are turned
+          into the objects to store, it can be passed to `SetBucketState`
+          of a `reservoir.Reservoir` of the same size to continue sampling
+          exactly where this series left off.
+        """
+        with self._mutex:
+            n = self._length
+            return {
+                "items": [self._Get(i) for i in range(n)],
+                "sequence_numbers": self._sequence_numbers[:n].tolist(),
+                "sampler": self._sampler.GetState(),
+            }
+
+    def GetState(self):
+        """Returns the points and sampling state as plain data."""
+        with self._mutex:
+            n = self._length
+            values = self._values
+            return {
+                "steps": self._steps[:n].tobytes(),
+                "wall_times": self._wall_times[:n].tobytes(),
+                "values": values[:n].tobytes() if values is not None else b"",
+                "dtype": values.dtype.str if values is not None else None,
+                "shape": self.shape,
+                "sequence_numbers": self._sequence_numbers[:n].tobytes(),
+                "sampler": self._sampler.GetState(),
+            }
+
+    def SetState(self, state):
+        """Restores points and sampling state saved by `GetState`."""
+        with self._mutex:
+            self._steps = np.frombuffer(state["steps"], dtype=np.int64).copy()
+            self._wall_times = np.frombuffer(
+                state["wall_times"], dtype=np.float64
+            ).copy()
+            if state["dtype"] is None:
+                self._values = None
+                self.shape = None
+            else:
+                self._values = np.frombuffer(
+                    state["values"], dtype=np.dtype(state["dtype"])
+                ).copy()
+                self.shape = tuple(state["shape"])
+            self._sequence_numbers = np.frombuffer(
+                state["sequence_numbers"], dtype=np.int64
+            ).copy()
+            n = len(self._steps)
+            self._length = n
+            self._next_sequence_number = (
+                int(self._sequence_numbers.max()) + 1 if n else 0
+            )
+            self._in_order = bool(
+                np.all(self._sequence_numbers[1:] > self._sequence_numbers[:-1])
+            )
+            self._snapshot = None
+            self._sampler.SetState(state["sampler"])
+
+    def _OrderedColumns(self):
+        """Returns copies of the columns in insertion order.
+
+        Requires the mutex.
+        """
+        n = self._length
+        if self._values is None:
+            return (
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.float64),
+                np.empty(0, dtype=np.float32),
+            )
+        if self._in_order:
+            return (
+                self._steps[:n].copy(),
+                self._wall_times[:n].copy(),
+                self._values[:n].copy(),
+            )
+        order = np.argsort(self._sequence_numbers[:n])
+        return (
+            self._steps[order],
+            self._wall_times[order],
+            self._values[order],
+        )
+
+    def _Grow(self):
+        """Makes room for one more point at the end."""
+        if self._values is None or self._length == len(self._steps):
+            capacity = 2 * len(self._steps) or _INITIAL_CAPACITY
+            if self.size:
+                capacity = min(capacity, self.size)
+            self._steps = _resized(self._steps, capacity)
+            self._wall_times = _resized(self._wall_times, capacity)
+            self._sequence_numbers = _resized(self._sequence_numbers, capacity)
+            if self._values is not None:
+                self._values = _resized(self._values, capacity)
+        self._length += 1
+
+    def _Get(self, i):
+        return ScalarItem(
+            wall_time=self._wall_times[i].item(),
+            step=self._steps[i].item(),
+            value=self._values[i],
+        )
+
+    def _Set(self, i, wall_time, step, value):
+        if self._values is None:
+            self._values = np.empty(len(self._steps), dtype=value.dtype)
+        self._steps[i] = step
+        self._wall_times[i] = wall_time
+        self._values[i] = value
+        self._sequence_numbers[i] = self._next_sequence_number
+        self._next_sequence_number += 1
+        self._snapshot = None
+
+
+def _resized(array, capacity):
+    result = np.empty(capacity, dtype=array.dtype)
+    result[: len(array)] = array
+    return result
@@ -91,6 +91,7 @@ def Respond(
     encoding="utf-8",
     csp_scripts_sha256s=None,
     headers=None,
+    content_length=None,
 ):
     """Construct a werkzeug Response.
 
@@ -122,6 +123,9 @@ def Respond(
       request: A werkzeug Request object. Used mostly to check the
         Accept-Encoding header.
       content: Payload data as byte string, unicode string, or maybe JSON.
+        It may also be an iterable of byte strings other than a bytes-like
+        object, which is streamed to the client as is; `content_length`
+        is then required.
       content_type: Media type and optionally an output charset.
       code: Numeric HTTP status code to use.
       expires: Second duration for browser caching.
@@ -134,6 +138,8 @@ def Respond(
       headers: Any additional headers to include on the response, as a
         list of key-value tuples: e.g., `[("Allow", "GET")]`. In case of
         conflict, these may be overridden with headers added by this function.
+      content_length: Total length of streamed `content`. Ignored for other
+        content.
 
     Returns:
       A werkzeug Response object (a WSGI application).
@@ -162,7 +168,12 @@ def Respond(
         request.headers.get("Accept-Encoding", "")
     )
     # Automatically gzip uncompressed text data if accepted.
-    if textual and not content_encoding and gzip_accepted:
+    streamed = content is not None and not isinstance(
+        content, (bytes, bytearray, memoryview)
+    )
+    if streamed and content_length is None:
+        raise ValueError("content_length is required for streamed content")
+    if textual and not content_encoding and gzip_accepted and not streamed:
         out = io.BytesIO()
         # Set mtime to zero to make payload for a given input deterministic.
         with gzip.GzipFile(
@@ -172,10 +183,11 @@ def Respond(
         content = out.getvalue()
         content_encoding = "gzip"
 
-    content_length = len(content)
-    direct_passthrough = False
+    if not streamed:
+        content_length = len(content)
+    direct_passthrough = streamed
     # Automatically streamwise-gunzip precompressed data if not accepted.
-    if content_encoding == "gzip" and not gzip_accepted:
+    if content_encoding == "gzip" and not gzip_accepted and not streamed:
         gzip_file = gzip.GzipFile(fileobj=io.BytesIO(content), mode="rb")
         # Last 4 bytes of gzip formatted data (little-endian) store the original
         # content length mod 2^32; we just assume it's the content length. That
@@ -0,0 +1,294 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Server-side cache of data route responses, with conditional GET."""
+
+
+import collections
+import hashlib
+import io
+import threading
+
+from tensorboard import context
+from tensorboard.backend import experiment_id as experiment_id_lib
+
+# Routes whose responses are computed only from the request and the data
+# provider, and may thus be reused for as long as the data generation of
+# the experiment does not change.
+DEFAULT_CACHEABLE_ROUTE_PREFIXES = (
+    "/data/runs",
+    "/data/plugin/audio/",
+    "/data/plugin/distributions/",
+    "/data/plugin/histograms/",
+    "/data/plugin/images/",
+    "/data/plugin/pr_curves/",
+    "/data/plugin/scalars/",
+    "/data/plugin/text/",
+    "/data/plugin/timeseries/",
+)
+
+# Largest form-encoded POST body that is read to key a request. Requests
+# with larger or other bodies are passed through uncached.
+_MAX_POST_BODY_BYTES = 1 << 20
+
+_FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# Client feature flags may affect responses; see `client_feature_flags`.
+_FEATURE_FLAGS_HEADER = "HTTP_X_TENSORBOARD_FEATURE_FLAGS"
+
+# Headers of a 200 response that are repeated on a 304 response. The
+# content type headers are not required, but expected by the
+# `SecurityValidatorMiddleware`.
+_NOT_MODIFIED_HEADERS = frozenset(
+    [
+        "cache-control",
+        "content-location",
+        "content-type",
+        "etag",
+        "expires",
+        "vary",
+        "x-content-type-options",
+    ]
+)
+
+_Entry = collections.namedtuple("_Entry", ("headers", "body", "etag"))
+
+
+class ResponseCache:
+    """A byte-bounded LRU map from request keys to response entries.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, max_bytes):
+        """Initializes a `ResponseCache`.
+
+        Args:
+          max_bytes: Maximum total size in bytes of the cached bodies.
+        """
+        self._max_bytes = max_bytes
+        self._mutex = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Returns the entry cached under `key`, or `None`."""
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Caches `entry` under `key`, evicting old entries as needed."""
+        size = len(entry.body)
+        if size > self._max_bytes:
+            return
+        with self._mutex:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.body)
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self._max_bytes:
+                (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+                self._evictions += 1
+
+    def stats(self):
+        """Returns a dict of counters describing the use of this cache."""
+        with self._mutex:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self._max_bytes,
+            }
+
+
+class ResponseCacheMiddleware:
+    """WSGI middleware caching data route responses by data generation.
+
+    Successful responses to cacheable routes are stored as sent, i.e.,
+    already gzipped if the client accepted that, keyed by the route, the
+    query string (and form-encoded POST body), the experiment ID, the
+    headers that affect the response, and the `data_generation` of the
+    experiment as reported by the data provider. Once the data provider
+    ingests new data the generation changes, so older entries are no
+    longer looked up and eventually fall out of the LRU.
+
+    Each cached response carries a strong `ETag`, and requests whose
+    `If-None-Match` lists it get a `304 Not Modified` without a body.
+
+    Requests are passed through uncached if the data provider does not
+    support `data_generation`.
+
+    Instances of this class are WSGI applications (see PEP 3333).
+    """
+
+    def __init__(
+        self,
+        application,
+        data_provider,
+        max_bytes,
+        cacheable_route_prefixes=DEFAULT_CACHEABLE_ROUTE_PREFIXES,
+    ):
+        """Initializes a `ResponseCacheMiddleware`.
+
+        Args:
+          application: The WSGI application to wrap (see PEP 3333).
+          data_provider: The `tensorboard.data.provider.DataProvider` from
+            which the responses of the wrapped application are computed.
+          max_bytes: Maximum total size in bytes of the cached responses.
+          cacheable_route_prefixes: Collection of route prefixes (after
+            any path prefix and experiment ID have been stripped) whose
+            responses may be cached.
+        """
+        self._application = application
+        self._data_provider = data_provider
+        self._cacheable_route_prefixes = tuple(cacheable_route_prefixes)
+        self.cache = ResponseCache(max_bytes)
+
+    def __call__(self, environ, start_response):
+        key = self._key(environ)
+        if key is None:
+            return self._application(environ, start_response)
+        entry = self.cache.get(key)
+        if entry is None:
+            (status, headers, body) = _capture(self._application, environ)
+            if not _is_cacheable(status, headers):
+                start_response(status, headers)
+                return [body]
+            etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+            headers = [(k, v) for (k, v) in headers if k.lower() != "etag"]
+            headers.append(("ETag", etag))
+            entry = _Entry(headers=headers, body=body, etag=etag)
+            self.cache.put(key, entry)
+        if _etag_matches(environ.get("HTTP_IF_NONE_MATCH"), entry.etag):
+            start_response(
+                "304 Not Modified",
+                [
+                    (k, v)
+                    for (k, v) in entry.headers
+                    if k.lower() in _NOT_MODIFIED_HEADERS
+                ],
+            )
+            return []
+        start_response("200 OK", list(entry.headers))
+        return [entry.body]
+
+    def _key(self, environ):
+        """Returns the cache key of a request, or `None` if uncacheable."""
+        method = environ.get("REQUEST_METHOD", "GET")
+        path = environ.get("PATH_INFO", "")
+        if not path.startswith(self._cacheable_route_prefixes):
+            return None
+        body = b""
+        if method == "POST":
+            content_type = environ.get("CONTENT_TYPE", "")
+            if not content_type.startswith(_FORM_CONTENT_TYPE):
+                return None
+            try:
+                length = int(environ.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                return None
+            if length > _MAX_POST_BODY_BYTES:
+                return None
+            body = environ["wsgi.input"].read(length)
+            # Let the application read the body again.
+            environ["wsgi.input"] = io.BytesIO(body)
+            environ["CONTENT_LENGTH"] = str(len(body))
+        elif method != "GET":
+            return None
+        eid = environ.get(experiment_id_lib.WSGI_ENVIRON_KEY, "")
+        generation = self._data_provider.data_generation(
+            context.from_environ(environ), experiment_id=eid
+        )
+        if generation is None:
+            return None
+        return (
+            method,
+            path,
+            environ.get("QUERY_STRING", ""),
+            body,
+            eid,
+            environ.get("HTTP_ACCEPT", ""),
+            environ.get("HTTP_ACCEPT_ENCODING", ""),
+            environ.get(_FEATURE_FLAGS_HEADER, ""),
+            generation,
+        )
+
+
+def _capture(application, environ):
+    """Runs a WSGI application to completion.
+
+    Returns:
+      A tuple `(status, headers, body)`, where `body` is the full response
+      body as bytes.
+    """
+    response = []
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        del exc_info  # Unused.
+        response[:] = [status, list(headers)]
+        return chunks.append
+
+    result = application(environ, start_response)
+    try:
+        chunks.extend(result)
+    finally:
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
+    (status, headers) = response
+    return (status, headers, b"".join(chunks))
+
+
+def _is_cacheable(status, headers):
+    """Whether a captured response can be served again later."""
+    if not status.startswith("200"):
+        return False
+    for k, v in headers:
+        k = k.lower()
+        if k == "set-cookie":
+            return False
+        # Responses that let the browser cache them carry an absolute
+        # expiration date, which would go stale in the cache.
+        if k == "expires" and v != "0":
+            return False
+    return True
+
+
+def _etag_matches(if_none_match, etag):
+    """Whether an `If-None-Match` header value lists the given ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
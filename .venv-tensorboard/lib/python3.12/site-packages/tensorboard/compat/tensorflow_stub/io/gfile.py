@@ -20,13 +20,17 @@ TensorBoard.  This allows running TensorBoard without depending on
 TensorFlow for file operations.
 """
 
+import collections
 import dataclasses
 import glob as py_glob
 import io
 import os
 import os.path
+import re
+import stat as stat_lib
 import sys
 import tempfile
+import threading
 
 try:
     import botocore.exceptions
@@ -56,6 +60,30 @@ from tensorboard.compat.tensorflow_stub import compat, errors
 _DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
 
 
+# Default maximum number of local files kept open for reading; see
+# `LocalFilePool`.
+_DEFAULT_LOCAL_FILE_POOL_SIZE = 512
+_O_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+
+# Files written to filesystems without an efficient append (see `GFile`)
+# are stored as the object at the file's own path followed by "segment"
+# objects holding the bytes appended by each later flush, named by this
+# suffix with indices counting up from 1. Reads, listings and stats through
+# this module present the segments as one file.
+_SEGMENT_SUFFIX = ".tbsegment-%08d"
+_SEGMENT_MARKER = ".tbsegment-"
+_SEGMENT_PATTERN = re.compile(r"\.tbsegment-[0-9]{8}$")
+
+# Base names of the files that the latest listing through this module (or
+# a write from this process) showed to have segments. Readers at the end of
+# the object at a file's own path only look for a first segment of these
+# files, so that polling other files costs no extra requests. Since
+# spellings of a path can differ, files are matched by base name, where a
+# collision only costs a needless probe.
+_SEGMENTED_FILES = set()
+
+
 # Registry of filesystems by prefix.
 #
 # Currently supports "s3://" URLs for S3 based on boto3 and falls
@@ -95,9 +123,291 @@ class StatData:
     length: int
 
 
+class LocalFilePool:
+    """A bounded LRU pool of open file descriptors for reading local files.
+
+    Reading a chunk of a file by path would otherwise take an `exists`
+    check, an `open`, a `seek`, a `read` and a `close` each time, which
+    dominates polling many small files for new data. Instead, descriptors
+    stay open across reads, which use `os.pread` at the requested offset.
+    Each read first stats the path, both to skip reading at end of file and
+    to reopen the file if the path now refers to a different inode (e.g.,
+    because the file was replaced).
+
+    Descriptors in use by a read are only closed once that read finishes,
+    so the pool may briefly exceed its size under concurrent reads.
+
+    This class is thread-safe.
+    """
+
+    _Entry = collections.namedtuple("_Entry", ("fd", "dev", "ino", "state"))
+
+    def __init__(self, max_size=_DEFAULT_LOCAL_FILE_POOL_SIZE):
+        """Creates an empty pool.
+
+        Args:
+          max_size: Maximum number of descriptors kept open between reads.
+        """
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # Maps paths to entries, least recently used first. The `state` of
+        # an entry is a list `[users, retired]`.
+        self._entries = collections.OrderedDict()
+        self._stats = {
+            "reads": 0,
+            "eof_reads": 0,
+            "hits": 0,
+            "unpooled_reads": 0,
+            "opens": 0,
+            "invalidations": 0,
+            "evictions": 0,
+        }
+
+    def set_max_size(self, max_size):
+        """Changes the maximum number of descriptors kept open."""
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    def stats(self):
+        """Returns a dict of counters describing the use of this pool.
+
+        The counters are: `reads` served, of which `eof_reads` needed no
+        `pread` because they started at or past the end of the file and
+        `unpooled_reads` of empty or non-regular files (e.g., procfs files
+        or FIFOs), which bypass the pool; `hits` and `opens` of
+        descriptors; `invalidations`, descriptors dropped
+        because their path now refers to another inode; `evictions` of least
+        recently used descriptors; and the current number of `open_files`
+        and `max_size`.
+        """
+        with self._lock:
+            result = dict(self._stats)
+            result["open_files"] = len(self._entries)
+            result["max_size"] = self._max_size
+            return result
+
+    def clear(self):
+        """Closes all descriptors not in use and forgets all of them."""
+        with self._lock:
+            while self._entries:
+                (_, entry) = self._entries.popitem(last=False)
+                self._retire(entry)
+
+    def pread(self, filename, size, offset, file_id=None):
+        """Reads from a file at an offset.
+
+        Args:
+          filename: string or bytes, a path
+          size: maximum number of bytes to read, or None to read to the end
+            of the file
+          offset: byte offset at which to start reading
+          file_id: optional `(st_dev, st_ino)` pair of the file to read.
+            While a descriptor of that file is pooled, it is read without
+            checking the path, like a file object would be. Otherwise, if the
+            path now refers to a different file, nothing is read.
+
+        Returns:
+          The bytes read, which are fewer than `size` only at end of file.
+
+        Raises:
+          errors.NotFoundError: If the file does not exist.
+        """
+        path = compat.as_bytes(filename)
+        if file_id is not None:
+            entry = self._acquire_if_pooled(path, file_id)
+            if entry is not None:
+                return self._read(entry, size, offset)
+        try:
+            st = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            # Don't keep a removed file alive.
+            with self._lock:
+                entry = self._entries.pop(path, None)
+                if entry is not None:
+                    self._retire(entry)
+                    self._stats["invalidations"] += 1
+            raise errors.NotFoundError(
+                None, None, "Not Found: " + compat.as_text(filename)
+            )
+        if file_id is not None and file_id != (st.st_dev, st.st_ino):
+            with self._lock:
+                self._stats["reads"] += 1
+                self._stats["eof_reads"] += 1
+            return b""
+        if not stat_lib.S_ISREG(st.st_mode) or not st.st_size:
+            # The size of, e.g., FIFOs, devices and procfs files (which are
+            # regular files of size 0) is not known up front, and they may
+            # not support `pread`. Empty files are read the same way.
+            with self._lock:
+                self._stats["reads"] += 1
+                self._stats["unpooled_reads"] += 1
+            return _read_unpooled(path, size, offset)
+        if offset >= st.st_size:
+            with self._lock:
+                self._stats["reads"] += 1
+                self._stats["eof_reads"] += 1
+            return b""
+        entry = self._acquire(path, st)
+        if file_id is not None and file_id != (entry.dev, entry.ino):
+            self._release(entry)
+            return b""
+        return self._read(entry, size, offset)
+
+    def _read(self, entry, size, offset):
+        """Reads from an acquired entry, then releases it."""
+        try:
+            if size is not None:
+                return os.pread(entry.fd, size, offset)
+            chunks = []
+            while True:
+                chunk = os.pread(entry.fd, _DEFAULT_BLOCK_SIZE, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+            return b"".join(chunks)
+        finally:
+            self._release(entry)
+
+    def _acquire_if_pooled(self, path, file_id):
+        """Returns the entry for `path` marked as in use if it has `file_id`."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or (entry.dev, entry.ino) != file_id:
+                return None
+            self._entries.move_to_end(path)
+            self._stats["reads"] += 1
+            self._stats["hits"] += 1
+            entry.state[0] += 1
+            return entry
+
+    def _acquire(self, path, st):
+        """Returns an entry for `path`, marked as in use."""
+        with self._lock:
+            self._stats["reads"] += 1
+            entry = self._entries.get(path)
+            if entry is not None and (entry.dev, entry.ino) != (
+                st.st_dev,
+                st.st_ino,
+            ):
+                del self._entries[path]
+                self._retire(entry)
+                self._stats["invalidations"] += 1
+                entry = None
+            if entry is None:
+                try:
+                    fd = os.open(path, os.O_RDONLY | _O_CLOEXEC)
+                except (FileNotFoundError, NotADirectoryError):
+                    raise errors.NotFoundError(
+                        None, None, "Not Found: " + compat.as_text(path)
+                    )
+                # Key by what was actually opened, in case the file was
+                # replaced since `st` was taken.
+                opened = os.fstat(fd)
+                entry = self._Entry(
+                    fd, opened.st_dev, opened.st_ino, [0, False]
+                )
+                self._entries[path] = entry
+                self._stats["opens"] += 1
+            else:
+                self._entries.move_to_end(path)
+                self._stats["hits"] += 1
+            entry.state[0] += 1
+            self._evict()
+            return entry
+
+    def _release(self, entry):
+        with self._lock:
+            entry.state[0] -= 1
+            if entry.state[1] and not entry.state[0]:
+                os.close(entry.fd)
+
+    def _evict(self):
+        """Retires least recently used entries beyond the maximum size."""
+        while len(self._entries) > self._max_size:
+            (_, entry) = self._entries.popitem(last=False)
+            self._retire(entry)
+            self._stats["evictions"] += 1
+
+    def _retire(self, entry):
+        """Closes the descriptor of an entry once it is no longer in use."""
+        entry.state[1] = True
+        if not entry.state[0]:
+            os.close(entry.fd)
+
+
+def _read_unpooled(path, size, offset):
+    """Reads from a file with a descriptor of its own, as a file object would."""
+    with io.open(path, "rb") as f:
+        if offset:
+            f.seek(offset)
+        return f.read(size)
+
+
+class PooledLocalFile:
+    """A read-only, file-like view of a local file, read via `LocalFilePool`.
+
+    Unlike a file object, this holds no descriptor of its own, so that any
+    number of them may be open at once. Like a file object, it keeps
+    reading the file it was opened on, as long as its descriptor stays
+    pooled. Once the path is removed or refers to another file and the
+    descriptor has been evicted, reads return no data.
+    """
+
+    def __init__(self, filename, offset=0, pool=None):
+        """Opens a local file for reading.
+
+        Args:
+          filename: string or bytes, a path
+          offset: byte offset at which to start reading
+          pool: `LocalFilePool` to read through. Defaults to the pool of the
+            registered local filesystem.
+        """
+        self._filename = compat.as_bytes(filename)
+        self._offset = offset
+        self._pool = pool if pool is not None else _LOCAL_FILE_POOL
+        try:
+            st = os.stat(self._filename)
+        except (FileNotFoundError, NotADirectoryError):
+            raise errors.NotFoundError(
+                None, None, "Not Found: " + compat.as_text(filename)
+            )
+        self._file_id = (st.st_dev, st.st_ino)
+
+    def read(self, size=None):
+        """Reads up to `size` bytes, or to the end of the file."""
+        try:
+            data = self._pool.pread(
+                self._filename, size, self._offset, self._file_id
+            )
+        except errors.NotFoundError:
+            return b""
+        self._offset += len(data)
+        return data
+
+    def seek(self, offset):
+        self._offset = offset
+
+    def tell(self):
+        return self._offset
+
+    def close(self):
+        pass
+
+
 class LocalFileSystem:
     """Provides local fileystem access."""
 
+    def __init__(self, pool=None):
+        """Creates a `LocalFileSystem`.
+
+        Args:
+          pool: optional `LocalFilePool` for binary reads. Defaults to the
+            shared pool; see `local_file_pool`.
+        """
+        self._pool = pool if pool is not None else _LOCAL_FILE_POOL
+
     def exists(self, filename):
         """Determines whether a path exists or not."""
         return os.path.exists(compat.as_bytes(filename))
@@ -126,15 +436,20 @@ class LocalFileSystem:
             is an opaque value that can be passed to the next invocation of
             `read(...) ' in order to continue from the last read position.
         """
+        offset = None
+        if continue_from is not None:
+            offset = continue_from.get("opaque_offset", None)
+        if binary_mode and _HAS_PREAD:
+            # In binary mode, the opaque offset is a byte offset.
+            offset = offset or 0
+            data = self._pool.pread(filename, size, offset)
+            return (data, {"opaque_offset": offset + len(data)})
         mode = "rb" if binary_mode else "r"
         encoding = None if binary_mode else "utf8"
         if not exists(filename):
             raise errors.NotFoundError(
                 None, None, "Not Found: " + compat.as_text(filename)
             )
-        offset = None
-        if continue_from is not None:
-            offset = continue_from.get("opaque_offset", None)
         with io.open(filename, mode, encoding=encoding) as f:
             if offset is not None:
                 f.seek(offset)
@@ -207,6 +522,13 @@ class LocalFileSystem:
         """Creates a directory and all parent/intermediate directories."""
         os.makedirs(path, exist_ok=True)
 
+    def remove(self, filename):
+        """Deletes a file."""
+        try:
+            os.remove(compat.as_bytes(filename))
+        except FileNotFoundError:
+            raise errors.NotFoundError(None, None, "Could not find file")
+
     def stat(self, filename):
         """Returns file statistics for a given path."""
         # NOTE: Size of the file is given by .st_size as returned from
@@ -218,6 +540,15 @@ class LocalFileSystem:
         return StatData(file_length)
 
 
+_HAS_PREAD = hasattr(os, "pread")
+_LOCAL_FILE_POOL = LocalFilePool()
+
+
+def local_file_pool():
+    """Returns the `LocalFilePool` shared by local file reads."""
+    return _LOCAL_FILE_POOL
+
+
 class S3FileSystem:
     """Provides filesystem access to S3."""
 
@@ -364,6 +695,27 @@ class S3FileSystem:
                     keys.append(filename + key)
         return keys
 
+    def glob_with_sizes(self, filename):
+        """Like `glob`, but returns a dict from file names to sizes."""
+        # Only support prefix with * at the end and no ? in the string
+        if "?" in filename:
+            raise NotImplementedError(
+                "{} not supported by compat glob".format(filename)
+            )
+        if filename.find("*") != len(filename) - 1:
+            return {}
+        filename = filename[:-1]
+        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        bucket, path = self.bucket_and_path(filename)
+        p = client.get_paginator("list_objects")
+        sizes = {}
+        for r in p.paginate(Bucket=bucket, Prefix=path):
+            for o in r.get("Contents", []):
+                key = o["Key"][len(path) :]
+                if key:  # Skip the base dir, which would add an empty string
+                    sizes[filename + key] = o["Size"]
+        return sizes
+
     def isdir(self, dirname):
         """Returns whether the path is a directory or not."""
         client = boto3.client("s3", endpoint_url=self._s3_endpoint)
@@ -402,6 +754,12 @@ class S3FileSystem:
                 path += "/"  # This will make sure we don't override a file
             client.put_object(Body="", Bucket=bucket, Key=path)
 
+    def remove(self, filename):
+        """Deletes a file."""
+        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        bucket, path = self.bucket_and_path(filename)
+        client.delete_object(Bucket=bucket, Key=path)
+
     def stat(self, filename):
         """Returns file statistics for a given path."""
         # NOTE: Size of the file is given by ContentLength from S3,
@@ -436,6 +794,12 @@ class FSSpecFileSystem:
     SEPARATOR = "://"
     CHAIN_SEPARATOR = "::"
 
+    # Protocols of object stores that cannot append to an object in place,
+    # so that appending rewrites (and often re-uploads) the whole object.
+    NO_APPEND_PROTOCOLS = frozenset(
+        ["s3", "s3a", "gs", "gcs", "abfs", "abfss", "az", "adl", "oss"]
+    )
+
     def _validate_path(self, path):
         parts = path.split(self.CHAIN_SEPARATOR)
         for part in parts[:-1]:
@@ -569,6 +933,14 @@ class FSSpecFileSystem:
         """
         self._write(filename, file_content, "ab" if binary_mode else "a")
 
+    def supports_append(self, filename):
+        """Returns whether `append` to the given file is efficient."""
+        fs, _ = self._fs_path(filename)
+        protocols = fs.protocol
+        if isinstance(protocols, str):
+            protocols = (protocols,)
+        return not self.NO_APPEND_PROTOCOLS.intersection(protocols)
+
     def _write(self, filename, file_content, mode):
         fs, path = self._fs_path(filename)
         encoding = None if "b" in mode else "utf8"
@@ -610,6 +982,30 @@ class FSSpecFileSystem:
             for file in files
         ]
 
+    @_translate_errors
+    def glob_with_sizes(self, filename):
+        """Like `glob`, but returns a dict from file names to sizes."""
+        if isinstance(filename, bytes):
+            filename = filename.decode("utf-8")
+
+        fs, path = self._fs_path(filename)
+        infos = fs.glob(path, detail=True)
+        if (
+            self.SEPARATOR not in filename
+            and self.CHAIN_SEPARATOR not in filename
+        ):
+            prefix = ""
+        else:
+            prefix = self._get_chain_protocol_prefix(filename)
+        return {
+            (
+                file
+                if (self.SEPARATOR in file or self.CHAIN_SEPARATOR in file)
+                else prefix + file
+            ): info.get("size")
+            for (file, info) in infos.items()
+        }
+
     @_translate_errors
     def isdir(self, dirname):
         """Returns whether the path is a directory or not."""
@@ -630,6 +1026,12 @@ class FSSpecFileSystem:
         fs, path = self._fs_path(dirname)
         return fs.makedirs(path, exist_ok=True)
 
+    @_translate_errors
+    def remove(self, filename):
+        """Deletes a file."""
+        fs, path = self._fs_path(filename)
+        fs.rm(path)
+
     @_translate_errors
     def stat(self, filename):
         """Returns file statistics for a given path."""
@@ -661,10 +1063,135 @@ if S3_ENABLED:
     register_filesystem("s3", S3FileSystem())
 
 
+def _segment_name(filename, index):
+    """Returns the name of the `index`-th segment object of a file."""
+    return compat.as_str_any(filename) + _SEGMENT_SUFFIX % index
+
+
+def _is_segment(filename):
+    """Returns whether a path names a segment object of some file."""
+    filename = compat.as_str_any(filename)
+    return _SEGMENT_MARKER in filename and bool(
+        _SEGMENT_PATTERN.search(filename)
+    )
+
+
+def _list_segments(fs, filename):
+    """Lists the segment objects of a file with one directory listing.
+
+    Args:
+      fs: The filesystem of `filename`.
+      filename: Path of a file that may have been written in segments.
+
+    Returns:
+      A list of `(segment_name, length)` pairs for the segments with
+      indices 1, 2, ... up to the first missing one, where `length` is
+      None unless the listing of `fs` includes object sizes.
+    """
+    filename = compat.as_str_any(filename)
+    pattern = filename + _SEGMENT_MARKER + "*"
+    glob_with_sizes = getattr(fs, "glob_with_sizes", None)
+    if glob_with_sizes is not None:
+        name_to_length = glob_with_sizes(pattern)
+    else:
+        name_to_length = dict.fromkeys(fs.glob(pattern))
+    # Listings may spell paths differently than `filename` (e.g., without
+    # a protocol), so match segments by their index and base name.
+    base_name = filename.rpartition("/")[2]
+    index_to_segment = {}
+    for name, length in name_to_length.items():
+        (head, _, digits) = compat.as_str_any(name).rpartition(_SEGMENT_MARKER)
+        if len(digits) == 8 and digits.isdigit() and head.endswith(base_name):
+            index_to_segment[int(digits)] = (name, length)
+    segments = []
+    while len(segments) + 1 in index_to_segment:
+        segments.append(index_to_segment[len(segments) + 1])
+    _note_segments(filename, bool(segments))
+    return segments
+
+
+def _note_segments(filename, has_segments):
+    """Records whether a listing showed a file to have segments."""
+    base_name = compat.as_str_any(filename).rpartition("/")[2]
+    if has_segments:
+        _SEGMENTED_FILES.add(base_name)
+    else:
+        _SEGMENTED_FILES.discard(base_name)
+
+
+def _known_to_have_segments(filename):
+    """Returns whether a listing showed a file to have segments."""
+    return compat.as_str_any(filename).rpartition("/")[2] in _SEGMENTED_FILES
+
+
+def _without_segments(names, complete):
+    """Drops segment objects from a listing, noting which files have them.
+
+    Args:
+      names: A list of paths or base names, as from `glob` or `listdir`.
+      complete: Whether `names` lists a whole directory, and so shows
+        that files listed without segments have none. A glob pattern may
+        match a file but not its segments.
+
+    Returns:
+      The entries of `names` that are not segment objects.
+    """
+    result = []
+    segmented = set()
+    for name in names:
+        if _is_segment(name):
+            head = compat.as_str_any(name).rpartition(_SEGMENT_MARKER)[0]
+            segmented.add(head.rpartition("/")[2])
+        else:
+            result.append(name)
+    if complete:
+        for name in result:
+            base_name = compat.as_str_any(name).rpartition("/")[2]
+            if base_name not in segmented:
+                _SEGMENTED_FILES.discard(base_name)
+    _SEGMENTED_FILES.update(segmented)
+    return result
+
+
+def _may_have_segments(fs):
+    """Returns whether files on `fs` may have been written in segments."""
+    return not isinstance(fs, LocalFileSystem)
+
+
+def _supports_append(fs, filename):
+    """Returns whether `fs` can efficiently append to the given file."""
+    supports_append = getattr(fs, "supports_append", None)
+    if supports_append is not None:
+        return supports_append(filename)
+    return hasattr(fs, "append")
+
+
 class GFile:
-    # Only methods needed for TensorBoard are implemented.
+    """File I/O wrapper, like `tf.io.gfile.GFile`.
+
+    Only methods needed for TensorBoard are implemented.
+
+    Writes to filesystems that cannot efficiently append (e.g., S3 and other
+    object stores) are spooled to a local temporary file until `flush` or
+    `close`. By default, each flush then uploads only the bytes written since
+    the previous one: the first as the object at `filename`, and later ones
+    as new "segment" objects next to it, which reads through this module
+    append to the file transparently. With `segmented=False`, each flush
+    instead rewrites the whole object, which costs time quadratic in the
+    file size over many flushes but leaves a single object.
+    """
 
-    def __init__(self, filename, mode):
+    def __init__(self, filename, mode, segmented=None):
+        """Opens a file.
+
+        Args:
+          filename: string, a path
+          mode: one of "r", "rb", "w" or "wb"
+          segmented: optional bool; whether to write in segments. Defaults
+            to writing in segments exactly when the filesystem cannot
+            efficiently append. Ignored for local files, which are always
+            appended to.
+        """
         if mode not in ("r", "rb", "br", "w", "wb", "bw"):
             raise NotImplementedError(
                 "mode {} not supported by compat GFile".format(mode)
@@ -672,6 +1199,20 @@ class GFile:
         self.filename = compat.as_bytes(filename)
         self.fs = get_filesystem(self.filename)
         self.fs_supports_append = hasattr(self.fs, "append")
+        self.may_have_segments = _may_have_segments(self.fs)
+        if self.may_have_segments:
+            if segmented is None:
+                segmented = not _supports_append(self.fs, self.filename)
+            self.fs_supports_append = not segmented and self.fs_supports_append
+        else:
+            segmented = False
+        self.segmented = segmented
+        # Number of segments written (if writing) or index of the segment
+        # being read, where 0 is the object at `filename` itself.
+        self.segment_index = 0
+        # Whether this reader listed the segments of the file, which it
+        # does once unless a listing elsewhere already showed some.
+        self.segments_listed = False
         self.buff = None
         # The buffer offset and the buffer chunk size are measured in the
         # natural units of the underlying stream, i.e. bytes for binary mode,
@@ -733,9 +1274,7 @@ class GFile:
 
         # read from filesystem
         read_size = max(self.buff_chunk_size, n) if n is not None else None
-        (self.buff, self.continuation_token) = self.fs.read(
-            self.filename, self.binary_mode, read_size, self.continuation_token
-        )
+        (self.buff, self.continuation_token) = self._read_from_fs(read_size)
         self.buff_offset = 0
 
         # add from filesystem
@@ -748,6 +1287,45 @@ class GFile:
 
         return result
 
+    def _read_from_fs(self, size):
+        """Reads from the filesystem, continuing into any later segments.
+
+        Returns:
+          A tuple `(data, continuation_token)` as from the filesystem's
+          `read`, where the token is relative to the current segment.
+        """
+        filename = self.filename
+        if self.segment_index:
+            filename = _segment_name(self.filename, self.segment_index)
+        (data, continuation_token) = self.fs.read(
+            filename, self.binary_mode, size, self.continuation_token
+        )
+        if not self.may_have_segments:
+            return (data, continuation_token)
+        # Segments are immutable once written, so move on to the next one
+        # once it exists and this one is exhausted. Only look for a first
+        # segment if a listing showed that there is one, listing the file's
+        # segments once per reader to find out if no listing did yet.
+        while size is None or len(data) < size:
+            if not self.segment_index and not _known_to_have_segments(
+                self.filename
+            ):
+                if self.segments_listed:
+                    break
+                self.segments_listed = True
+                if not _list_segments(self.fs, self.filename):
+                    break
+            next_filename = _segment_name(self.filename, self.segment_index + 1)
+            if not self.fs.exists(next_filename):
+                break
+            self.segment_index += 1
+            remaining = None if size is None else size - len(data)
+            (chunk, continuation_token) = self.fs.read(
+                next_filename, self.binary_mode, remaining, None
+            )
+            data += chunk
+        return (data, continuation_token)
+
     def write(self, file_content):
         """Writes string file contents to file, clearing contents of the file
         on first write and then appending on subsequent calls.
@@ -817,7 +1395,10 @@ class GFile:
                 None, None, "File already closed"
             )
 
-        if not self.fs_supports_append:
+        if self.segmented:
+            if self.write_temp is not None:
+                self._flush_segment()
+        elif not self.fs_supports_append:
             if self.write_temp is not None:
                 # read temp file from the beginning
                 self.write_temp.flush()
@@ -828,6 +1409,43 @@ class GFile:
                     self.fs.write(self.filename, chunk, self.binary_mode)
                     self.write_temp.seek(len(chunk))
 
+    def _flush_segment(self):
+        """Uploads the bytes written since the last flush, if any."""
+        self.write_temp.flush()
+        self.write_temp.seek(0)
+        chunk = self.write_temp.read()
+        if self.write_started and not chunk:
+            return
+        if not self.write_started:
+            self._remove_segments()
+            self.fs.write(self.filename, chunk, self.binary_mode)
+            self.write_started = True
+        else:
+            self.segment_index += 1
+            self.fs.write(
+                _segment_name(self.filename, self.segment_index),
+                chunk,
+                self.binary_mode,
+            )
+            _note_segments(self.filename, True)
+        self.write_temp.seek(0)
+        self.write_temp.truncate()
+
+    def _remove_segments(self):
+        """Removes the segments of a previous file at this path."""
+        segments = _list_segments(self.fs, self.filename)
+        if segments and not hasattr(self.fs, "remove"):
+            raise errors.FailedPreconditionError(
+                None,
+                None,
+                "Cannot overwrite segmented file {}".format(
+                    compat.as_str_any(self.filename)
+                ),
+            )
+        for segment_name, _ in segments:
+            self.fs.remove(segment_name)
+        _note_segments(self.filename, False)
+
     def close(self):
         self.flush()
         if self.write_temp is not None:
@@ -865,7 +1483,11 @@ def glob(filename):
     Raises:
       errors.OpError: If there are filesystem / directory listing errors.
     """
-    return get_filesystem(filename).glob(filename)
+    fs = get_filesystem(filename)
+    result = fs.glob(filename)
+    if _may_have_segments(fs):
+        result = _without_segments(result, complete=False)
+    return result
 
 
 def isdir(dirname):
@@ -895,7 +1517,11 @@ def listdir(dirname):
     Raises:
       errors.NotFoundError if directory doesn't exist
     """
-    return get_filesystem(dirname).listdir(dirname)
+    fs = get_filesystem(dirname)
+    result = fs.listdir(dirname)
+    if _may_have_segments(fs):
+        result = _without_segments(result, complete=True)
+    return result
 
 
 def makedirs(path):
@@ -971,7 +1597,16 @@ def stat(filename):
     Raises:
       errors.OpError: If the operation fails.
     """
-    return get_filesystem(filename).stat(filename)
+    fs = get_filesystem(filename)
+    result = fs.stat(filename)
+    if not _may_have_segments(fs):
+        return result
+    length = result.length
+    for segment_name, segment_length in _list_segments(fs, filename):
+        if segment_length is None:
+            segment_length = fs.stat(segment_name).length
+        length += segment_length
+    return StatData(length)
 
 
 # Used for tests only
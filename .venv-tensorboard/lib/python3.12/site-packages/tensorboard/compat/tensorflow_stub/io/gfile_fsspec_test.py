@@ -0,0 +1,148 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for segmented files on the fsspec in-memory filesystem."""
+
+
+import unittest
+from unittest import mock
+
+from tensorboard.compat.tensorflow_stub.io import gfile
+
+try:
+    import fsspec
+except ImportError:
+    fsspec = None
+
+
+_LOGDIR = "memory://logs/run"
+
+
+@unittest.skipIf(fsspec is None, "fsspec is not installed")
+class SegmentedFileTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.memory_fs = fsspec.filesystem("memory")
+        self.memory_fs.store.clear()
+        self.memory_fs.pseudo_dirs.clear()
+        self.memory_fs.pseudo_dirs.append("")
+        gfile._SEGMENTED_FILES.clear()
+
+    def _write(self, filename, chunks, mode="wb"):
+        with gfile.GFile(filename, mode, segmented=True) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+
+    def _objects(self):
+        return sorted(
+            name.rpartition("/")[2]
+            for name in self.memory_fs.ls("/logs/run", detail=False)
+        )
+
+    def testWritesOneObjectPerFlush(self):
+        filename = _LOGDIR + "/events"
+        self._write(filename, [b"abc", b"de", b"f"])
+        self.assertEqual(
+            self._objects(),
+            [
+                "events",
+                "events.tbsegment-00000001",
+                "events.tbsegment-00000002",
+            ],
+        )
+
+    def testReadsAllSegments(self):
+        filename = _LOGDIR + "/events"
+        chunks = [bytes([i]) * (1000 + i) for i in range(5)]
+        self._write(filename, chunks)
+        gfile._SEGMENTED_FILES.clear()
+        expected = b"".join(chunks)
+        self.assertEqual(gfile.GFile(filename, "rb").read(), expected)
+        f = gfile.GFile(filename, "rb")
+        actual = b""
+        while True:
+            chunk = f.read(700)
+            if not chunk:
+                break
+            actual += chunk
+        self.assertEqual(actual, expected)
+
+    def testReadsTextAcrossSegments(self):
+        filename = _LOGDIR + "/text"
+        self._write(filename, ["héllo ", "wörld\nx\n"], mode="w")
+        f = gfile.GFile(filename, "r")
+        self.assertEqual(f.read(), "héllo wörld\nx\n")
+
+    def testListingsAndStatPresentOneFile(self):
+        filename = _LOGDIR + "/events"
+        self._write(filename, [b"abc", b"de", b"f"])
+        self.assertEqual(gfile.listdir(_LOGDIR), ["events"])
+        self.assertEqual(
+            [name.rpartition("/")[2] for name in gfile.glob(_LOGDIR + "/*")],
+            ["events"],
+        )
+        ((_, _, files),) = list(gfile.walk(_LOGDIR))
+        self.assertEqual(files, ["events"])
+        self.assertEqual(gfile.stat(filename).length, 6)
+
+    def testOverwriteRemovesSegments(self):
+        filename = _LOGDIR + "/events"
+        self._write(filename, [b"abc", b"de", b"f"])
+        self._write(filename, [b"new"])
+        self.assertEqual(self._objects(), ["events"])
+        self.assertEqual(gfile.GFile(filename, "rb").read(), b"new")
+
+    def testReaderAtEndFindsSegmentsShownByListing(self):
+        filename = _LOGDIR + "/events"
+        writer = gfile.GFile(filename, "wb", segmented=True)
+        writer.write(b"abc")
+        writer.flush()
+        reader = gfile.GFile(filename, "rb")
+        self.assertEqual(reader.read(10), b"abc")
+        self.assertEqual(reader.read(10), b"")
+        writer.write(b"def")
+        writer.flush()
+        writer.close()
+        # As if the segment were written by another process.
+        gfile._SEGMENTED_FILES.clear()
+        self.assertEqual(reader.read(10), b"")
+        gfile.listdir(_LOGDIR)
+        self.assertEqual(reader.read(10), b"def")
+        self.assertEqual(reader.read(10), b"")
+
+    def testPollingFileWithoutSegmentsDoesNotProbe(self):
+        filename = _LOGDIR + "/events"
+        self._write(filename, [b"abc"])
+        fs = gfile.get_filesystem(filename)
+        reader = gfile.GFile(filename, "rb")
+        self.assertEqual(reader.read(10), b"abc")
+        with mock.patch.object(
+            fs, "exists", wraps=fs.exists
+        ) as exists, mock.patch.object(
+            fs, "glob_with_sizes", wraps=fs.glob_with_sizes
+        ) as glob_with_sizes:
+            for _ in range(5):
+                self.assertEqual(reader.read(10), b"")
+        probed = [
+            call.args[0]
+            for call in exists.call_args_list
+            if gfile._is_segment(call.args[0])
+        ]
+        self.assertEqual(probed, [])
+        glob_with_sizes.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
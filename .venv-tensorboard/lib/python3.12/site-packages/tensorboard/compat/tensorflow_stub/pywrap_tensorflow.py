@@ -16,8 +16,12 @@
 
 
 import array
+import io
+import os
 import struct
 
+import numpy as np
+
 from . import errors
 from .io import gfile
 
@@ -120,16 +124,26 @@ CRC_INIT = 0
 _MASK = 0xFFFFFFFF
 
 
-def crc_update(crc, data):
-    """Update CRC-32C checksum with data.
+def _make_slice_tables(table):
+    """Builds the 8 lookup tables used by the slicing-by-8 CRC update.
 
-    Args:
-      crc: 32-bit checksum to update as long.
-      data: byte array, string or iterable over bytes.
-    Returns:
-      32-bit updated CRC-32C as long.
+    `tables[k][b]` is the CRC contribution of byte `b` followed by `k` zero
+    bytes, so that 8 input bytes can be folded into the CRC per iteration.
     """
+    tables = [tuple(table)]
+    for _ in range(7):
+        prev = tables[-1]
+        tables.append(
+            tuple(table[prev[b] & 0xFF] ^ (prev[b] >> 8) for b in range(256))
+        )
+    return tuple(tables)
+
+
+_SLICE_TABLES = _make_slice_tables(CRC_TABLE)
 
+
+def _crc_update_bytewise(crc, data):
+    """Reference byte-at-a-time CRC-32C update (see `crc_update`)."""
     if type(data) != array.array or data.itemsize != 1:
         buf = array.array("B", data)
     else:
@@ -142,6 +156,217 @@ def crc_update(crc, data):
     return crc ^ _MASK
 
 
+def _crc_update_sliced(crc, data):
+    """Slicing-by-8 CRC-32C update in pure Python.
+
+    Folds eight input bytes into the checksum per loop iteration, which
+    amortizes the interpreter overhead of the bytewise loop.
+    """
+    data = memoryview(data).cast("B")
+    n = len(data)
+    n8 = n & ~7
+    t0, t1, t2, t3, t4, t5, t6, t7 = _SLICE_TABLES
+    crc ^= _MASK
+    for lo, hi in struct.iter_unpack("<II", data[:n8]):
+        crc ^= lo
+        crc = (
+            t7[crc & 0xFF]
+            ^ t6[(crc >> 8) & 0xFF]
+            ^ t5[(crc >> 16) & 0xFF]
+            ^ t4[crc >> 24]
+            ^ t3[hi & 0xFF]
+            ^ t2[(hi >> 8) & 0xFF]
+            ^ t1[(hi >> 16) & 0xFF]
+            ^ t0[hi >> 24]
+        )
+    for b in data[n8:]:
+        crc = t0[(crc ^ b) & 0xFF] ^ (crc >> 8)
+    return crc ^ _MASK
+
+
+# Inputs shorter than this are not worth the fixed cost of the NumPy path.
+_NUMPY_MIN_SIZE = 8192
+# Bytes per lane in the NumPy path; must be a power of two.
+_NUMPY_LANE_SIZE = 32
+
+_NP_CRC_TABLE = np.array(CRC_TABLE, dtype=np.uint32)
+_NP_BASIS = np.uint32(1) << np.arange(32, dtype=np.uint32)
+_NP_BYTE_BITS = (
+    (np.arange(256, dtype=np.uint32)[:, None] >> np.arange(8)) & 1
+).astype(bool)
+
+# Maps a power-of-two byte count `n` to a pair `(tables, op)`, where `op`
+# holds the images of the 32 basis bits under the linear map that advances
+# a raw CRC state over `n` zero bytes, and `tables` is the same map as four
+# 256-entry lookup tables (one per state byte).
+_np_shift_tables = {}
+
+
+def _np_apply(op, values):
+    """Applies a GF(2) linear map on 32-bit words to each of `values`."""
+    bits = ((values[:, None] >> np.arange(32, dtype=np.uint32)) & 1).astype(
+        bool
+    )
+    return np.bitwise_xor.reduce(
+        np.where(bits, op[None, :], np.uint32(0)), axis=1
+    )
+
+
+def _np_get_shift_tables(length):
+    result = _np_shift_tables.get(length)
+    if result is not None:
+        return result
+    if length == 1:
+        op = _NP_CRC_TABLE[_NP_BASIS & 0xFF] ^ (_NP_BASIS >> 8)
+    else:
+        (_, half) = _np_get_shift_tables(length // 2)
+        op = _np_apply(half, half)
+    tables = np.stack(
+        [
+            np.bitwise_xor.reduce(
+                np.where(_NP_BYTE_BITS, op[None, 8 * k : 8 * k + 8], 0),
+                axis=1,
+            ).astype(np.uint32)
+            for k in range(4)
+        ]
+    )
+    result = (tables, op)
+    _np_shift_tables[length] = result
+    return result
+
+
+def _crc_update_numpy(crc, data):
+    """Table-vectorized CRC-32C update using NumPy.
+
+    The input is split into many equal-length lanes whose CRCs are advanced
+    in lockstep, one table gather per byte column. Lane checksums are then
+    folded together pairwise, using the linearity of CRCs over GF(2) to
+    shift each left-hand checksum past the bytes of its right-hand sibling.
+    """
+    data = memoryview(data)
+    if not data.c_contiguous:
+        data = memoryview(data.tobytes())
+    # Checksum the bytes of the buffer, whatever its item type and shape.
+    data = data.cast("B")
+    n = len(data)
+    if n < _NUMPY_MIN_SIZE:
+        return _crc_update_sliced(crc, data)
+    lane_size = _NUMPY_LANE_SIZE
+    num_lanes = 1 << ((n - 1) // lane_size).bit_length()
+    # Leading zero bytes leave a zero CRC state unchanged, so we left-pad the
+    # input to fill the lanes exactly, and fold the initial CRC value into
+    # the first four data bytes instead of into the state.
+    padded = np.zeros(num_lanes * lane_size, dtype=np.uint8)
+    padded[-n:] = np.frombuffer(data, dtype=np.uint8)
+    padded[-n : -n + 4] ^= np.frombuffer(
+        struct.pack("<I", crc ^ _MASK), dtype=np.uint8
+    )
+    columns = padded.reshape(num_lanes, lane_size).T.astype(np.uint32)
+    table = _NP_CRC_TABLE
+    state = np.zeros(num_lanes, dtype=np.uint32)
+    for column in columns:
+        state = table[(state ^ column) & 0xFF] ^ (state >> 8)
+
+    length = lane_size
+    while len(state) > 1:
+        (tables, _) = _np_get_shift_tables(length)
+        left = state[0::2]
+        state = (
+            tables[0][left & 0xFF]
+            ^ tables[1][(left >> 8) & 0xFF]
+            ^ tables[2][(left >> 16) & 0xFF]
+            ^ tables[3][left >> 24]
+            ^ state[1::2]
+        )
+        length *= 2
+    return int(state[0]) ^ _MASK
+
+
+def _make_accelerated_crc_update():
+    """Returns a CRC-32C update function from a native module, if any."""
+    try:
+        import google_crc32c
+
+        if google_crc32c.implementation == "c":
+            return lambda crc, data: google_crc32c.extend(crc, bytes(data))
+    except (ImportError, AttributeError):
+        pass
+    try:
+        import crc32c as crc32c_module
+
+        return lambda crc, data: crc32c_module.crc32c(data, crc)
+    except ImportError:
+        pass
+    return None
+
+
+# Registry of CRC-32C update implementations, keyed by backend name. Each is
+# a function `(crc, data) -> crc` with the semantics of `crc_update`.
+_CRC_BACKENDS = {
+    "python": _crc_update_bytewise,
+    "sliced": _crc_update_sliced,
+    "numpy": _crc_update_numpy,
+}
+_accelerated_crc_update = _make_accelerated_crc_update()
+if _accelerated_crc_update is not None:
+    _CRC_BACKENDS["native"] = _accelerated_crc_update
+
+
+def _default_crc_backend():
+    return "native" if "native" in _CRC_BACKENDS else "numpy"
+
+
+_crc_backend = _default_crc_backend()
+_crc_update_impl = _CRC_BACKENDS[_crc_backend]
+
+
+def crc_backends():
+    """Returns the names of the available CRC-32C backends."""
+    return sorted(_CRC_BACKENDS)
+
+
+def get_crc_backend():
+    """Returns the name of the CRC-32C backend currently in use."""
+    return _crc_backend
+
+
+def set_crc_backend(name):
+    """Selects the CRC-32C implementation used by `crc_update`.
+
+    Args:
+      name: One of `crc_backends()`, or "auto" to pick the fastest one
+        available (a native `google_crc32c` or `crc32c` module if installed,
+        then NumPy, then pure Python).
+
+    Raises:
+      ValueError: If the backend is unknown or not available.
+    """
+    global _crc_backend, _crc_update_impl
+    if name == "auto":
+        name = _default_crc_backend()
+    if name not in _CRC_BACKENDS:
+        raise ValueError(
+            "Unknown CRC-32C backend %r; available: %s"
+            % (name, ", ".join(crc_backends()))
+        )
+    _crc_backend = name
+    _crc_update_impl = _CRC_BACKENDS[name]
+
+
+def crc_update(crc, data):
+    """Update CRC-32C checksum with data.
+
+    Args:
+      crc: 32-bit checksum to update as long.
+      data: byte array, string or iterable over bytes.
+    Returns:
+      32-bit updated CRC-32C as long.
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview, array.array)):
+        data = bytes(data)
+    return _crc_update_impl(crc, data)
+
+
 def crc_finalize(crc):
     """Finalize CRC-32C checksum.
 
@@ -165,10 +390,35 @@ def crc32c(data):
     return crc_finalize(crc_update(CRC_INIT, data))
 
 
+# Record framing: a little-endian uint64 length and uint32 masked crc of that
+# length, then the payload, then a uint32 masked crc of the payload.
+_RECORD_HEADER = struct.Struct("<QI")
+_RECORD_HEADER_SIZE = _RECORD_HEADER.size
+_RECORD_FOOTER = struct.Struct("<I")
+_RECORD_FOOTER_SIZE = _RECORD_FOOTER.size
+
+# Number of bytes requested from the underlying file per read.
+_READ_BLOCK_SIZE = 1024 * 1024
+
+# Values accepted for the `verify_crc` option of `PyRecordReader_New`: check
+# the CRCs of both record headers and payloads, of headers only, or neither.
+VERIFY_CRC_MODES = ("all", "header", "none")
+
+
 class PyRecordReader_New:
     def __init__(
-        self, filename=None, start_offset=0, compression_type=None, status=None
+        self,
+        filename=None,
+        start_offset=0,
+        compression_type=None,
+        status=None,
+        verify_crc="all",
     ):
+        if verify_crc not in VERIFY_CRC_MODES:
+            raise ValueError(
+                "verify_crc must be one of %r, got %r"
+                % (VERIFY_CRC_MODES, verify_crc)
+            )
         if filename is None:
             raise errors.NotFoundError(
                 None, None, "No filename provided, cannot read Events"
@@ -179,9 +429,14 @@ class PyRecordReader_New:
                 None,
                 "{} does not point to valid Events file".format(filename),
             )
-        if start_offset:
+        is_local = isinstance(
+            gfile.get_filesystem(filename), gfile.LocalFileSystem
+        )
+        if start_offset and not is_local:
             raise errors.UnimplementedError(
-                None, None, "start offset not supported by compat reader"
+                None,
+                None,
+                "start offset only supported for local files by compat reader",
             )
         if compression_type:
             # TODO: Handle gzip and zlib compressed files
@@ -192,89 +447,129 @@ class PyRecordReader_New:
         self.start_offset = start_offset
         self.compression_type = compression_type
         self.status = status
+        self._verify_header_crc = verify_crc != "none"
+        self._verify_event_crc = verify_crc == "all"
         self.curr_event = None
-        self.file_handle = gfile.GFile(self.filename, "rb")
-        # Maintain a buffer of partially read records, so we can recover from
-        # truncated records upon a retry.
+        if is_local and hasattr(os, "pread"):
+            # Read local files through the shared pool of descriptors, so
+            # that each block is a single `pread` syscall into a fresh
+            # `bytes` object and many readers polling for new data neither
+            # reopen their files nor hold a descriptor each.
+            self.file_handle = gfile.PooledLocalFile(
+                filename, start_offset or 0
+            )
+        elif is_local:
+            self.file_handle = io.open(filename, "rb", buffering=0)
+            if start_offset:
+                self.file_handle.seek(start_offset)
+        else:
+            self.file_handle = gfile.GFile(self.filename, "rb")
+        # Records are parsed out of large blocks read from the file. The
+        # buffer holds the unconsumed tail of the most recent block(s), which
+        # also lets us recover from truncated records upon a retry: the
+        # partial record stays in the buffer until a later read completes it.
         self._buffer = b""
+        self._view = memoryview(self._buffer)
         self._buffer_pos = 0
+        # File offset just past the last record returned by `GetNext`.
+        self._offset = start_offset or 0
 
     def GetNext(self):
         # Each new read should start at the beginning of any partial record.
-        self._buffer_pos = 0
-        # Read the header
         self.curr_event = None
-        header_str = self._read(8)
-        if not header_str:
-            # Hit EOF so raise and exit
-            raise errors.OutOfRangeError(None, None, "No more events to read")
-        if len(header_str) < 8:
-            raise self._truncation_error("header")
-        header = struct.unpack("<Q", header_str)
-
-        # Read the crc32, which is 4 bytes, and check it against
-        # the crc32 of the header
-        crc_header_str = self._read(4)
-        if len(crc_header_str) < 4:
+        pos = self._buffer_pos
+        if not self._fill(pos, _RECORD_HEADER_SIZE):
+            available = len(self._buffer) - self._buffer_pos
+            if not available:
+                # Hit EOF so raise and exit
+                raise errors.OutOfRangeError(
+                    None, None, "No more events to read"
+                )
+            if available < 8:
+                raise self._truncation_error("header")
             raise self._truncation_error("header crc")
-        crc_header = struct.unpack("<I", crc_header_str)
-        header_crc_calc = masked_crc32c(header_str)
-        if header_crc_calc != crc_header[0]:
+        pos = self._buffer_pos
+        view = self._view
+        (header_len, crc_header) = _RECORD_HEADER.unpack_from(view, pos)
+
+        # Check the crc32 of the 8-byte length header.
+        if (
+            self._verify_header_crc
+            and masked_crc32c(view[pos : pos + 8]) != crc_header
+        ):
             raise errors.DataLossError(
                 None, None, "{} failed header crc32 check".format(self.filename)
             )
 
         # The length of the header tells us how many bytes the Event
-        # string takes
-        header_len = int(header[0])
-        event_str = self._read(header_len)
-        if len(event_str) < header_len:
-            raise self._truncation_error("data")
-
-        event_crc_calc = masked_crc32c(event_str)
-
-        # The next 4 bytes contain the crc32 of the Event string,
-        # which we check for integrity.
-        crc_event_str = self._read(4)
-        if len(crc_event_str) < 4:
+        # string takes, followed by 4 bytes of crc32 of the Event string.
+        record_size = _RECORD_HEADER_SIZE + header_len + _RECORD_FOOTER_SIZE
+        if not self._fill(pos, record_size):
+            available = len(self._buffer) - self._buffer_pos
+            if available < _RECORD_HEADER_SIZE + header_len:
+                raise self._truncation_error("data")
             raise self._truncation_error("data crc")
-        crc_event = struct.unpack("<I", crc_event_str)
-        if event_crc_calc != crc_event[0]:
-            raise errors.DataLossError(
-                None,
-                None,
-                "{} failed event crc32 check".format(self.filename),
-            )
-
-        # Set the current event to be read later by record() call
-        self.curr_event = event_str
-        # Clear the buffered partial record since we're done reading it.
-        self._buffer = b""
+        pos = self._buffer_pos
+        view = self._view
+        start = pos + _RECORD_HEADER_SIZE
+        end = start + header_len
+        event_view = view[start:end]
+        if self._verify_event_crc:
+            (crc_event,) = _RECORD_FOOTER.unpack_from(view, end)
+            if masked_crc32c(event_view) != crc_event:
+                raise errors.DataLossError(
+                    None,
+                    None,
+                    "{} failed event crc32 check".format(self.filename),
+                )
+
+        # Set the current event to be read later by record() call. This is a
+        # read-only view into the buffer, so no bytes are copied per record.
+        self.curr_event = event_view
+        self._buffer_pos = pos + record_size
+        self._offset += record_size
+        if self._buffer_pos == len(self._buffer):
+            # Drop the fully consumed block rather than keeping it alive.
+            self._set_buffer(b"")
+
+    def _set_buffer(self, buffer):
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._buffer_pos = 0
 
-    def _read(self, n):
-        """Read up to n bytes from the underlying file, with buffering.
+    def _fill(self, pos, n):
+        """Ensures that `n` bytes are buffered starting at buffer offset `pos`.
 
-        Reads are satisfied from a buffer of previous data read starting at
-        `self._buffer_pos` until the buffer is exhausted, and then from the
-        actual underlying file. Any new data is added to the buffer, and
-        `self._buffer_pos` is advanced to the point in the buffer past all
-        data returned as part of this read.
+        Reads whole blocks from the underlying file as needed. Any bytes
+        already consumed are dropped from the buffer when it is refilled, so
+        `self._buffer_pos` may change; callers must re-read it afterward.
 
         Args:
-          n: non-negative number of bytes to read
+          pos: offset into the buffer where the current record begins
+          n: non-negative number of bytes needed from `pos` onward
 
         Returns:
-          bytestring of data read, up to n bytes
+          True if `n` bytes are now available, False if EOF came first.
         """
-        result = self._buffer[self._buffer_pos : self._buffer_pos + n]
-        self._buffer_pos += len(result)
-        n -= len(result)
-        if n > 0:
-            new_data = self.file_handle.read(n)
-            result += new_data
-            self._buffer += new_data
-            self._buffer_pos += len(new_data)
-        return result
+        available = len(self._buffer) - pos
+        if available >= n:
+            return True
+        chunks = []
+        while available < n:
+            new_data = self.file_handle.read(
+                max(_READ_BLOCK_SIZE, n - available)
+            )
+            if not new_data:
+                break
+            chunks.append(new_data)
+            available += len(new_data)
+        if chunks:
+            if pos < len(self._buffer):
+                chunks.insert(0, self._view[pos:])
+            self._set_buffer(
+                chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            )
+        return available >= n
 
     def _truncation_error(self, section):
         return errors.DataLossError(
@@ -285,3 +580,7 @@ class PyRecordReader_New:
 
     def record(self):
         return self.curr_event
+
+    def offset(self):
+        """Returns the file offset just past the last record read."""
+        return self._offset
@@ -121,7 +121,10 @@ class GrpcDataProvider(provider.DataProvider):
         plugin_name,
         downsample=None,
         run_tag_filter=None,
+        downsample_strategy=None,
     ):
+        # The data server only downsamples uniformly.
+        del downsample_strategy
         with timing.log_latency("build request"):
             req = data_provider_pb2.ReadScalarsRequest()
             req.experiment_id = experiment_id
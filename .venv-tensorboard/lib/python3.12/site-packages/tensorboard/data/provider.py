@@ -166,6 +166,26 @@ class DataProvider(metaclass=abc.ABCMeta):
         """
         return None
 
+    def data_generation(self, ctx=None, *, experiment_id):
+        """Identify the current state of the data of an experiment.
+
+        Callers may cache anything computed from the results of the other
+        methods of this data provider under the returned value, for as
+        long as this method keeps returning an equal value.
+
+        This operation is optional.
+
+        Args:
+          ctx: A TensorBoard `RequestContext` value.
+          experiment_id: ID of enclosing experiment.
+
+        Returns:
+          A hashable value that changes whenever any data of the given
+          experiment changes, or `None` if this operation is not supported
+          by this data provider.
+        """
+        return None
+
     @abc.abstractmethod
     def list_runs(self, ctx=None, *, experiment_id):
         """List all runs within an experiment.
@@ -218,6 +238,7 @@ class DataProvider(metaclass=abc.ABCMeta):
         plugin_name,
         downsample=None,
         run_tag_filter=None,
+        downsample_strategy=None,
     ):
         """Read values from scalar time series.
 
@@ -234,6 +255,11 @@ class DataProvider(metaclass=abc.ABCMeta):
             series will only be included in the result if its run and tag
             both pass this filter. If `None`, all time series will be
             included.
+          downsample_strategy: Optional `DownsampleStrategy` value; how to
+            choose the steps to keep when downsampling. Data providers that
+            do not support the given strategy may use `UNIFORM` instead.
+            Callers should only pass this argument when it is not `None`,
+            since older data providers do not accept it.
 
         The result will only contain keys for run-tag combinations that
         actually exist, which may not include all entries in the
@@ -291,6 +317,68 @@ class DataProvider(metaclass=abc.ABCMeta):
         """
         pass
 
+    def read_scalar_columns(
+        self,
+        ctx=None,
+        *,
+        experiment_id,
+        plugin_name,
+        downsample=None,
+        run_tag_filter=None,
+        downsample_strategy=None,
+    ):
+        """Read values from scalar time series as arrays.
+
+        This returns the same data as `read_scalars`, but with the points
+        of each time series stored in parallel arrays rather than as one
+        `ScalarDatum` per point. Data providers that store scalars in
+        arrays should override this to avoid materializing individual
+        points; by default it is implemented in terms of `read_scalars`.
+
+        Args:
+          ctx: A TensorBoard `RequestContext` value.
+          experiment_id: ID of enclosing experiment.
+          plugin_name: String name of the TensorBoard plugin that created
+            the data to be queried. Required.
+          downsample: Integer number of steps to which to downsample the
+            results, as for `read_scalars`. Required.
+          run_tag_filter: Optional `RunTagFilter` value, as for
+            `read_scalars`.
+          downsample_strategy: Optional `DownsampleStrategy` value, as for
+            `read_scalars`.
+
+        Returns:
+          A nested map `d` such that `d[run][tag]` is a `ScalarColumns`
+          value holding the points that `read_scalars` would return.
+
+        Raises:
+          tensorboard.errors.PublicError: See `DataProvider` class docstring.
+        """
+        kwargs = {}
+        if downsample_strategy is not None:
+            kwargs["downsample_strategy"] = downsample_strategy
+        data = self.read_scalars(
+            ctx,
+            experiment_id=experiment_id,
+            plugin_name=plugin_name,
+            downsample=downsample,
+            run_tag_filter=run_tag_filter,
+            **kwargs,
+        )
+        return {
+            run: {
+                tag: ScalarColumns(
+                    steps=np.array([d.step for d in datum], dtype=np.int64),
+                    wall_times=np.array(
+                        [d.wall_time for d in datum], dtype=np.float64
+                    ),
+                    values=np.array([d.value for d in datum], dtype=np.float64),
+                )
+                for (tag, datum) in tags.items()
+            }
+            for (run, tags) in data.items()
+        }
+
     def list_tensors(
         self, ctx=None, *, experiment_id, plugin_name, run_tag_filter=None
     ):
@@ -608,6 +696,20 @@ class Run:
         )
 
 
+class DownsampleStrategy(enum.Enum):
+    """Describes how to choose the points kept when downsampling scalars."""
+
+    # The last point, plus points drawn uniformly at random without
+    # replacement. This is the default.
+    UNIFORM = "uniform"
+    # Largest-Triangle-Three-Buckets: one point per bucket of equal count,
+    # chosen to preserve the visual shape of the series.
+    LTTB = "lttb"
+    # The first, last, minimum and maximum point of each bucket of equal
+    # width in steps, which preserves extrema such as loss spikes.
+    M4 = "m4"
+
+
 class HyperparameterDomainType(enum.Enum):
     """Describes how to represent the set of known values for a hyperparameter."""
 
@@ -989,6 +1091,25 @@ class ScalarDatum:
         )
 
 
+@dataclasses.dataclass(frozen=True, eq=False)
+class ScalarColumns:
+    """The points of a scalar time series, as parallel arrays.
+
+    Attributes:
+      steps: A 1-D `np.ndarray` of `int64` global steps.
+      wall_times: A 1-D `np.ndarray` of `float64` wall times, in seconds
+        since epoch.
+      values: A 1-D `np.ndarray` of scalar values, of any real dtype.
+    """
+
+    steps: np.ndarray
+    wall_times: np.ndarray
+    values: np.ndarray
+
+    def __len__(self):
+        return len(self.steps)
+
+
 class TensorTimeSeries(_TimeSeries):
     """Metadata about a tensor time series for a particular run and tag.
 
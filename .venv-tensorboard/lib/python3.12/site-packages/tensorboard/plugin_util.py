@@ -23,7 +23,9 @@ from tensorboard._vendor.bleach.sanitizer import Cleaner
 import markdown
 
 from tensorboard import context as _context
+from tensorboard import errors as _errors
 from tensorboard.backend import experiment_id as _experiment_id
+from tensorboard.data import provider as _provider
 from tensorboard.util import tb_logging
 
 
@@ -195,6 +197,33 @@ def experiment_id(environ):
     return environ.get(_experiment_id.WSGI_ENVIRON_KEY, "")
 
 
+def downsample_strategy(value):
+    """Parse the name of a downsampling strategy given in a request.
+
+    Args:
+      value: A string value of `provider.DownsampleStrategy` (e.g.,
+        `"lttb"`), or `None` or the empty string if not specified.
+
+    Returns:
+      A `provider.DownsampleStrategy`, or `None` if `value` is empty.
+
+    Raises:
+      errors.InvalidArgumentError: If `value` names no known strategy.
+    """
+    if not value:
+        return None
+    try:
+        return _provider.DownsampleStrategy(value)
+    except ValueError:
+        raise _errors.InvalidArgumentError(
+            "Unknown downsampling strategy %r; expected one of: %s"
+            % (
+                value,
+                ", ".join(s.value for s in _provider.DownsampleStrategy),
+            )
+        )
+
+
 def proto_to_json(proto):
     """Utility method to convert proto to JSON, accounting for different version support.
 
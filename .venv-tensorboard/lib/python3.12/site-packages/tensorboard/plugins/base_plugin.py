@@ -100,6 +100,18 @@ class TBPlugin(metaclass=ABCMeta):
         """
         return (self.plugin_name,)
 
+    def cache_stats(self):
+        """Experimental. Describes the use of this plugin's caches.
+
+        This is meant for debugging, and is served at `/data/cache_stats`.
+
+        Returns:
+          A JSON-serializable dict mapping the name of each cache of this
+          plugin to a dict of its counters (e.g., hits and misses). The
+          default implementation returns an empty dict.
+        """
+        return {}
+
 
 class FrontendMetadata:
     """Metadata required to render a plugin on the frontend.
@@ -73,6 +73,7 @@ class CorePlugin(base_plugin.TBPlugin):
         self._path_prefix = context.flags.path_prefix if context.flags else None
         self._assets_zip_provider = context.assets_zip_provider
         self._data_provider = context.data_provider
+        self._multiplexer = context.multiplexer
         self._include_debug_info = bool(include_debug_info)
 
     def is_active(self):
@@ -88,6 +89,7 @@ class CorePlugin(base_plugin.TBPlugin):
             "/data/experiments": self._serve_experiments,
             "/data/experiment_runs": self._serve_experiment_runs,
             "/data/notifications": self._serve_notifications,
+            "/data/reload_schedule": self._serve_reload_schedule,
             "/data/window_properties": self._serve_window_properties,
             "/events": self._redirect_to_index,
             "/favicon.ico": self._send_404_without_logging,
@@ -233,6 +235,23 @@ class CorePlugin(base_plugin.TBPlugin):
             request, {"logdir": self._logdir}, "application/json"
         )
 
+    @wrappers.Request.application
+    def _serve_reload_schedule(self, request):
+        """Serve a JSON object describing how runs are being reloaded.
+
+        This is meant for debugging; see
+        `plugin_event_multiplexer.EventMultiplexer.ReloadSchedule`.
+        """
+        reload_schedule = getattr(self._multiplexer, "ReloadSchedule", None)
+        if reload_schedule is None:
+            return http_util.Respond(
+                request,
+                "Not available for this data provider",
+                "text/plain",
+                code=404,
+            )
+        return http_util.Respond(request, reload_schedule(), "application/json")
+
     @wrappers.Request.application
     def _serve_window_properties(self, request):
         """Serve a JSON object containing this TensorBoard's window
@@ -560,6 +579,21 @@ relevant for db read-only mode. Each thread reloads one run at a time.
 """,
         )
 
+        parser.add_argument(
+            "--decode_threads",
+            metavar="COUNT",
+            type=int,
+            default=0,
+            help="""\
+[experimental] The number of threads, shared by all runs, that TensorBoard
+uses to parse and migrate events while reloading. When positive, each run
+reads records on its reload thread and hands them to these threads in
+batches, so decoding a single large run is pipelined with reading it.
+Events are still processed in file order. Set to 0 to decode serially on
+the reload threads. Not relevant for --load_fast. (default: %(default)s)\
+""",
+        )
+
         parser.add_argument(
             "--reload_interval",
             metavar="SECONDS",
@@ -586,6 +620,37 @@ reload finishes, and requires --load_interval=0. (default: %(default)s)\
 """,
         )
 
+        parser.add_argument(
+            "--reload_watcher",
+            metavar="TYPE",
+            type=str,
+            default="poll",
+            choices=["poll", "inotify"],
+            help="""\
+[experimental] How the backend finds data to load on each reload. The
+default "poll" option walks every logdir for new runs and reads every run.
+The "inotify" option uses Linux inotify to walk logdirs only once, then
+looks only at the directories that changed, which is much faster for
+logdirs with many finished runs. It requires local logdirs on Linux, and
+one inotify watch per directory (see fs.inotify.max_user_watches); it
+falls back to "poll" otherwise. (default: %(default)s)\
+""",
+        )
+
+        parser.add_argument(
+            "--reload_max_backoff",
+            metavar="SECONDS",
+            type=_nonnegative_float,
+            default=60.0,
+            help="""\
+[experimental] Runs without new data are reloaded after exponentially
+increasing intervals, up to this many seconds, while runs with new data or
+being viewed are reloaded on every reload. The schedule is shown at
+/data/reload_schedule. Set to 0 to reload every run every time.
+(default: %(default)s)\
+""",
+        )
+
         parser.add_argument(
             "--reload_multifile",
             metavar="BOOL",
@@ -670,6 +735,76 @@ are first written to a temporary file, then swapped into the final location.
 
 This option is currently incompatible with --load_fast=true, and if passed will
 disable fast-loading mode. (default: false)\
+""",
+        )
+
+        parser.add_argument(
+            "--verify_crc",
+            metavar="MODE",
+            type=str,
+            default="all",
+            choices=["all", "header", "none"],
+            help="""\
+[experimental] Which record checksums to verify when reading event files
+without TensorFlow installed. "all" checks both the length header and the
+payload of every record; "header" checks only the length header, which is
+enough to keep record framing intact; "none" skips checksum verification
+entirely. Has no effect with --load_fast or when TensorFlow is installed.
+(default: %(default)s)\
+""",
+        )
+
+        parser.add_argument(
+            "--ingest_cache",
+            metavar="BOOL",
+            # Custom str-to-bool converter since regular bool() doesn't work.
+            type=lambda v: {"true": True, "false": False}.get(v.lower(), v),
+            choices=[True, False],
+            default=True,
+            help="""\
+[experimental] If true, TensorBoard periodically saves the sampled data of each
+local run to an on-disk cache, and on restart resumes reading its event files
+from where the snapshot left off instead of from the beginning. Snapshots are
+discarded when an event file is found to have changed other than by appending.
+Not relevant for --load_fast. (default: %(default)s)\
+""",
+        )
+
+        parser.add_argument(
+            "--ingest_cache_dir",
+            metavar="PATH",
+            type=str,
+            default="",
+            help="""\
+[experimental] Directory in which to store --ingest_cache snapshots. Defaults
+to tensorboard/ingest under $XDG_CACHE_HOME, or under ~/.cache if that is not
+set.\
+""",
+        )
+
+        parser.add_argument(
+            "--ingest_cache_max_bytes",
+            metavar="BYTES",
+            type=int,
+            default=1 << 30,
+            help="""\
+[experimental] Maximum total size of --ingest_cache snapshots. The least
+recently used snapshots are deleted when this is exceeded.
+(default: %(default)s)\
+""",
+        )
+
+        parser.add_argument(
+            "--response_cache_max_bytes",
+            metavar="BYTES",
+            type=int,
+            default=64 << 20,
+            help="""\
+[experimental] Maximum total size of the responses of data routes (e.g.,
+scalars and histograms) that TensorBoard keeps in memory to serve again, with
+an ETag for conditional requests, until new data is loaded. Set to 0 to
+disable. Counters of this and other caches are served at /data/cache_stats.
+(default: %(default)s)\
 """,
         )
 
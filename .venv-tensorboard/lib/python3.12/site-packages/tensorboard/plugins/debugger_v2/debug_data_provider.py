@@ -518,8 +518,10 @@ class LocalDebuggerV2DataProvider(provider.DataProvider):
         plugin_name,
         downsample=None,
         run_tag_filter=None,
+        downsample_strategy=None,
     ):
         del experiment_id, plugin_name, downsample, run_tag_filter
+        del downsample_strategy
         raise TypeError("Debugger V2 DataProvider doesn't support scalars.")
 
     def read_last_scalars(
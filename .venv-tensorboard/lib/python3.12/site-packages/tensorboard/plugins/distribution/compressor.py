@@ -154,6 +154,85 @@ def compress_histogram(buckets, bps=NORMAL_HISTOGRAM_BPS):
     return result
 
 
+def compress_histograms(histograms, bps=NORMAL_HISTOGRAM_BPS):
+    """Compresses a stack of histograms with the same number of buckets.
+
+    This computes the same values as calling `compress_histogram` on each
+    histogram of the stack, up to floating-point rounding, but with array
+    operations over all histograms and basis points at once.
+
+    Args:
+      histograms: A float array of shape `[n, k, 3]`, whose `i`-th
+        element holds the `k` buckets of the `i`-th histogram, each of the
+        form `(min, max, count)` as in `compress_histogram`.
+      bps: Compression points represented in basis points, 1/100ths of a percent.
+          Defaults to normal distribution.
+
+    Returns:
+      A float array of shape `[n, len(bps)]` with the value of each
+      histogram at each basis point.
+    """
+    histograms = np.asarray(histograms, dtype=np.float64)
+    if histograms.ndim != 3 or histograms.shape[2] != 3:
+        raise ValueError(
+            "Expected histograms of shape [n, k, 3], got %r"
+            % (histograms.shape,)
+        )
+    (num_histograms, num_buckets, _) = histograms.shape
+    bps_array = np.array(bps, dtype=np.float64)
+    if not num_buckets:
+        return np.zeros((num_histograms, len(bps)))
+    minmin = histograms[:, 0, 0][:, np.newaxis]
+    maxmax = histograms[:, -1, 1][:, np.newaxis]
+    counts = histograms[:, :, 2]
+    right_edges = histograms[:, :, 1]
+    totals = counts.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1.0
+    weights = (counts * bps[-1] / totals).cumsum(axis=1)
+    # `weights[:, i - 1]`, with zero for `i == 0`.
+    prev_weights = np.concatenate(
+        [np.zeros((num_histograms, 1)), weights[:, :-1]], axis=1
+    )
+
+    # For each basis point, the first bucket whose cumulative weight is
+    # above it (as by `np.searchsorted(..., side="right")`), and then the
+    # first such bucket with a nonzero weight, or `num_buckets` if none.
+    first_above = (
+        weights[:, np.newaxis, :] <= bps_array[np.newaxis, :, np.newaxis]
+    ).sum(axis=2)
+    nonzero_at = np.where(
+        weights != prev_weights, np.arange(num_buckets), num_buckets
+    )
+    next_nonzero = np.concatenate(
+        [
+            np.minimum.accumulate(nonzero_at[:, ::-1], axis=1)[:, ::-1],
+            np.full((num_histograms, 1), num_buckets),
+        ],
+        axis=1,
+    )
+    bucket = np.take_along_axis(next_nonzero, first_above, axis=1)
+    # Once a basis point is past the last bucket, so are all later ones.
+    past_end = np.logical_or.accumulate(bucket == num_buckets, axis=1)
+    bucket = np.minimum(bucket, num_buckets - 1)
+
+    cumsum = np.take_along_axis(weights, bucket, axis=1)
+    cumsum_prev = np.take_along_axis(prev_weights, bucket, axis=1)
+    lhs = np.where(
+        (bucket == 0) | (cumsum_prev == 0),
+        minmin,
+        np.maximum(
+            np.take_along_axis(right_edges, np.maximum(bucket - 1, 0), axis=1),
+            minmin,
+        ),
+    )
+    rhs = np.minimum(np.take_along_axis(right_edges, bucket, axis=1), maxmax)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = lhs + (bps_array - cumsum_prev) * (rhs - lhs) / (
+            cumsum - cumsum_prev
+        )
+    return np.where(past_end, maxmax, values)
+
+
 def _lerp(x, x0, x1, y0, y1):
     """Affinely map from [x0, x1] onto [y0, y1]."""
     return y0 + (x - x0) * float(y1 - y0) / (x1 - x0)
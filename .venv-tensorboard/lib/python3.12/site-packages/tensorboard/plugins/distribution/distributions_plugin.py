@@ -19,6 +19,10 @@ this plugin.
 """
 
 
+import collections
+import threading
+
+import numpy as np
 from werkzeug import wrappers
 
 from tensorboard import plugin_util
@@ -29,6 +33,10 @@ from tensorboard.plugins.distribution import metadata
 from tensorboard.plugins.histogram import histograms_plugin
 
 
+# Number of time series whose compressed histograms are kept.
+_MAX_CACHED_SERIES = 256
+
+
 class DistributionsPlugin(base_plugin.TBPlugin):
     """Distributions Plugin for TensorBoard.
 
@@ -51,6 +59,11 @@ class DistributionsPlugin(base_plugin.TBPlugin):
           context: A base_plugin.TBContext instance.
         """
         self._histograms_plugin = histograms_plugin.HistogramsPlugin(context)
+        self._cache_lock = threading.Lock()
+        # Dict from `(experiment, run, tag)` to a dict from `(step,
+        # wall_time)` to the compressed histogram of the step, as float
+        # arrays. Least recently used time series come first.
+        self._compressed = collections.OrderedDict()
 
     def get_plugin_apps(self):
         return {
@@ -80,18 +93,69 @@ class DistributionsPlugin(base_plugin.TBPlugin):
         Raises:
           tensorboard.errors.PublicError: On invalid request.
         """
-        (histograms, mime_type) = self._histograms_plugin.histograms_impl(
-            ctx, tag, run, experiment=experiment, downsample_to=self.SAMPLE_SIZE
+        histograms = self._histograms_plugin.read_histograms(
+            ctx, tag, run, experiment, downsample_to=self.SAMPLE_SIZE
         )
+        values = self._compress(experiment, run, tag, histograms)
+        bps = compressor.NORMAL_HISTOGRAM_BPS
         return (
-            [self._compress(histogram) for histogram in histograms],
-            mime_type,
+            [
+                [datum.wall_time, datum.step, list(zip(bps, row))]
+                for (datum, row) in zip(histograms, values.tolist())
+            ],
+            "application/json",
         )
 
-    def _compress(self, histogram):
-        (wall_time, step, buckets) = histogram
-        converted_buckets = compressor.compress_histogram(buckets)
-        return [wall_time, step, converted_buckets]
+    def _compress(self, experiment, run, tag, histograms):
+        """Compresses the histograms of a time series.
+
+        Histograms of steps compressed by a previous request for the same
+        time series are taken from the cache, and the others are
+        compressed together.
+
+        Returns:
+          A float array of shape `[len(histograms), 9]` with the values
+          of the histograms at `compressor.NORMAL_HISTOGRAM_BPS`.
+        """
+        key = (experiment, run, tag)
+        with self._cache_lock:
+            cached = self._compressed.pop(key, {})
+
+        step_keys = [(datum.step, datum.wall_time) for datum in histograms]
+        shape_to_indices = collections.defaultdict(list)
+        for i, (datum, step_key) in enumerate(zip(histograms, step_keys)):
+            if step_key not in cached:
+                shape_to_indices[datum.numpy.shape].append(i)
+        for shape, indices in shape_to_indices.items():
+            if len(shape) == 2 and shape[1] == 3:
+                rows = compressor.compress_histograms(
+                    np.stack([histograms[i].numpy for i in indices])
+                )
+            else:
+                # Not a stack of buckets; e.g., an empty histogram.
+                rows = [
+                    np.array(
+                        [
+                            value
+                            for (_, value) in compressor.compress_histogram(
+                                histograms[i].numpy
+                            )
+                        ]
+                    )
+                    for i in indices
+                ]
+            for i, row in zip(indices, rows):
+                cached[step_keys[i]] = row
+
+        # Keep only the steps of the current sample.
+        compressed = {step_key: cached[step_key] for step_key in step_keys}
+        with self._cache_lock:
+            self._compressed[key] = compressed
+            while len(self._compressed) > _MAX_CACHED_SERIES:
+                self._compressed.popitem(last=False)
+        if not step_keys:
+            return np.zeros((0, len(compressor.NORMAL_HISTOGRAM_BPS)))
+        return np.stack([compressed[step_key] for step_key in step_keys])
 
     def index_impl(self, ctx, experiment):
         return self._histograms_plugin.index_impl(ctx, experiment=experiment)
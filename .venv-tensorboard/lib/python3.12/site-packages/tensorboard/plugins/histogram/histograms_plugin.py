@@ -108,6 +108,29 @@ class HistogramsPlugin(base_plugin.TBPlugin):
         Raises:
           tensorboard.errors.PublicError: On invalid request.
         """
+        histograms = self.read_histograms(
+            ctx, tag, run, experiment, downsample_to=downsample_to
+        )
+        events = [(e.wall_time, e.step, e.numpy.tolist()) for e in histograms]
+        return (events, "application/json")
+
+    def read_histograms(self, ctx, tag, run, experiment, downsample_to=None):
+        """Reads the histograms of a time series.
+
+        Args:
+          ctx: A `tensorboard.context.RequestContext`.
+          tag: The tag of the time series.
+          run: The run of the time series.
+          experiment: String, from `plugin_util.experiment_id`.
+          downsample_to: As in `histograms_impl`.
+
+        Returns:
+          A list of `provider.TensorDatum`s, whose tensors have shape
+          `[k, 3]` and hold `k` buckets of the form `(min, max, count)`.
+
+        Raises:
+          tensorboard.errors.NotFoundError: If there is no such time series.
+        """
         sample_count = (
             downsample_to if downsample_to is not None else self._downsample_to
         )
@@ -123,8 +146,7 @@ class HistogramsPlugin(base_plugin.TBPlugin):
             raise errors.NotFoundError(
                 "No histogram tag %r for run %r" % (tag, run)
             )
-        events = [(e.wall_time, e.step, e.numpy.tolist()) for e in histograms]
-        return (events, "application/json")
+        return histograms
 
     @wrappers.Request.application
     def tags_route(self, request):
@@ -24,6 +24,7 @@ from tensorboard.data import provider
 from tensorboard.plugins.hparams import api_pb2
 from tensorboard.plugins.hparams import json_format_compat
 from tensorboard.plugins.hparams import metadata
+from tensorboard.plugins.hparams import session_group_index
 from google.protobuf import json_format
 from tensorboard.plugins.scalar import metadata as scalar_metadata
 
@@ -52,6 +53,7 @@ class Context:
           tb_context: base_plugin.TBContext. The "base" context we extend.
         """
         self._tb_context = tb_context
+        self._session_group_index = session_group_index.SessionGroupIndex(self)
 
     def experiment_from_metadata(
         self,
@@ -192,6 +194,28 @@ class Context:
             run_tag_filter=run_tag_filter,
         )
 
+    def data_generation(self, ctx, experiment_id):
+        """Calls DataProvider.data_generation() and returns the result."""
+        return self._tb_context.data_provider.data_generation(
+            ctx, experiment_id=experiment_id
+        )
+
+    def session_table(self, ctx, experiment_id, include_metrics):
+        """Returns the sessions found in hparams tag metadata.
+
+        Args:
+          experiment_id: String, from `plugin_util.experiment_id`.
+          include_metrics: Whether to read the metrics of the sessions, as
+            determined by `experiment_from_metadata`.
+
+        Returns:
+          A `session_group_index.SessionTable`, which is shared across
+          requests and must not be modified.
+        """
+        return self._session_group_index.session_table(
+            ctx, experiment_id, include_metrics
+        )
+
     def hparams_from_data_provider(self, ctx, experiment_id, limit):
         """Calls DataProvider.list_hyperparameters() and returns the result."""
         return self._tb_context.data_provider.list_hyperparameters(
@@ -430,12 +454,19 @@ class Context:
             for run, tags in hparams_run_to_tag_to_content.items()
             if metadata.SESSION_START_INFO_TAG in tags
         )
-        return (
+        return self.compute_metric_infos_from_session_runs(
+            ctx, experiment_id, session_runs
+        )
+
+    def compute_metric_infos_from_session_runs(
+        self, ctx, experiment_id, session_runs
+    ):
+        return [
             api_pb2.MetricInfo(name=api_pb2.MetricName(group=group, tag=tag))
             for tag, group in self._compute_metric_names(
                 ctx, experiment_id, session_runs
             )
-        )
+        ]
 
     def compute_metric_infos_from_data_provider_session_groups(
         self, ctx, experiment_id, session_groups
@@ -445,12 +476,9 @@ class Context:
             for sg in session_groups
             for s in sg.sessions
         )
-        return [
-            api_pb2.MetricInfo(name=api_pb2.MetricName(group=group, tag=tag))
-            for tag, group in self._compute_metric_names(
-                ctx, experiment_id, session_runs
-            )
-        ]
+        return self.compute_metric_infos_from_session_runs(
+            ctx, experiment_id, session_runs
+        )
 
     def _compute_metric_names(self, ctx, experiment_id, session_runs):
         """Computes the list of metric names from all the scalar (run, tag)
@@ -21,6 +21,7 @@ import operator
 import re
 from typing import Optional
 
+import numpy as np
 from google.protobuf import struct_pb2
 
 from tensorboard.data import provider
@@ -28,7 +29,6 @@ from tensorboard.plugins.hparams import api_pb2
 from tensorboard.plugins.hparams import backend_context as backend_context_lib
 from tensorboard.plugins.hparams import error
 from tensorboard.plugins.hparams import json_format_compat
-from tensorboard.plugins.hparams import metadata
 from tensorboard.plugins.hparams import metrics
 from tensorboard.plugins.hparams import plugin_data_pb2
 
@@ -72,9 +72,9 @@ class Handler:
           A ListSessionGroupsResponse object.
         """
 
-        session_groups_from_tags = self._session_groups_from_tags()
-        if session_groups_from_tags:
-            return self._create_response(session_groups_from_tags)
+        response_from_tags = self._response_from_tags()
+        if response_from_tags is not None:
+            return response_from_tags
 
         session_groups_from_data_provider = (
             self._session_groups_from_data_provider()
@@ -86,41 +86,42 @@ class Handler:
             session_groups=[], total_size=0
         )
 
-    def _session_groups_from_tags(self):
-        """Constructs lists of SessionGroups based on hparam tag metadata."""
-        # Query for all Hparams summary metadata one time to minimize calls to
-        # the underlying DataProvider.
-        hparams_run_to_tag_to_content = self._backend_context.hparams_metadata(
-            self._request_context, self._experiment_id
-        )
-        # Construct the experiment one time since an context.experiment() call
-        # may search through all the runs.
-        experiment = self._backend_context.experiment_from_metadata(
-            self._request_context,
-            self._experiment_id,
-            self._include_metrics,
-            hparams_run_to_tag_to_content,
-            # Don't pass any information from the DataProvider since we are only
-            # examining session groups based on tag metadata
-            provider.ListHyperparametersResult(
-                hyperparameters=[], session_groups=[]
-            ),
-        )
-        extractors = _create_extractors(self._request.col_params)
-        filters = _create_filters(self._request.col_params, extractors)
+    def _response_from_tags(self):
+        """Constructs a response based on hparam tag metadata.
 
-        session_groups = self._build_session_groups(
-            hparams_run_to_tag_to_content, experiment.metric_infos
-        )
-        session_groups = self._filter(session_groups, filters)
-        self._sort(session_groups, extractors)
+        Session groups are filtered and sorted as columns of the session
+        table of the experiment, and protos are only built for the
+        requested slice.
 
+        Returns:
+          A ListSessionGroupsResponse object, or None if no session group
+          passes the filters.
+        """
+        # Check the columns before looking at any data.
+        _create_extractors(self._request.col_params)
+        table = self._backend_context.session_table(
+            self._request_context, self._experiment_id, self._include_metrics
+        )
+        columns = _SessionGroupColumns(table, self._request)
+        indices = self._filter_columns(columns)
+        if not len(indices):
+            return None
+        indices = self._sort_columns(columns, indices)
+
+        session_groups = [
+            self._build_session_group(columns, index)
+            for index in indices[
+                self._request.start_index : self._request.start_index
+                + self._request.slice_size
+            ].tolist()
+        ]
         if _specifies_include(self._request.col_params):
             _reduce_to_hparams_to_include(
                 session_groups, self._request.col_params
             )
-
-        return session_groups
+        return api_pb2.ListSessionGroupsResponse(
+            session_groups=session_groups, total_size=len(indices)
+        )
 
     def _session_groups_from_data_provider(self):
         """Constructs lists of SessionGroups based on DataProvider results."""
@@ -224,84 +225,39 @@ class Handler:
         session_groups = self._filter(session_groups, filters)
         return session_groups
 
-    def _build_session_groups(
-        self, hparams_run_to_tag_to_content, metric_infos
-    ):
-        """Returns a list of SessionGroups protobuffers from the summary
-        data."""
-
-        # Algorithm: We keep a dict 'groups_by_name' mapping a SessionGroup name
-        # (str) to a SessionGroup protobuffer. We traverse the runs associated with
-        # the plugin--each representing a single session. We form a Session
-        # protobuffer from each run and add it to the relevant SessionGroup object
-        # in the 'groups_by_name' dict. We create the SessionGroup object, if this
-        # is the first session of that group we encounter.
+    def _build_session_group(self, columns, index):
+        """Builds the SessionGroup protobuffer of a session group.
+
+        Args:
+          columns: A _SessionGroupColumns instance.
+          index: Index of the session group in `columns`.
+        """
+        table = columns.table
         groups_by_name = {}
-        # The TensorBoard runs with session start info are the
-        # "sessions", which are not necessarily the runs that actually
-        # contain metrics (may be in subdirectories).
-        session_names = [
-            run
-            for (run, tags) in hparams_run_to_tag_to_content.items()
-            if metadata.SESSION_START_INFO_TAG in tags
-        ]
-        metric_runs = set()
-        metric_tags = set()
-        for session_name in session_names:
-            for metric in metric_infos:
-                metric_name = metric.name
-                (run, tag) = metrics.run_tag_from_session_and_metric(
-                    session_name, metric_name
-                )
-                metric_runs.add(run)
-                metric_tags.add(tag)
-        all_metric_evals = (
-            self._backend_context.read_last_scalars(
-                self._request_context,
-                self._experiment_id,
-                run_tag_filter=provider.RunTagFilter(
-                    runs=metric_runs, tags=metric_tags
-                ),
-            )
-            if self._include_metrics
-            else {}
-        )
-        for (
-            session_name,
-            tag_to_content,
-        ) in hparams_run_to_tag_to_content.items():
-            if metadata.SESSION_START_INFO_TAG not in tag_to_content:
-                continue
-            start_info = metadata.parse_session_start_info_plugin_data(
-                tag_to_content[metadata.SESSION_START_INFO_TAG]
-            )
-            end_info = None
-            if metadata.SESSION_END_INFO_TAG in tag_to_content:
-                end_info = metadata.parse_session_end_info_plugin_data(
-                    tag_to_content[metadata.SESSION_END_INFO_TAG]
-                )
+        # Add the sessions in table order, so that the group shows the
+        # hparams of its first session.
+        for session_index in np.sort(columns.sessions_of(index)).tolist():
+            session_name = table.names[session_index]
             session = self._build_session(
-                metric_infos,
+                table.metric_infos,
                 session_name,
-                start_info,
-                end_info,
-                all_metric_evals,
+                table.start_infos[session_index],
+                table.end_infos[session_index],
+                table.metric_evals,
             )
-            if session.status in self._request.allowed_statuses:
-                self._add_session(session, start_info, groups_by_name)
-
-        # Compute the session group's aggregated metrics for each group.
-        groups = groups_by_name.values()
-        for group in groups:
-            # We sort the sessions in a group so that the order is deterministic.
-            group.sessions.sort(key=operator.attrgetter("name"))
-            self._aggregate_metrics(group)
-        return groups
+            self._add_session(
+                session, table.start_infos[session_index], groups_by_name
+            )
+        (group,) = groups_by_name.values()
+        # We sort the sessions in a group so that the order is deterministic.
+        group.sessions.sort(key=operator.attrgetter("name"))
+        self._aggregate_metrics(group)
+        return group
 
     def _add_session(self, session, start_info, groups_by_name):
         """Adds a new Session protobuffer to the 'groups_by_name' dictionary.
 
-        Called by _build_session_groups when we encounter a new session. Creates
+        Called by _build_session_group when we encounter a new session. Creates
         the Session protobuffer and adds it to the relevant group in the
         'groups_by_name' dict. Creates the session group if this is the first time
         we encounter it.
@@ -421,40 +377,64 @@ class Handler:
     def _passes_all_filters(self, session_group, filters):
         return all(filter_fn(session_group) for filter_fn in filters)
 
-    def _sort(self, session_groups, extractors):
-        """Sorts 'session_groups' in place according to _request.col_params."""
-
-        # Sort by session_group name so we have a deterministic order.
-        session_groups.sort(key=operator.attrgetter("name"))
-        # Sort by lexicographical order of the _request.col_params whose order
-        # is not ORDER_UNSPECIFIED. The first such column is the primary sorting
-        # key, the second is the secondary sorting key, etc. To achieve that we
-        # need to iterate on these columns in reverse order (thus the primary key
-        # is the key used in the last sort).
-        for col_param, extractor in reversed(
-            list(zip(self._request.col_params, extractors))
-        ):
+    def _filter_columns(self, columns):
+        """Returns the indices of the session groups passing all filters.
+
+        Like `_filter`, but applies each filter once per distinct value of
+        its column, to the session groups that passed the previous ones.
+        """
+        passing = np.arange(columns.size)
+        for col_param in self._request.col_params:
+            value_filter = _create_value_filter(col_param)
+            if value_filter is None:
+                continue
+            (value_filter_fn, include_missing_values) = value_filter
+            (codes, code_to_value) = columns.column(col_param)
+            codes = codes[passing]
+            passes = np.full(len(codes), include_missing_values)
+            present = codes >= 0
+            (distinct_codes, inverse) = np.unique(
+                codes[present], return_inverse=True
+            )
+            code_passes = np.array(
+                [
+                    bool(value_filter_fn(code_to_value(code)))
+                    for code in distinct_codes.tolist()
+                ],
+                dtype=bool,
+            )
+            passes[present] = code_passes[inverse]
+            passing = passing[passes]
+        return passing
+
+    def _sort_columns(self, columns, indices):
+        """Sorts session group indices according to _request.col_params.
+
+        The order is the same as that of the sequence of stable sorts of
+        `_sort`: by the first column whose order is not
+        ORDER_UNSPECIFIED, then by the second such column, etc., and then
+        by session group name.
+        """
+        keys = [columns.name_ranks[indices]]
+        for col_param in reversed(self._request.col_params):
             if col_param.order == api_pb2.ORDER_UNSPECIFIED:
                 continue
             if col_param.order == api_pb2.ORDER_ASC:
-                session_groups.sort(
-                    key=_create_key_func(
-                        extractor,
-                        none_is_largest=not col_param.missing_values_first,
-                    )
-                )
+                none_is_largest = not col_param.missing_values_first
+                sign = 1
             elif col_param.order == api_pb2.ORDER_DESC:
-                session_groups.sort(
-                    key=_create_key_func(
-                        extractor,
-                        none_is_largest=col_param.missing_values_first,
-                    ),
-                    reverse=True,
-                )
+                none_is_largest = col_param.missing_values_first
+                sign = -1
             else:
                 raise error.HParamsError(
                     "Unknown col_param.order given: %s" % col_param
                 )
+            (codes, code_to_value) = columns.column(col_param)
+            keys.append(
+                sign
+                * _rank_codes(codes[indices], code_to_value, none_is_largest)
+            )
+        return indices[np.lexsort(keys)]
 
     def _create_response(self, session_groups):
         return api_pb2.ListSessionGroupsResponse(
@@ -466,35 +446,6 @@ class Handler:
         )
 
 
-def _create_key_func(extractor, none_is_largest):
-    """Returns a key_func to be used in list.sort().
-
-    Returns a key_func to be used in list.sort() that sorts session groups
-    by the value extracted by extractor. 'None' extracted values will either
-    be considered largest or smallest as specified by the "none_is_largest"
-    boolean parameter.
-
-    Args:
-      extractor: An extractor function that extract the key from the session
-        group.
-      none_is_largest: bool. If true treats 'None's as largest; otherwise
-        smallest.
-    """
-    if none_is_largest:
-
-        def key_func_none_is_largest(session_group):
-            value = extractor(session_group)
-            return (value is None, value)
-
-        return key_func_none_is_largest
-
-    def key_func_none_is_smallest(session_group):
-        value = extractor(session_group)
-        return (value is not None, value)
-
-    return key_func_none_is_smallest
-
-
 # Extractors. An extractor is a function that extracts some property (a metric
 # or a hyperparameter) from a SessionGroup instance.
 def _create_extractors(col_params):
@@ -631,6 +582,32 @@ def _create_filter(col_param, extractor):
       'col_param'. If col_param does not specify a filter (i.e. any session
       group passes) returns None.
     """
+    value_filter = _create_value_filter(col_param)
+    if value_filter is None:
+        return None
+    (value_filter_fn, include_missing_values) = value_filter
+
+    def filter_fn(session_group):
+        value = extractor(session_group)
+        if value is None:
+            return include_missing_values
+        return value_filter_fn(value)
+
+    return filter_fn
+
+
+def _create_value_filter(col_param):
+    """Creates a filter of column values for the given col_param.
+
+    Args:
+      col_param: A tensorboard.hparams.ColParams object describing the filter
+        to apply.
+    Returns:
+      A pair (value_filter_fn, include_missing_values): a boolean function
+      taking a column value that is not None, and whether session groups
+      without a value pass the filter. If col_param does not specify a filter
+      (i.e. any session group passes) returns None.
+    """
     include_missing_values = not col_param.exclude_missing_values
     if col_param.HasField("filter_regexp"):
         value_filter_fn = _create_regexp_filter(col_param.filter_regexp)
@@ -645,14 +622,7 @@ def _create_filter(col_param, extractor):
         return None
     else:
         value_filter_fn = lambda _: True
-
-    def filter_fn(session_group):
-        value = extractor(session_group)
-        if value is None:
-            return include_missing_values
-        return value_filter_fn(value)
-
-    return filter_fn
+    return (value_filter_fn, include_missing_values)
 
 
 def _create_regexp_filter(regex):
@@ -734,6 +704,179 @@ def _value_to_python(value):
         raise ValueError("Unknown struct_pb2.Value oneof field set: %s" % field)
 
 
+class _SessionGroupColumns:
+    """The session groups of a session table for a request, as columns.
+
+    Session groups are formed from the sessions with an allowed status,
+    and their metrics are aggregated as `_aggregate_metrics` does.
+
+    Attributes:
+      table: The `session_group_index.SessionTable`.
+      size: Number of session groups.
+      name_ranks: Int array of the rank of the name of each session group.
+      metric_values: Float array of shape `[size, len(table.metric_infos)]`
+        with the aggregated metric values of each session group.
+      metric_present: Bool array of the same shape, with whether the
+        session group has a value for the metric.
+    """
+
+    def __init__(self, table, request):
+        """Aggregates the sessions of a table into session groups.
+
+        Args:
+          table: A `session_group_index.SessionTable`.
+          request: A ListSessionGroupsRequest protobuf.
+        """
+        self.table = table
+        sessions = table.by_group_and_name
+        # Indices of the allowed sessions, by group and then by name.
+        self._sessions = sessions[
+            np.isin(table.statuses[sessions], list(request.allowed_statuses))
+        ]
+        group_ids = table.group_ids[self._sessions]
+        starts = np.flatnonzero(np.diff(group_ids, prepend=-1))
+        self._starts = np.append(starts, len(self._sessions))
+        self.size = len(starts)
+        self.name_ranks = table.group_name_ranks[group_ids[starts]]
+        # The first session of each group in table order.
+        self._first_sessions = (
+            np.minimum.reduceat(self._sessions, starts) if self.size else starts
+        )
+        # The group of each allowed session.
+        self._groups = np.repeat(np.arange(self.size), np.diff(self._starts))
+        self._aggregate_metrics(request)
+
+    def sessions_of(self, index):
+        """Returns an int array of the table indices of a group's sessions."""
+        return self._sessions[self._starts[index] : self._starts[index + 1]]
+
+    def column(self, col_param):
+        """Returns the values of a column, dictionary-encoded.
+
+        Args:
+          col_param: A ListSessionGroupsRequest.ColParam protobuf.
+
+        Returns:
+          A pair `(codes, code_to_value)`: an int array with a code for the
+          value of each session group, or -1 where the value is missing,
+          and a function from codes to the native Python values that the
+          extractor of the column returns. Equal values have equal codes.
+        """
+        if col_param.HasField("metric"):
+            index = self.table.metric_index(col_param.metric)
+            codes = np.full(self.size, -1, dtype=np.int64)
+            if index is None:
+                return (codes, None)
+            present = self.metric_present[:, index]
+            (values, codes[present]) = np.unique(
+                self.metric_values[present, index], return_inverse=True
+            )
+            return (codes, values.tolist().__getitem__)
+        if col_param.HasField("hparam"):
+            (codes, values) = self.table.hparams.get(
+                col_param.hparam, (None, [])
+            )
+            if codes is None:
+                return (np.full(self.size, -1, dtype=np.int64), None)
+            return (
+                codes[self._first_sessions],
+                lambda code: _value_to_python(values[code]),
+            )
+        raise error.HParamsError(
+            'Got ColParam with both "metric" and "hparam" fields unset: %s'
+            % col_param
+        )
+
+    def _aggregate_metrics(self, request):
+        """Sets the metric columns as `Handler._aggregate_metrics` would."""
+        table = self.table
+        if (
+            request.aggregation_type == api_pb2.AGGREGATION_AVG
+            or request.aggregation_type == api_pb2.AGGREGATION_UNSET
+        ):
+            # Sum in the order of `_set_avg_session_metrics`, which
+            # `np.add.at` preserves, to get identical averages.
+            present = table.metric_present[self._sessions]
+            totals = np.zeros((self.size, len(table.metric_infos)))
+            counts = np.zeros(totals.shape, dtype=np.int64)
+            np.add.at(
+                totals,
+                self._groups,
+                np.where(present, table.metric_values[self._sessions], 0.0),
+            )
+            np.add.at(counts, self._groups, present)
+            self.metric_values = totals / np.maximum(counts, 1)
+            self.metric_present = counts > 0
+            return
+        if request.aggregation_type not in (
+            api_pb2.AGGREGATION_MEDIAN,
+            api_pb2.AGGREGATION_MIN,
+            api_pb2.AGGREGATION_MAX,
+        ):
+            raise error.HParamsError(
+                "Unknown aggregation_type in request: %s"
+                % request.aggregation_type
+            )
+
+        # Pick the session of each group whose metrics the group gets.
+        index = table.metric_index(request.aggregation_metric)
+        measured = np.zeros(0, dtype=np.int64)
+        if index is not None:
+            measured = np.flatnonzero(
+                table.metric_present[self._sessions, index]
+            )
+        groups = self._groups[measured]
+        if len(np.unique(groups)) < self.size:
+            raise error.HParamsError(
+                "Session groups without a value of the aggregation metric: %s"
+                % request.aggregation_metric
+            )
+        values = table.metric_values[self._sessions[measured], index]
+        if request.aggregation_type == api_pb2.AGGREGATION_MAX:
+            values = -values
+        # Stable sorts, so that ties go to the first session by name, as
+        # with `sorted`, `min` and `max`.
+        order = np.argsort(values, kind="stable")
+        order = order[np.argsort(groups[order], kind="stable")]
+        picks = np.searchsorted(groups[order], np.arange(self.size))
+        if request.aggregation_type == api_pb2.AGGREGATION_MEDIAN:
+            picks += (np.bincount(groups, minlength=self.size) - 1) // 2
+        chosen = self._sessions[measured[order[picks]]]
+        self.metric_values = table.metric_values[chosen]
+        self.metric_present = table.metric_present[chosen]
+
+
+def _rank_codes(codes, code_to_value, none_is_largest):
+    """Ranks the values of a dictionary-encoded column.
+
+    Args:
+      codes: Int array of codes, with -1 for missing values.
+      code_to_value: Function from codes to native Python values.
+      none_is_largest: bool. If true ranks missing values highest; otherwise
+        lowest.
+
+    Returns:
+      An int array, with ranks ordered as `_create_key_func` would order
+      the values. Equal values have equal ranks.
+    """
+    distinct_codes = np.unique(codes[codes >= 0]).tolist()
+    values = [code_to_value(code) for code in distinct_codes]
+    rank = 0
+    code_ranks = np.zeros(max(distinct_codes, default=-1) + 1, dtype=np.int64)
+    previous = None
+    for i in sorted(range(len(values)), key=values.__getitem__):
+        if previous is not None and values[i] != values[previous]:
+            rank += 1
+        code_ranks[distinct_codes[i]] = rank
+        previous = i
+    missing_rank = rank + 1 if none_is_largest else -1
+    return np.where(
+        codes >= 0,
+        code_ranks[np.maximum(codes, 0)] if len(code_ranks) else 0,
+        missing_rank,
+    )
+
+
 @dataclasses.dataclass(frozen=True)
 class _MetricIdentifier:
     """An identifier for a metric.
@@ -0,0 +1,383 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A columnar table of the hparams sessions of an experiment.
+
+ListSessionGroups requests filter, sort and page the session groups of an
+experiment. Building `SessionGroup` protos for every session of a large
+sweep on each request is slow, so the sessions found in hparams tag
+metadata are kept in a `SessionTable` of NumPy columns instead, and
+handlers only build protos for the requested page.
+
+A table is rebuilt only when the data generation of its experiment
+changes. Rebuilding parses only the `SESSION_START_INFO` and
+`SESSION_END_INFO` metadata that changed since the previous table.
+"""
+
+
+import collections
+import threading
+
+import numpy as np
+
+from tensorboard.data import provider
+from tensorboard.plugins.hparams import api_pb2
+from tensorboard.plugins.hparams import json_format_compat
+from tensorboard.plugins.hparams import metadata
+from tensorboard.plugins.hparams import metrics
+
+
+# Number of experiments whose tables are kept.
+_MAX_EXPERIMENTS = 8
+
+
+class SessionTable:
+    """The sessions of an experiment, as parallel columns.
+
+    Sessions are in the order in which the data provider lists their
+    runs. The first session of a group in this order determines the
+    hparams and monitor URL shown for the group.
+
+    Attributes:
+      names: List of session names, which are run names.
+      start_infos: List of the `SessionStartInfo` protos of the sessions.
+      end_infos: List of the `SessionEndInfo` protos of the sessions, with
+        None for sessions that have not ended.
+      statuses: Int array of the `api_pb2.Status` of each session.
+      group_names: List of the names of the session groups.
+      group_ids: Int array of the index in `group_names` of the group of
+        each session.
+      group_name_ranks: Int array of the rank of each group name in
+        sorted order.
+      by_group_and_name: Int array of session indices, ordered by group
+        and then by session name.
+      hparams: Dict from hparam names to `(codes, values)` pairs, where
+        `values` is a list of the distinct `struct_pb2.Value`s of the
+        hparam, and `codes` an int array with the index in `values` of the
+        value of each session, or -1 if the session has no such hparam or
+        one that cannot be serialized (as a NaN number).
+      metric_infos: List of the `api_pb2.MetricInfo`s of the experiment.
+      metric_evals: The `read_last_scalars` result for the metrics of the
+        sessions: a dict `d` such that `d[run][tag]` is a
+        `provider.ScalarDatum`.
+      metric_values: Float array of shape
+        `[len(names), len(metric_infos)]` with the last value of each
+        metric in each session.
+      metric_present: Bool array of the same shape, with whether the
+        session has a value for the metric.
+    """
+
+    def __init__(
+        self,
+        names,
+        start_infos,
+        end_infos,
+        hparam_keys,
+        metric_infos,
+        metric_runs,
+        metric_evals,
+    ):
+        """Builds the columns of a table.
+
+        Args:
+          names: See class docstring.
+          start_infos: See class docstring.
+          end_infos: See class docstring.
+          hparam_keys: List with a dict for each session from the names of
+            its serializable hparams to keys that are equal if and only if
+            the hparam values are.
+          metric_infos: See class docstring.
+          metric_runs: List with a list for each session of the runs of
+            its evaluations of each metric.
+          metric_evals: See class docstring.
+        """
+        self.names = names
+        self.start_infos = start_infos
+        self.end_infos = end_infos
+        self.metric_infos = metric_infos
+        self.metric_evals = metric_evals
+        num_sessions = len(names)
+
+        self.statuses = np.array(
+            [
+                e.status if e is not None else api_pb2.STATUS_UNKNOWN
+                for e in end_infos
+            ],
+            dtype=np.int64,
+        )
+
+        group_ids = {}
+        self.group_ids = np.array(
+            [
+                group_ids.setdefault(
+                    start_info.group_name or name, len(group_ids)
+                )
+                for (name, start_info) in zip(names, start_infos)
+            ],
+            dtype=np.int64,
+        )
+        self.group_names = list(group_ids)
+        self.group_name_ranks = _ranks(self.group_names)
+        self.by_group_and_name = np.lexsort((_ranks(names), self.group_ids))
+
+        self.hparams = {}
+        code_by_key = {}
+        for i, keys in enumerate(hparam_keys):
+            for hparam_name, key in keys.items():
+                column = self.hparams.get(hparam_name)
+                if column is None:
+                    column = (np.full(num_sessions, -1, dtype=np.int64), [])
+                    self.hparams[hparam_name] = column
+                    code_by_key[hparam_name] = {}
+                (codes, values) = column
+                code = code_by_key[hparam_name].get(key)
+                if code is None:
+                    code = len(values)
+                    code_by_key[hparam_name][key] = code
+                    values.append(start_infos[i].hparams[hparam_name])
+                codes[i] = code
+
+        self._metric_index = {}
+        for j, metric_info in enumerate(metric_infos):
+            key = (metric_info.name.group, metric_info.name.tag)
+            self._metric_index.setdefault(key, j)
+        shape = (num_sessions, len(metric_infos))
+        self.metric_values = np.zeros(shape)
+        self.metric_present = np.zeros(shape, dtype=bool)
+        tags = [metric_info.name.tag for metric_info in metric_infos]
+        for i, runs in enumerate(metric_runs):
+            for j, (run, tag) in enumerate(zip(runs, tags)):
+                datum = metric_evals.get(run, {}).get(tag)
+                if datum is not None:
+                    self.metric_values[i, j] = datum.value
+                    self.metric_present[i, j] = True
+
+    def metric_index(self, metric_name):
+        """Returns the column of a metric in `metric_values`, or None.
+
+        Args:
+          metric_name: An `api_pb2.MetricName`.
+        """
+        return self._metric_index.get((metric_name.group, metric_name.tag))
+
+
+class _Session:
+    """A session parsed from its hparams tag metadata."""
+
+    __slots__ = (
+        "start_content",
+        "end_content",
+        "start_info",
+        "end_info",
+        "hparam_keys",
+        "has_typed_hparams",
+        "_metric_runs",
+    )
+
+    def __init__(self, start_content, end_content):
+        self.start_content = start_content
+        self.end_content = end_content
+        self.start_info = metadata.parse_session_start_info_plugin_data(
+            start_content
+        )
+        self.end_info = None
+        if end_content is not None:
+            self.end_info = metadata.parse_session_end_info_plugin_data(
+                end_content
+            )
+        # Session groups show the hparams that can be serialized, and
+        # equal values have equal serializations.
+        self.hparam_keys = {
+            name: value.SerializeToString(deterministic=True)
+            for (name, value) in self.start_info.hparams.items()
+            if json_format_compat.is_serializable_value(value)
+        }
+        # Whether `experiment_from_metadata` finds hparam infos here.
+        self.has_typed_hparams = any(
+            value.WhichOneof("kind")
+            in ("number_value", "string_value", "bool_value")
+            for value in self.start_info.hparams.values()
+        )
+        self._metric_runs = {}
+
+    def metric_run(self, session_name, metric_name):
+        """Returns the run of this session's evaluations of a metric."""
+        run = self._metric_runs.get(metric_name.group)
+        if run is None:
+            (run, _) = metrics.run_tag_from_session_and_metric(
+                session_name, metric_name
+            )
+            self._metric_runs[metric_name.group] = run
+        return run
+
+
+class _Experiment:
+    """The parsed sessions and tables of an experiment."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Dict from run names to `_Session`s, as of the latest table.
+        self.sessions = {}
+        # Dict from `include_metrics` to `(generation, SessionTable)`.
+        self.tables = {}
+
+
+class SessionGroupIndex:
+    """Keeps `SessionTable`s of experiments up to date across requests.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, backend_context, max_experiments=_MAX_EXPERIMENTS):
+        """Creates an index without tables.
+
+        Args:
+          backend_context: The `backend_context.Context` to read data with.
+          max_experiments: Number of experiments whose tables are kept.
+        """
+        self._backend_context = backend_context
+        self._max_experiments = max_experiments
+        self._lock = threading.Lock()
+        self._experiments = collections.OrderedDict()
+
+    def session_table(self, ctx, experiment_id, include_metrics):
+        """Returns the session table of an experiment.
+
+        Args:
+          ctx: A `tensorboard.context.RequestContext`.
+          experiment_id: String, from `plugin_util.experiment_id`.
+          include_metrics: Whether to read the metrics of the sessions.
+
+        Returns:
+          A `SessionTable`, which callers must not modify.
+        """
+        with self._lock:
+            experiment = self._experiments.pop(experiment_id, None)
+            if experiment is None:
+                experiment = _Experiment()
+            self._experiments[experiment_id] = experiment
+            while len(self._experiments) > self._max_experiments:
+                self._experiments.popitem(last=False)
+
+        with experiment.lock:
+            generation = self._backend_context.data_generation(
+                ctx, experiment_id
+            )
+            cached = experiment.tables.get(include_metrics)
+            if (
+                generation is not None
+                and cached is not None
+                and cached[0] == generation
+            ):
+                return cached[1]
+            table = self._build_table(
+                ctx, experiment_id, include_metrics, experiment
+            )
+            experiment.tables[include_metrics] = (generation, table)
+            return table
+
+    def _build_table(self, ctx, experiment_id, include_metrics, experiment):
+        hparams_run_to_tag_to_content = self._backend_context.hparams_metadata(
+            ctx, experiment_id
+        )
+        sessions = {}
+        for run, tag_to_content in hparams_run_to_tag_to_content.items():
+            start_content = tag_to_content.get(metadata.SESSION_START_INFO_TAG)
+            if start_content is None:
+                continue
+            end_content = tag_to_content.get(metadata.SESSION_END_INFO_TAG)
+            session = experiment.sessions.get(run)
+            if (
+                session is None
+                or session.start_content != start_content
+                or session.end_content != end_content
+            ):
+                session = _Session(start_content, end_content)
+            sessions[run] = session
+        experiment.sessions = sessions
+
+        metric_infos = self._metric_infos(
+            ctx,
+            experiment_id,
+            include_metrics,
+            hparams_run_to_tag_to_content,
+            sessions,
+        )
+        metric_runs = [
+            [
+                session.metric_run(session_name, metric_info.name)
+                for metric_info in metric_infos
+            ]
+            for (session_name, session) in sessions.items()
+        ]
+        metric_tags = set(metric_info.name.tag for metric_info in metric_infos)
+        metric_evals = (
+            self._backend_context.read_last_scalars(
+                ctx,
+                experiment_id,
+                run_tag_filter=provider.RunTagFilter(
+                    runs=set(run for runs in metric_runs for run in runs),
+                    tags=metric_tags,
+                ),
+            )
+            if include_metrics
+            else {}
+        )
+
+        return SessionTable(
+            names=list(sessions),
+            start_infos=[s.start_info for s in sessions.values()],
+            end_infos=[s.end_info for s in sessions.values()],
+            hparam_keys=[s.hparam_keys for s in sessions.values()],
+            metric_infos=metric_infos,
+            metric_runs=metric_runs,
+            metric_evals=metric_evals,
+        )
+
+    def _metric_infos(
+        self,
+        ctx,
+        experiment_id,
+        include_metrics,
+        hparams_run_to_tag_to_content,
+        sessions,
+    ):
+        """Returns the metric infos of `experiment_from_metadata`.
+
+        This avoids parsing the metadata of all sessions again to compute
+        hparam infos, which are not needed here.
+        """
+        for tag_to_content in hparams_run_to_tag_to_content.values():
+            content = tag_to_content.get(metadata.EXPERIMENT_TAG)
+            if content is not None:
+                if not include_metrics:
+                    return []
+                experiment = metadata.parse_experiment_plugin_data(content)
+                return list(experiment.metric_infos)
+        if not include_metrics or not any(
+            session.has_typed_hparams for session in sessions.values()
+        ):
+            return []
+        return self._backend_context.compute_metric_infos_from_session_runs(
+            ctx, experiment_id, set(sessions)
+        )
+
+
+def _ranks(strings):
+    """Returns an int array of the ranks of distinct strings."""
+    ranks = np.empty(len(strings), dtype=np.int64)
+    ranks[sorted(range(len(strings)), key=strings.__getitem__)] = np.arange(
+        len(strings)
+    )
+    return ranks
@@ -16,6 +16,7 @@
 
 
 import collections
+import concurrent.futures
 import imghdr
 import json
 
@@ -48,6 +49,13 @@ _SINGLE_RUN_PLUGINS = frozenset(
 
 _SAMPLED_PLUGINS = frozenset([image_metadata.PLUGIN_NAME])
 
+# Accepted values of the optional `downsampling` field of scalar requests.
+_DOWNSAMPLINGS = frozenset(s.value for s in provider.DownsampleStrategy)
+
+# Maximum number of data provider reads run in parallel for one
+# `/timeSeries` request.
+_MAX_TIME_SERIES_READ_THREADS = 4
+
 
 def _get_tag_description_info(mapping):
     """Gets maps from tags to descriptions, and descriptions to runs.
@@ -241,6 +249,43 @@ def _format_image_mapping(mapping):
     }
 
 
+def _time_series_read_key(series_request):
+    """Returns a key shared by valid series requests that can be read together.
+
+    Requests with the same key only differ in their tag, run and sample,
+    so they can be served by one data provider read. Requests for all runs
+    are not grouped with requests for single runs, to not read all runs
+    for the latter.
+    """
+    return (
+        series_request.get("plugin"),
+        series_request.get("downsampling"),
+        bool(series_request.get("run")),
+    )
+
+
+def _format_image_run_to_series(run_to_data, sample):
+    """Formats image data of one tag for clients.
+
+    Args:
+        run_to_data: a map from string run names to lists of DataProvider's
+            `BlobSequenceDatum`, sorted by step.
+        sample: zero-indexed integer for the requested sample.
+
+    Returns:
+        A `RunToSeries` dict (see http_api.md), without runs that have no
+        data for the sample.
+    """
+    run_to_series = {}
+    for run, blob_sequence_datum_list in run_to_data.items():
+        series = _format_image_blob_sequence_datum(
+            blob_sequence_datum_list, sample
+        )
+        if series:
+            run_to_series[run] = series
+    return run_to_series
+
+
 class MetricsPlugin(base_plugin.TBPlugin):
     """Metrics Plugin for TensorBoard."""
 
@@ -266,6 +311,10 @@ class MetricsPlugin(base_plugin.TBPlugin):
             ),
             "images": sampling_hints.get(image_metadata.PLUGIN_NAME, 10),
         }
+        self._read_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=_MAX_TIME_SERIES_READ_THREADS,
+            thread_name_prefix="MetricsPluginRead",
+        )
         self._scalar_version_checker = plugin_util._MetadataVersionChecker(
             data_kind="scalar time series",
             latest_known_version=0,
@@ -396,18 +445,46 @@ class MetricsPlugin(base_plugin.TBPlugin):
     def _time_series_impl(self, ctx, experiment, series_requests):
         """Constructs a list of responses from a list of series requests.
 
+        Requests that can be served by the same data provider read (see
+        `_time_series_read_key`) are grouped, so that each group costs one
+        multi-tag read rather than one read per tag. Groups are read in
+        parallel.
+
         Args:
             ctx: A `tensorboard.context.RequestContext` value.
             experiment: string ID of the request's experiment.
             series_requests: a list of `TimeSeriesRequest` dicts (see http_api.md).
 
         Returns:
-            A list of `TimeSeriesResponse` dicts (see http_api.md).
+            A list of `TimeSeriesResponse` dicts (see http_api.md), in the
+            order of `series_requests`.
         """
-        responses = [
-            self._get_time_series(ctx, experiment, request)
-            for request in series_requests
-        ]
+        responses = []
+        groups = collections.defaultdict(list)
+        for series_request in series_requests:
+            response = self._create_base_response(series_request)
+            responses.append(response)
+            request_error = self._get_invalid_request_error(series_request)
+            if request_error:
+                response["error"] = request_error
+                continue
+            groups[_time_series_read_key(series_request)].append(
+                (series_request, response)
+            )
+
+        groups = list(groups.values())
+        if len(groups) == 1:
+            self._read_time_series(ctx, experiment, groups[0])
+        elif groups:
+            futures = [
+                self._read_executor.submit(
+                    self._read_time_series, ctx, experiment, group
+                )
+                for group in groups[1:]
+            ]
+            self._read_time_series(ctx, experiment, groups[0])
+            for future in futures:
+                future.result()
         return responses
 
     def _create_base_response(self, series_request):
@@ -445,84 +522,110 @@ class MetricsPlugin(base_plugin.TBPlugin):
         if plugin in _SAMPLED_PLUGINS and not isinstance(sample, int):
             return "Missing sample"
 
+        downsampling = series_request.get("downsampling")
+        if downsampling is not None and downsampling not in _DOWNSAMPLINGS:
+            return "Invalid downsampling"
+
         return None
 
-    def _get_time_series(self, ctx, experiment, series_request):
-        """Returns time series data for a given tag, plugin.
+    def _read_time_series(self, ctx, experiment, group):
+        """Reads time series data for valid requests with the same read key.
+
+        All requested tags are read for all requested runs at once. The
+        dashboard requests the same tags for each selected run, so this
+        rarely reads much more than was asked for.
 
         Args:
             ctx: A `tensorboard.context.RequestContext` value.
             experiment: string ID of the request's experiment.
-            series_request: a `TimeSeriesRequest` (see http_api.md).
-
-        Returns:
-            A `TimeSeriesResponse` dict (see http_api.md).
+            group: a non-empty list of `(series_request, response)` pairs,
+                whose requests have the same `_time_series_read_key`. The
+                `runToSeries` of each response is set (see http_api.md).
         """
-        tag = series_request.get("tag")
-        run = series_request.get("run")
-        plugin = series_request.get("plugin")
-        sample = series_request.get("sample")
-        response = self._create_base_response(series_request)
-        request_error = self._get_invalid_request_error(series_request)
-        if request_error:
-            response["error"] = request_error
-            return response
-
-        runs = [run] if run else None
-        run_to_series = None
+        (first_request, _) = group[0]
+        plugin = first_request.get("plugin")
+        tags = list(dict.fromkeys(request["tag"] for (request, _) in group))
+        runs = None
+        if first_request.get("run"):
+            runs = list(dict.fromkeys(request["run"] for (request, _) in group))
+
         if plugin == scalar_metadata.PLUGIN_NAME:
-            run_to_series = self._get_run_to_scalar_series(
-                ctx, experiment, tag, runs
+            downsampling = first_request.get("downsampling")
+            tag_to_run_to_series = self._get_tag_to_run_to_scalar_series(
+                ctx,
+                experiment,
+                tags,
+                runs,
+                (
+                    provider.DownsampleStrategy(downsampling)
+                    if downsampling
+                    else None
+                ),
             )
-
-        if plugin == histogram_metadata.PLUGIN_NAME:
-            run_to_series = self._get_run_to_histogram_series(
-                ctx, experiment, tag, runs
+        elif plugin == histogram_metadata.PLUGIN_NAME:
+            tag_to_run_to_series = self._get_tag_to_run_to_histogram_series(
+                ctx, experiment, tags, runs
             )
-
-        if plugin == image_metadata.PLUGIN_NAME:
-            run_to_series = self._get_run_to_image_series(
-                ctx, experiment, tag, sample, runs
+        else:
+            tag_to_run_to_series = self._get_tag_to_run_to_image_data(
+                ctx, experiment, tags, runs
             )
 
-        response["runToSeries"] = run_to_series
-        return response
-
-    def _get_run_to_scalar_series(self, ctx, experiment, tag, runs):
-        """Builds a run-to-scalar-series dict for client consumption.
+        for request, response in group:
+            run_to_series = tag_to_run_to_series.get(request["tag"], {})
+            run = request.get("run")
+            if run:
+                run_to_series = (
+                    {run: run_to_series[run]} if run in run_to_series else {}
+                )
+            if plugin == image_metadata.PLUGIN_NAME:
+                run_to_series = _format_image_run_to_series(
+                    run_to_series, request["sample"]
+                )
+            response["runToSeries"] = run_to_series
+
+    def _get_tag_to_run_to_scalar_series(
+        self, ctx, experiment, tags, runs, downsample_strategy=None
+    ):
+        """Builds run-to-scalar-series dicts for client consumption.
 
         Args:
             ctx: A `tensorboard.context.RequestContext` value.
             experiment: a string experiment id.
-            tag: string of the requested tag.
+            tags: list of strings of the requested tags.
             runs: optional list of run names as strings.
+            downsample_strategy: optional `provider.DownsampleStrategy`.
 
         Returns:
-            A map from string run names to `ScalarStepDatum` (see http_api.md).
+            A map from tags to maps from string run names to
+            `ScalarStepDatum` (see http_api.md).
         """
-        mapping = self._data_provider.read_scalars(
+        mapping = self._data_provider.read_scalar_columns(
             ctx,
             experiment_id=experiment,
             plugin_name=scalar_metadata.PLUGIN_NAME,
             downsample=self._plugin_downsampling["scalars"],
-            run_tag_filter=provider.RunTagFilter(runs=runs, tags=[tag]),
+            run_tag_filter=provider.RunTagFilter(runs=runs, tags=tags),
+            **(
+                {"downsample_strategy": downsample_strategy}
+                if downsample_strategy is not None
+                else {}
+            ),
         )
 
-        run_to_series = {}
-        for result_run, tag_data in mapping.items():
-            if tag not in tag_data:
-                continue
-            values = [
-                {
-                    "wallTime": datum.wall_time,
-                    "step": datum.step,
-                    "value": datum.value,
-                }
-                for datum in tag_data[tag]
-            ]
-            run_to_series[result_run] = values
+        tag_to_run_to_series = collections.defaultdict(dict)
+        for result_run, tag_columns in mapping.items():
+            for tag, columns in tag_columns.items():
+                tag_to_run_to_series[tag][result_run] = [
+                    {"wallTime": wall_time, "step": step, "value": value}
+                    for (wall_time, step, value) in zip(
+                        columns.wall_times.tolist(),
+                        columns.steps.tolist(),
+                        columns.values.tolist(),
+                    )
+                ]
 
-        return run_to_series
+        return tag_to_run_to_series
 
     def _format_histogram_datum_bins(self, datum):
         """Formats a histogram datum's bins for client consumption.
@@ -537,75 +640,68 @@ class MetricsPlugin(base_plugin.TBPlugin):
         bins = [{"min": x[0], "max": x[1], "count": x[2]} for x in numpy_list]
         return bins
 
-    def _get_run_to_histogram_series(self, ctx, experiment, tag, runs):
-        """Builds a run-to-histogram-series dict for client consumption.
+    def _get_tag_to_run_to_histogram_series(self, ctx, experiment, tags, runs):
+        """Builds run-to-histogram-series dicts for client consumption.
 
         Args:
             ctx: A `tensorboard.context.RequestContext` value.
             experiment: a string experiment id.
-            tag: string of the requested tag.
+            tags: list of strings of the requested tags.
             runs: optional list of run names as strings.
 
         Returns:
-            A map from string run names to `HistogramStepDatum` (see http_api.md).
+            A map from tags to maps from string run names to
+            `HistogramStepDatum` (see http_api.md).
         """
         mapping = self._data_provider.read_tensors(
             ctx,
             experiment_id=experiment,
             plugin_name=histogram_metadata.PLUGIN_NAME,
             downsample=self._plugin_downsampling["histograms"],
-            run_tag_filter=provider.RunTagFilter(runs=runs, tags=[tag]),
+            run_tag_filter=provider.RunTagFilter(runs=runs, tags=tags),
         )
 
-        run_to_series = {}
+        tag_to_run_to_series = collections.defaultdict(dict)
         for result_run, tag_data in mapping.items():
-            if tag not in tag_data:
-                continue
-            values = [
-                {
-                    "wallTime": datum.wall_time,
-                    "step": datum.step,
-                    "bins": self._format_histogram_datum_bins(datum),
-                }
-                for datum in tag_data[tag]
-            ]
-            run_to_series[result_run] = values
+            for tag, data in tag_data.items():
+                tag_to_run_to_series[tag][result_run] = [
+                    {
+                        "wallTime": datum.wall_time,
+                        "step": datum.step,
+                        "bins": self._format_histogram_datum_bins(datum),
+                    }
+                    for datum in data
+                ]
 
-        return run_to_series
+        return tag_to_run_to_series
 
-    def _get_run_to_image_series(self, ctx, experiment, tag, sample, runs):
-        """Builds a run-to-image-series dict for client consumption.
+    def _get_tag_to_run_to_image_data(self, ctx, experiment, tags, runs):
+        """Reads image data for `_format_image_run_to_series`.
 
         Args:
             ctx: A `tensorboard.context.RequestContext` value.
             experiment: a string experiment id.
-            tag: string of the requested tag.
-            sample: zero-indexed integer for the requested sample.
+            tags: list of strings of the requested tags.
             runs: optional list of run names as strings.
 
         Returns:
-            A `RunToSeries` dict (see http_api.md).
+            A map from tags to maps from string run names to lists of
+            DataProvider's `BlobSequenceDatum`, sorted by step.
         """
         mapping = self._data_provider.read_blob_sequences(
             ctx,
             experiment_id=experiment,
             plugin_name=image_metadata.PLUGIN_NAME,
             downsample=self._plugin_downsampling["images"],
-            run_tag_filter=provider.RunTagFilter(runs, tags=[tag]),
+            run_tag_filter=provider.RunTagFilter(runs, tags=tags),
         )
 
-        run_to_series = {}
+        tag_to_run_to_data = collections.defaultdict(dict)
         for result_run, tag_data in mapping.items():
-            if tag not in tag_data:
-                continue
-            blob_sequence_datum_list = tag_data[tag]
-            series = _format_image_blob_sequence_datum(
-                blob_sequence_datum_list, sample
-            )
-            if series:
-                run_to_series[result_run] = series
+            for tag, blob_sequence_datum_list in tag_data.items():
+                tag_to_run_to_data[tag][result_run] = blob_sequence_datum_list
 
-        return run_to_series
+        return tag_to_run_to_data
 
     @wrappers.Request.application
     def _serve_image_data(self, request):
@@ -17,9 +17,11 @@
 
 import collections
 import functools
+import hashlib
 import imghdr
 import mimetypes
 import os
+import tempfile
 import threading
 
 import numpy as np
@@ -39,8 +41,17 @@ from tensorboard.util import tb_logging
 
 logger = tb_logging.get_logger()
 
-# Number of tensors in the LRU cache.
-_TENSOR_CACHE_CAPACITY = 1
+# Maximum total size in bytes of the tensors in the LRU cache. The most
+# recently used tensor is kept even if it is larger.
+_TENSOR_CACHE_MAX_BYTES = 1 << 30
+
+# Number of rows of a TSV tensor file parsed at a time when converting it.
+_TSV_CHUNK_ROWS = 4096
+
+# Approximate size in bytes of the chunks of streamed tensor responses.
+_TENSOR_RESPONSE_CHUNK_BYTES = 1 << 20
+
+_CONVERTED_TENSOR_SUFFIX = ".f32"
 
 # HTTP routes.
 CONFIG_ROUTE = "/info"
@@ -60,34 +71,43 @@ _DEFAULT_IMAGE_MIMETYPE = "application/octet-stream"
 
 
 class LRUCache:
-    """LRU cache.
+    """LRU cache of arrays, bounded by their total size in bytes.
 
-    Used for storing the last used tensor.
+    Used for storing the last used tensors. The most recently set tensor
+    is always kept, even if it alone exceeds the bound.
+
+    This class is thread-safe.
     """
 
-    def __init__(self, size):
-        if size < 1:
+    def __init__(self, max_bytes):
+        if max_bytes < 1:
             raise ValueError("The cache size must be >=1")
-        self._size = size
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
         self._dict = collections.OrderedDict()
+        self._bytes = 0
 
     def get(self, key):
-        try:
-            value = self._dict.pop(key)
-            self._dict[key] = value
-            return value
-        except KeyError:
-            return None
+        with self._lock:
+            try:
+                value = self._dict.pop(key)
+                self._dict[key] = value
+                return value
+            except KeyError:
+                return None
 
     def set(self, key, value):
         if value is None:
             raise ValueError("value must be != None")
-        try:
-            self._dict.pop(key)
-        except KeyError:
-            if len(self._dict) >= self._size:
-                self._dict.popitem(last=False)
-        self._dict[key] = value
+        with self._lock:
+            old = self._dict.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._dict[key] = value
+            self._bytes += value.nbytes
+            while self._bytes > self._max_bytes and len(self._dict) > 1:
+                (_, evicted) = self._dict.popitem(last=False)
+                self._bytes -= evicted.nbytes
 
 
 class EmbeddingMetadata:
@@ -161,8 +181,144 @@ def _read_tensor_tsv_file(fpath):
 def _read_tensor_binary_file(fpath, shape):
     if len(shape) != 2:
         raise ValueError("Tensor must be 2D, got shape {}".format(shape))
-    tensor = np.fromfile(fpath, dtype="float32")
-    return tensor.reshape(shape)
+    shape = tuple(shape)
+    num_values = os.path.getsize(fpath) // 4
+    if num_values != shape[0] * shape[1]:
+        raise ValueError(
+            "Tensor file {} has {} float32 values, but shape {} needs "
+            "{}".format(fpath, num_values, shape, shape[0] * shape[1])
+        )
+    if not num_values:
+        return np.zeros(shape, dtype="float32")
+    return np.memmap(fpath, dtype="float32", mode="r", shape=shape)
+
+
+def _tensor_cache_dir():
+    """Returns the directory for tensors converted from TSV files."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "tensorboard", "projector")
+
+
+def _convert_tensor_tsv_file(fpath, cache_dir):
+    """Reads a local TSV tensor file through an on-disk binary copy.
+
+    The first read of a file parses it a chunk of rows at a time into a
+    float32 binary file in `cache_dir`, named after the path, size and
+    modification time of the TSV file; later reads memory-map that copy.
+
+    Returns:
+      A float32 array of shape `[rows, columns]`, memory-mapped unless
+      the file has no rows.
+
+    Raises:
+      UnicodeDecodeError: If the file is not UTF-8 text, and thus likely
+        a binary tensor file.
+      ValueError: If the file does not hold a table of numbers.
+      OSError: If the file cannot be read or converted.
+    """
+    stat = os.stat(fpath)
+    path_key = hashlib.sha256(os.path.abspath(fpath).encode()).hexdigest()[:32]
+    stem = "%s-%d-%d-" % (path_key, stat.st_size, stat.st_mtime_ns)
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        if name.startswith(stem) and name.endswith(_CONVERTED_TENSOR_SUFFIX):
+            shape_str = name[len(stem) : -len(_CONVERTED_TENSOR_SUFFIX)]
+            shape = tuple(int(dim) for dim in shape_str.split("x"))
+            return np.memmap(
+                os.path.join(cache_dir, name),
+                dtype="float32",
+                mode="r",
+                shape=shape,
+            )
+
+    os.makedirs(cache_dir, exist_ok=True)
+    (fd, temp_path) = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    num_rows = 0
+    num_columns = None
+    try:
+        with os.fdopen(fd, "wb") as out, tf.io.gfile.GFile(fpath, "r") as f:
+            rows = []
+            for line in f:
+                line = line.rstrip("\n")
+                if line:
+                    rows.append(list(map(float, line.split("\t"))))
+                if len(rows) == _TSV_CHUNK_ROWS:
+                    num_columns = _write_tsv_rows(out, rows, num_columns)
+                    num_rows += len(rows)
+                    rows = []
+            if rows:
+                num_columns = _write_tsv_rows(out, rows, num_columns)
+                num_rows += len(rows)
+        if not num_rows:
+            os.remove(temp_path)
+            return np.array([], dtype="float32")
+        path = os.path.join(
+            cache_dir,
+            "%s%dx%d%s"
+            % (stem, num_rows, num_columns, _CONVERTED_TENSOR_SUFFIX),
+        )
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    # Remove copies of older versions of the file.
+    for name in names:
+        if name.startswith(path_key + "-"):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    return np.memmap(
+        path, dtype="float32", mode="r", shape=(num_rows, num_columns)
+    )
+
+
+def _write_tsv_rows(out, rows, num_columns):
+    """Writes parsed TSV rows as float32 and returns the number of columns."""
+    array = np.array(rows, dtype="float32")
+    if array.ndim != 2 or num_columns not in (None, array.shape[1]):
+        raise ValueError("Rows of the tensor file differ in length")
+    out.write(array.tobytes())
+    return array.shape[1]
+
+
+def _read_tensor_file(fpath, shape):
+    """Reads an embedding tensor file, memory-mapping it where possible.
+
+    Args:
+      fpath: Path of a TSV file, or of a binary file of float32 values.
+      shape: The tensor shape from the projector config; only used for
+        binary files.
+    """
+    try:
+        if "://" not in fpath:
+            try:
+                return _convert_tensor_tsv_file(fpath, _tensor_cache_dir())
+            except OSError as e:
+                logger.warning("Cannot convert tensor file %s: %s", fpath, e)
+        return _read_tensor_tsv_file(fpath)
+    except UnicodeDecodeError:
+        return _read_tensor_binary_file(fpath, shape)
+
+
+def _tensor_response_chunks(tensor):
+    """Yields the float32 bytes of a 2D tensor, a range of rows at a time.
+
+    This avoids copying all of a (possibly memory-mapped) tensor at once.
+    """
+    row_bytes = 4 * (tensor.shape[1] if tensor.ndim == 2 else 1)
+    chunk_rows = max(1, _TENSOR_RESPONSE_CHUNK_BYTES // max(1, row_bytes))
+    for start in range(0, len(tensor), chunk_rows):
+        chunk = tensor[start : start + chunk_rows]
+        if chunk.dtype != "float32":
+            chunk = chunk.astype(dtype="float32")
+        yield chunk.tobytes()
 
 
 def _assets_dir_to_logdir(assets_dir):
@@ -247,7 +403,7 @@ class ProjectorPlugin(base_plugin.TBPlugin):
         self._run_paths = None
         self._configs = {}
         self.config_fpaths = None
-        self.tensor_cache = LRUCache(_TENSOR_CACHE_CAPACITY)
+        self.tensor_cache = LRUCache(_TENSOR_CACHE_MAX_BYTES)
 
         # Whether the plugin is active (has meaningful data to process and serve).
         # Once the plugin is deemed active, we no longer re-compute the value
@@ -377,12 +533,9 @@ class ProjectorPlugin(base_plugin.TBPlugin):
                     )
                     tensor = self.tensor_cache.get((run, embedding.tensor_name))
                     if tensor is None:
-                        try:
-                            tensor = _read_tensor_tsv_file(fpath)
-                        except UnicodeDecodeError:
-                            tensor = _read_tensor_binary_file(
-                                fpath, embedding.tensor_shape
-                            )
+                        tensor = _read_tensor_file(
+                            fpath, embedding.tensor_shape
+                        )
                         self.tensor_cache.set(
                             (run, embedding.tensor_name), tensor
                         )
@@ -670,12 +823,7 @@ class ProjectorPlugin(base_plugin.TBPlugin):
                         "text/plain",
                         400,
                     )
-                try:
-                    tensor = _read_tensor_tsv_file(fpath)
-                except UnicodeDecodeError:
-                    tensor = _read_tensor_binary_file(
-                        fpath, embedding.tensor_shape
-                    )
+                tensor = _read_tensor_file(fpath, embedding.tensor_shape)
             else:
                 reader = self._get_reader_for_run(run)
                 if not reader or not reader.has_tensor(name):
@@ -695,10 +843,12 @@ class ProjectorPlugin(base_plugin.TBPlugin):
 
         if num_rows:
             tensor = tensor[:num_rows]
-        if tensor.dtype != "float32":
-            tensor = tensor.astype(dtype="float32", copy=False)
-        data_bytes = tensor.tobytes()
-        return Respond(request, data_bytes, "application/octet-stream")
+        return Respond(
+            request,
+            _tensor_response_chunks(tensor),
+            "application/octet-stream",
+            content_length=4 * tensor.size,
+        )
 
     @wrappers.Request.application
     def _serve_bookmarks(self, request):
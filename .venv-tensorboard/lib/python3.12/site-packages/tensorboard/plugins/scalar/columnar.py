@@ -0,0 +1,143 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Binary, columnar encoding of scalar time series.
+
+A payload holds any number of series, each identified by a run and a
+tag. All integers are little-endian. The payload starts with a 16-byte
+header:
+
+    magic        4 bytes  b"TBSC"
+    version      uint32   currently 1
+    num_series   uint64
+
+followed by each series in turn:
+
+    run_length   uint32   length of the UTF-8 run name in bytes
+    tag_length   uint32   length of the UTF-8 tag name in bytes
+    num_points   uint64
+    run          run_length bytes
+    tag          tag_length bytes
+    padding      zero bytes up to the next multiple of 8 from the start
+                 of the payload
+    steps        num_points int64s
+    wall_times   num_points float64s
+    values       num_points float64s
+
+The padding keeps every array 8-byte aligned, so that clients can view
+them in place (e.g., as a JavaScript `Float64Array`) without copying.
+"""
+
+
+import struct
+
+import numpy as np
+
+
+# Media type of payloads in this format, for content negotiation.
+MIME_TYPE = "application/x-tensorboard-scalar-columns"
+
+_MAGIC = b"TBSC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+_SERIES_HEADER = struct.Struct("<IIQ")
+_ALIGNMENT = 8
+
+_STEP_DTYPE = np.dtype("<i8")
+_FLOAT_DTYPE = np.dtype("<f8")
+
+
+def encode(series):
+    """Encodes scalar time series.
+
+    Args:
+      series: An iterable of `(run, tag, columns)` triples, where `run`
+        and `tag` are strings and `columns` is a `provider.ScalarColumns`.
+
+    Returns:
+      The encoded payload, as `bytes`.
+    """
+    chunks = [None]
+    offset = _HEADER.size
+    num_series = 0
+    for run, tag, columns in series:
+        run_bytes = run.encode("utf-8")
+        tag_bytes = tag.encode("utf-8")
+        n = len(columns.steps)
+        chunks.append(_SERIES_HEADER.pack(len(run_bytes), len(tag_bytes), n))
+        chunks.append(run_bytes)
+        chunks.append(tag_bytes)
+        offset += _SERIES_HEADER.size + len(run_bytes) + len(tag_bytes)
+        padding = -offset % _ALIGNMENT
+        chunks.append(b"\0" * padding)
+        offset += padding
+        for array, dtype in (
+            (columns.steps, _STEP_DTYPE),
+            (columns.wall_times, _FLOAT_DTYPE),
+            (columns.values, _FLOAT_DTYPE),
+        ):
+            data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+            chunks.append(data)
+            offset += len(data)
+        num_series += 1
+    chunks[0] = _HEADER.pack(_MAGIC, _VERSION, num_series)
+    return b"".join(chunks)
+
+
+def decode(data):
+    """Decodes a payload produced by `encode`.
+
+    Args:
+      data: A bytes-like object.
+
+    Returns:
+      A list of `(run, tag, steps, wall_times, values)` tuples, where the
+      last three are NumPy arrays viewing `data`.
+
+    Raises:
+      ValueError: If `data` is not a valid payload.
+    """
+    data = memoryview(data)
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated header")
+    (magic, version, num_series) = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("bad magic: %r" % (magic,))
+    if version != _VERSION:
+        raise ValueError("unsupported version: %d" % version)
+    offset = _HEADER.size
+    result = []
+    for _ in range(num_series):
+        if offset + _SERIES_HEADER.size > len(data):
+            raise ValueError("truncated series header")
+        (run_length, tag_length, n) = _SERIES_HEADER.unpack_from(data, offset)
+        offset += _SERIES_HEADER.size
+        run = bytes(data[offset : offset + run_length]).decode("utf-8")
+        offset += run_length
+        tag = bytes(data[offset : offset + tag_length]).decode("utf-8")
+        offset += tag_length
+        offset += -offset % _ALIGNMENT
+        arrays = []
+        for dtype in (_STEP_DTYPE, _FLOAT_DTYPE, _FLOAT_DTYPE):
+            size = n * dtype.itemsize
+            if offset + size > len(data):
+                raise ValueError("truncated series %r/%r" % (run, tag))
+            arrays.append(
+                np.frombuffer(data, dtype=dtype, count=n, offset=offset)
+            )
+            offset += size
+        result.append((run, tag) + tuple(arrays))
+    if offset != len(data):
+        raise ValueError("%d trailing bytes" % (len(data) - offset))
+    return result
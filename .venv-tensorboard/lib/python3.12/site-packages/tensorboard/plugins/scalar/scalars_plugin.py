@@ -21,6 +21,7 @@ this plugin.
 
 import csv
 import io
+import json
 
 import werkzeug.exceptions
 from werkzeug import wrappers
@@ -30,6 +31,7 @@ from tensorboard import plugin_util
 from tensorboard.backend import http_util
 from tensorboard.data import provider
 from tensorboard.plugins import base_plugin
+from tensorboard.plugins.scalar import columnar
 from tensorboard.plugins.scalar import metadata
 
 _DEFAULT_DOWNSAMPLING = 1000  # scalars per time series
@@ -66,6 +68,7 @@ class ScalarsPlugin(base_plugin.TBPlugin):
         return {
             "/scalars": self.scalars_route,
             "/scalars_multirun": self.scalars_multirun_route,
+            "/scalars_batch": self.scalars_batch_route,
             "/tags": self.tags_route,
         }
 
@@ -98,7 +101,15 @@ class ScalarsPlugin(base_plugin.TBPlugin):
                 }
         return result
 
-    def scalars_impl(self, ctx, tag, run, experiment, output_format):
+    def scalars_impl(
+        self,
+        ctx,
+        tag,
+        run,
+        experiment,
+        output_format,
+        downsample_strategy=None,
+    ):
         """Result of the form `(body, mime_type)`."""
         all_scalars = self._data_provider.read_scalars(
             ctx,
@@ -106,6 +117,7 @@ class ScalarsPlugin(base_plugin.TBPlugin):
             plugin_name=metadata.PLUGIN_NAME,
             downsample=self._downsample_to,
             run_tag_filter=provider.RunTagFilter(runs=[run], tags=[tag]),
+            **_strategy_kwargs(downsample_strategy),
         )
         scalars = all_scalars.get(run, {}).get(tag, None)
         if scalars is None:
@@ -122,7 +134,9 @@ class ScalarsPlugin(base_plugin.TBPlugin):
         else:
             return (values, "application/json")
 
-    def scalars_multirun_impl(self, ctx, tag, runs, experiment):
+    def scalars_multirun_impl(
+        self, ctx, tag, runs, experiment, downsample_strategy=None
+    ):
         """Result of the form `(body, mime_type)`."""
         all_scalars = self._data_provider.read_scalars(
             ctx,
@@ -130,6 +144,7 @@ class ScalarsPlugin(base_plugin.TBPlugin):
             plugin_name=metadata.PLUGIN_NAME,
             downsample=self._downsample_to,
             run_tag_filter=provider.RunTagFilter(runs=runs, tags=[tag]),
+            **_strategy_kwargs(downsample_strategy),
         )
         body = {
             run: [(x.wall_time, x.step, x.value) for x in run_data[tag]]
@@ -137,6 +152,59 @@ class ScalarsPlugin(base_plugin.TBPlugin):
         }
         return (body, "application/json")
 
+    def scalars_batch_impl(
+        self,
+        ctx,
+        run_tag_pairs,
+        experiment,
+        mime_type,
+        downsample_strategy=None,
+    ):
+        """Result of the form `(body, mime_type)`.
+
+        Args:
+          ctx: A `tensorboard.context.RequestContext` value.
+          run_tag_pairs: A list of `(run, tag)` pairs to read.
+          experiment: ID of the experiment.
+          mime_type: Either "application/json" or `columnar.MIME_TYPE`,
+            the format of the body to return.
+          downsample_strategy: Optional `provider.DownsampleStrategy`.
+        """
+        runs_by_tag = {}
+        for run, tag in run_tag_pairs:
+            runs_by_tag.setdefault(tag, {})[run] = None
+        columns_by_pair = {}
+        for tag, runs in runs_by_tag.items():
+            all_columns = self._data_provider.read_scalar_columns(
+                ctx,
+                experiment_id=experiment,
+                plugin_name=metadata.PLUGIN_NAME,
+                downsample=self._downsample_to,
+                run_tag_filter=provider.RunTagFilter(runs=runs, tags=[tag]),
+                **_strategy_kwargs(downsample_strategy),
+            )
+            for run, run_columns in all_columns.items():
+                if tag in run_columns:
+                    columns_by_pair[(run, tag)] = run_columns[tag]
+        # Series appear in request order; missing ones are omitted.
+        series = [
+            (run, tag, columns_by_pair[(run, tag)])
+            for (run, tag) in dict.fromkeys(run_tag_pairs)
+            if (run, tag) in columns_by_pair
+        ]
+        if mime_type == columnar.MIME_TYPE:
+            return (columnar.encode(series), mime_type)
+        body = {}
+        for run, tag, columns in series:
+            body.setdefault(run, {})[tag] = list(
+                zip(
+                    columns.wall_times.tolist(),
+                    columns.steps.tolist(),
+                    columns.values.tolist(),
+                )
+            )
+        return (body, "application/json")
+
     @wrappers.Request.application
     def tags_route(self, request):
         ctx = plugin_util.context(request.environ)
@@ -158,8 +226,11 @@ class ScalarsPlugin(base_plugin.TBPlugin):
         ctx = plugin_util.context(request.environ)
         experiment = plugin_util.experiment_id(request.environ)
         output_format = request.args.get("format")
+        downsample_strategy = plugin_util.downsample_strategy(
+            request.args.get("downsampling")
+        )
         (body, mime_type) = self.scalars_impl(
-            ctx, tag, run, experiment, output_format
+            ctx, tag, run, experiment, output_format, downsample_strategy
         )
         return http_util.Respond(request, body, mime_type)
 
@@ -178,7 +249,63 @@ class ScalarsPlugin(base_plugin.TBPlugin):
 
         ctx = plugin_util.context(request.environ)
         experiment = plugin_util.experiment_id(request.environ)
+        downsample_strategy = plugin_util.downsample_strategy(
+            request.form.get("downsampling")
+        )
         (body, mime_type) = self.scalars_multirun_impl(
-            ctx, tag, runs, experiment
+            ctx, tag, runs, experiment, downsample_strategy
         )
         return http_util.Respond(request, body, mime_type)
+
+    @wrappers.Request.application
+    def scalars_batch_route(self, request):
+        """Given a list of runs and tags, return the data of each series.
+
+        The request is a POST whose `requests` form field is a JSON list
+        of `{"run": ..., "tag": ...}` objects. By default, the response is
+        JSON of the form `{run: {tag: [[wall_time, step, value], ...]}}`;
+        clients that accept `columnar.MIME_TYPE` get the same data in
+        that binary encoding instead. An optional `downsampling` form
+        field names a `provider.DownsampleStrategy`.
+        """
+        if request.method != "POST":
+            raise werkzeug.exceptions.MethodNotAllowed(["POST"])
+        try:
+            requests = json.loads(request.form.get("requests", ""))
+        except ValueError:
+            raise errors.InvalidArgumentError(
+                "requests must be a JSON list of {run, tag} objects"
+            )
+        if not isinstance(requests, list) or not all(
+            isinstance(r, dict)
+            and isinstance(r.get("run"), str)
+            and isinstance(r.get("tag"), str)
+            for r in requests
+        ):
+            raise errors.InvalidArgumentError(
+                "requests must be a JSON list of {run, tag} objects"
+            )
+        run_tag_pairs = [(r["run"], r["tag"]) for r in requests]
+        mime_type = request.accept_mimetypes.best_match(
+            ["application/json", columnar.MIME_TYPE],
+            default="application/json",
+        )
+
+        ctx = plugin_util.context(request.environ)
+        experiment = plugin_util.experiment_id(request.environ)
+        downsample_strategy = plugin_util.downsample_strategy(
+            request.form.get("downsampling")
+        )
+        (body, mime_type) = self.scalars_batch_impl(
+            ctx, run_tag_pairs, experiment, mime_type, downsample_strategy
+        )
+        return http_util.Respond(
+            request, body, mime_type, headers=[("Vary", "Accept")]
+        )
+
+
+def _strategy_kwargs(downsample_strategy):
+    """Keyword arguments for `read_scalars` selecting a strategy, if any."""
+    if downsample_strategy is None:
+        return {}
+    return {"downsample_strategy": downsample_strategy}
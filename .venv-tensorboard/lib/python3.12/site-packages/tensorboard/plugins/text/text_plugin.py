@@ -15,7 +15,13 @@
 """The TensorBoard Text plugin."""
 
 
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import os
 import textwrap
+import threading
 
 # pylint: disable=g-bad-import-order
 # Necessary for an internal test with special behavior for numpy.
@@ -44,6 +50,12 @@ WARNING_TEMPLATE = textwrap.dedent(
 
 _DEFAULT_DOWNSAMPLING = 100  # text tensors per time series
 
+# Maximum total length of the HTML kept by the `HtmlCache` of a plugin.
+_HTML_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Maximum number of threads rendering text on cache misses.
+_MAX_RENDER_THREADS = 4
+
 
 def make_table_row(contents, tag="td"):
     """Given an iterable of string contents, make a table row.
@@ -197,6 +209,90 @@ def text_array_to_html(text_arr, enable_markdown):
     return warning + table
 
 
+def html_cache_key(text_arr, enable_markdown):
+    """Returns a key identifying the HTML of a text array.
+
+    Args:
+      text_arr: A numpy.ndarray containing strings, as for
+        `text_array_to_html`.
+      enable_markdown: boolean, whether to enable Markdown
+
+    Returns:
+      A hashable key, equal for arrays of the same shape and contents.
+    """
+    digest = hashlib.blake2b(repr(text_arr.shape).encode(), digest_size=16)
+    for cell in text_arr.reshape(-1):
+        if isinstance(cell, str):
+            cell = cell.encode("utf-8")
+        elif not isinstance(cell, bytes):
+            cell = str(cell).encode("utf-8")
+        digest.update(len(cell).to_bytes(8, "little"))
+        digest.update(cell)
+    return (bool(enable_markdown), digest.digest())
+
+
+class HtmlCache:
+    """A size-bounded LRU map from `html_cache_key`s to rendered HTML.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, max_size):
+        """Initializes an `HtmlCache`.
+
+        Args:
+          max_size: Maximum total length of the cached HTML strings.
+        """
+        self._max_size = max_size
+        self._mutex = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Returns the HTML cached under `key`, or `None`."""
+        with self._mutex:
+            html = self._entries.get(key)
+            if html is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return html
+
+    def put(self, key, html):
+        """Caches `html` under `key`, evicting old entries as needed."""
+        size = len(html)
+        if size > self._max_size:
+            return
+        with self._mutex:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = html
+            self._size += size
+            while self._size > self._max_size:
+                (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._evictions += 1
+
+    def stats(self):
+        """Returns a dict of counters describing the use of this cache."""
+        with self._mutex:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+                "max_size": self._max_size,
+            }
+
+
 def process_event(wall_time, step, string_ndarray, enable_markdown):
     """Convert a text event into a JSON-compatible response."""
     html = text_array_to_html(string_ndarray, enable_markdown)
@@ -226,6 +322,17 @@ class TextPlugin(base_plugin.TBPlugin):
             data_kind="text",
             latest_known_version=0,
         )
+        self.html_cache = HtmlCache(_HTML_CACHE_MAX_SIZE)
+        # Markdown rendering and sanitization run in Python, so threads
+        # only help where they can run in parallel; each keeps its own
+        # converter and cleaner in `plugin_util`'s thread-local stores.
+        render_threads = min(_MAX_RENDER_THREADS, os.cpu_count() or 1)
+        self._render_executor = None
+        if render_threads > 1:
+            self._render_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=render_threads,
+                thread_name_prefix="TextPluginRender",
+            )
 
     def is_active(self):
         return False  # `list_plugins` as called by TB core suffices
@@ -233,6 +340,9 @@ class TextPlugin(base_plugin.TBPlugin):
     def frontend_metadata(self):
         return base_plugin.FrontendMetadata(element_name="tf-text-dashboard")
 
+    def cache_stats(self):
+        return {"html": self.html_cache.stats()}
+
     def index_impl(self, ctx, experiment):
         mapping = self._data_provider.list_tensors(
             ctx,
@@ -266,9 +376,48 @@ class TextPlugin(base_plugin.TBPlugin):
         text = all_text.get(run, {}).get(tag, None)
         if text is None:
             return []
+        htmls = self._render(text, enable_markdown)
+        return [
+            {"wall_time": d.wall_time, "step": d.step, "text": html}
+            for (d, html) in zip(text, htmls)
+        ]
+
+    def _render(self, text, enable_markdown):
+        """Converts text tensors to HTML, as by `text_array_to_html`.
+
+        HTML is taken from `html_cache` where possible. The other tensors
+        are rendered once per distinct content, on the render threads if
+        there are several, and added to the cache.
+
+        Args:
+          text: A list of `provider.TensorDatum`s of string tensors.
+          enable_markdown: boolean, whether to enable Markdown
+
+        Returns:
+          A list with the HTML of each tensor.
+        """
+        keys = [html_cache_key(d.numpy, enable_markdown) for d in text]
+        htmls = [self.html_cache.get(key) for key in keys]
+        missing = {}
+        for d, key, html in zip(text, keys, htmls):
+            if html is None:
+                missing.setdefault(key, d.numpy)
+        if not missing:
+            return htmls
+
+        render = functools.partial(
+            text_array_to_html, enable_markdown=enable_markdown
+        )
+        if self._render_executor is not None and len(missing) > 1:
+            rendered = list(self._render_executor.map(render, missing.values()))
+        else:
+            rendered = [render(arr) for arr in missing.values()]
+        key_to_html = dict(zip(missing, rendered))
+        for key, html in key_to_html.items():
+            self.html_cache.put(key, html)
         return [
-            process_event(d.wall_time, d.step, d.numpy, enable_markdown)
-            for d in text
+            html if html is not None else key_to_html[key]
+            for (key, html) in zip(keys, htmls)
         ]
 
     @wrappers.Request.application
@@ -30,6 +30,8 @@ try:
 except ImportError:
     pass
 
+from tensorboard.summary._aggregation import AggregatingOutput  # noqa: F401
+from tensorboard.summary._aggregation import AggregationServer  # noqa: F401
 from tensorboard.summary._output import DirectoryOutput  # noqa: F401
 from tensorboard.summary._output import Output  # noqa: F401
 from tensorboard.summary._writer import Writer  # noqa: F401
@@ -0,0 +1,476 @@
+# Copyright 2025 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Aggregation of summary data written by many processes into one log.
+
+An `AggregationServer` runs a single writer process listening on a local
+Unix socket. Producer processes (e.g., the ranks of a data-parallel
+training job) each write through an `AggregatingOutput` connected to that
+socket, and the writer process merges their data points into a single
+event file, optionally reducing the values that the ranks wrote for the
+same tag and step.
+
+Example:
+
+    server = AggregationServer(logdir, reduce="mean", num_ranks=8)
+    # In each rank, e.g. in a `multiprocessing.Process`:
+    writer = Writer(AggregatingOutput(server.address, rank=rank))
+    writer.add_scalar("loss", loss, step)
+    writer.close()
+    # Once all ranks are done:
+    server.close()
+
+TODO(#4581): This API should be considered EXPERIMENTAL and subject to
+backwards-incompatible changes without notice.
+"""
+
+import multiprocessing
+import os
+import selectors
+import shutil
+import socket
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from tensorboard.summary import _output
+
+
+# Supported values of the `reduce` option, and how they combine the values
+# of the ranks.
+_REDUCTIONS = {
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+}
+
+# Records sent from producers to the writer process. Each starts with a
+# one-byte kind; all integers are little-endian.
+#
+# Sent once, first: the rank of the producer.
+_HELLO_KIND = 1
+_HELLO = struct.Struct("<BI")
+# Sent once per tag before its first data point: a producer-chosen tag ID,
+# then the byte lengths of the UTF-8 tag, the UTF-8 plugin name, the tag
+# metadata and the UTF-8 description, followed by those strings.
+_TAG_KIND = 2
+_TAG = struct.Struct("<BIIIII")
+# A scalar data point: tag ID, step, wall time and value.
+_SCALAR_KIND = 3
+_SCALAR = struct.Struct("<BIqdf")
+# Asks the writer process to flush its event file and to reply with one
+# byte once done.
+_FLUSH_KIND = 4
+_FLUSH = struct.Struct("<B")
+
+_FLUSH_ACK = b"\x00"
+
+# Producers send their buffered records once they exceed this size...
+_SEND_BYTES = 64 * 1024
+# ...or once the oldest of them is this old, whichever comes first.
+_DEFAULT_SEND_INTERVAL_SECS = 1.0
+
+_RECV_BYTES = 1 << 20
+
+_SOCKET_NAME = "aggregation.sock"
+
+
+class AggregationServer:
+    """Runs a process that writes the data of `AggregatingOutput`s.
+
+    The writer process accepts connections from any number of producers
+    until `close` is called, and writes all of their data to a single event
+    file in `logdir`.
+
+    If `reduce` is None, the data points of each rank are written under
+    their own tag, `<tag>/rank_<rank>`, so that TensorBoard shows the ranks
+    of a tag side by side. Otherwise, the data points written by all ranks
+    for a tag and step are combined into one, under the original tag, as
+    soon as `num_ranks` of them have arrived; data points for which fewer
+    ranks wrote a value are combined when the server is closed. The wall
+    time of a combined data point is the latest of the combined ones, and
+    its summary metadata is taken from the first rank that wrote the tag.
+
+    TODO(#4581): This API should be considered EXPERIMENTAL and subject to
+    backwards-incompatible changes without notice.
+    """
+
+    def __init__(self, logdir, reduce=None, num_ranks=None, mp_context=None):
+        """Starts an `AggregationServer` writing to the given directory.
+
+        Args:
+          logdir: string path of the directory to write the event file to.
+          reduce: optional string, one of "mean", "min" or "max": how to
+            combine the values written by all ranks for a tag and step.
+            Defaults to None, in which case values are not combined.
+          num_ranks: integer number of producer ranks. Required if `reduce`
+            is given.
+          mp_context: optional `multiprocessing` context with which to
+            start the writer process. Defaults to the default context.
+
+        Raises:
+          ValueError: If `reduce` is unknown, or `num_ranks` is missing or
+            not positive while `reduce` is given.
+        """
+        if reduce is not None and reduce not in _REDUCTIONS:
+            raise ValueError(
+                "Unknown reduction %r; expected one of: %s"
+                % (reduce, ", ".join(sorted(_REDUCTIONS)))
+            )
+        if reduce is not None and not (num_ranks and num_ranks > 0):
+            raise ValueError(
+                "num_ranks must be a positive integer when reducing, got %r"
+                % (num_ranks,)
+            )
+        if mp_context is None:
+            mp_context = multiprocessing.get_context()
+        self._socket_dir = tempfile.mkdtemp(prefix="tb-aggregation-")
+        self._address = os.path.join(self._socket_dir, _SOCKET_NAME)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self._address)
+            listener.listen(socket.SOMAXCONN)
+            (self._control, child_control) = mp_context.Pipe()
+            self._process = mp_context.Process(
+                target=_serve,
+                args=(listener, child_control, logdir, reduce, num_ranks),
+                name="AggregationServer",
+                daemon=True,
+            )
+            self._process.start()
+            child_control.close()
+        except BaseException:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            raise
+        finally:
+            listener.close()
+        self._closed = False
+
+    @property
+    def address(self):
+        """The path of the Unix socket to pass to `AggregatingOutput`."""
+        return self._address
+
+    def close(self):
+        """Writes all remaining data and stops the writer process.
+
+        This stops accepting new producers, then waits until all connected
+        producers have closed their `AggregatingOutput` (or exited) before
+        writing any partially reduced data points and closing the event
+        file.
+
+        Raises:
+          RuntimeError: If the writer process failed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._control.send(None)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The writer process has already exited; see below.
+        self._process.join()
+        self._control.close()
+        shutil.rmtree(self._socket_dir, ignore_errors=True)
+        if self._process.exitcode != 0:
+            raise RuntimeError(
+                "Aggregation writer process exited with code %r"
+                % self._process.exitcode
+            )
+
+
+class AggregatingOutput(_output.Output):
+    """Outputs summary data by sending it to an `AggregationServer`.
+
+    Data points are buffered and sent in batches; `flush` sends all of them
+    and waits until the server has written them to its event file (except
+    for data points still waiting on other ranks to be reduced).
+
+    TODO(#4581): This API should be considered EXPERIMENTAL and subject to
+    backwards-incompatible changes without notice.
+    """
+
+    def __init__(
+        self,
+        address,
+        rank,
+        send_interval_secs=_DEFAULT_SEND_INTERVAL_SECS,
+    ):
+        """Creates an `AggregatingOutput` connected to a server.
+
+        Args:
+          address: the `address` of an `AggregationServer`.
+          rank: non-negative integer identifying this producer, e.g. the
+            rank of this process in a data-parallel job. Each producer of a
+            server should have a distinct rank.
+          send_interval_secs: maximum number of seconds for which data
+            points are buffered before being sent to the server, as checked
+            whenever a data point is emitted.
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(address)
+        self._send_interval_secs = send_interval_secs
+        self._buffer = bytearray(_HELLO.pack(_HELLO_KIND, rank))
+        self._send_deadline = time.monotonic() + send_interval_secs
+        self._tag_ids = {}
+
+    def emit_scalar(
+        self,
+        *,
+        plugin_name,
+        tag,
+        data,
+        step,
+        wall_time,
+        tag_metadata=None,
+        description=None,
+    ):
+        """See `Output`."""
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = self._define_tag(
+                tag, plugin_name, tag_metadata, description
+            )
+        self._buffer += _SCALAR.pack(
+            _SCALAR_KIND, tag_id, int(step), wall_time, data
+        )
+        if (
+            len(self._buffer) >= _SEND_BYTES
+            or time.monotonic() >= self._send_deadline
+        ):
+            self._send()
+
+    def _define_tag(self, tag, plugin_name, tag_metadata, description):
+        """Buffers the definition of a new tag and returns its ID."""
+        tag_id = len(self._tag_ids)
+        self._tag_ids[tag] = tag_id
+        strings = (
+            tag.encode("utf-8"),
+            plugin_name.encode("utf-8"),
+            tag_metadata or b"",
+            (description or "").encode("utf-8"),
+        )
+        self._buffer += _TAG.pack(_TAG_KIND, tag_id, *map(len, strings))
+        for s in strings:
+            self._buffer += s
+        return tag_id
+
+    def _send(self):
+        """Sends all buffered records to the server."""
+        if self._buffer:
+            self._socket.sendall(self._buffer)
+            self._buffer.clear()
+        self._send_deadline = time.monotonic() + self._send_interval_secs
+
+    def flush(self):
+        """See `Output`."""
+        self._buffer += _FLUSH.pack(_FLUSH_KIND)
+        self._send()
+        if self._socket.recv(len(_FLUSH_ACK)) != _FLUSH_ACK:
+            raise IOError("Aggregation server closed the connection")
+
+    def close(self):
+        """See `Output`."""
+        try:
+            self._send()
+        finally:
+            self._socket.close()
+
+
+class _Aggregator:
+    """Writes the data points of all producers, reducing them if asked."""
+
+    def __init__(self, output, reduce, num_ranks):
+        self._output = output
+        self._reduce_fn = _REDUCTIONS[reduce] if reduce is not None else None
+        self._num_ranks = num_ranks
+        # Maps `(tag, step)` to a list `[tag_info, max_wall_time, values]`
+        # of the data points not yet reduced, in order of first arrival.
+        self._pending = {}
+
+    def define_tag(self, rank, tag, plugin_name, metadata, description):
+        """Returns a `_TagInfo` for a tag defined by the given rank."""
+        if self._reduce_fn is None:
+            output_tag = "%s/rank_%d" % (tag, rank)
+        else:
+            output_tag = tag
+        return _TagInfo(output_tag, plugin_name, metadata, description)
+
+    def add(self, tag_info, step, wall_time, value):
+        """Adds a data point.
+
+        Args:
+          tag_info: `_TagInfo` of the data point's tag, from `define_tag`.
+          step: integer step.
+          wall_time: float wall time.
+          value: float value.
+        """
+        if self._reduce_fn is None:
+            self._output.emit_scalar(
+                plugin_name=tag_info.plugin_name,
+                tag=tag_info.tag,
+                data=value,
+                step=step,
+                wall_time=wall_time,
+                tag_metadata=tag_info.metadata,
+                description=tag_info.description,
+            )
+            return
+        key = (tag_info.tag, step)
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = [tag_info, wall_time, [value]]
+            self._pending[key] = entry
+        else:
+            entry[1] = max(entry[1], wall_time)
+            entry[2].append(value)
+        if len(entry[2]) >= self._num_ranks:
+            del self._pending[key]
+            self._emit_reduced(step, entry)
+
+    def close(self):
+        """Writes all data points that are still pending."""
+        for (_, step), entry in self._pending.items():
+            self._emit_reduced(step, entry)
+        self._pending.clear()
+
+    def _emit_reduced(self, step, entry):
+        (tag_info, wall_time, values) = entry
+        self._output.emit_scalar(
+            plugin_name=tag_info.plugin_name,
+            tag=tag_info.tag,
+            data=self._reduce_fn(np.array(values, dtype=np.float32)),
+            step=step,
+            wall_time=wall_time,
+            tag_metadata=tag_info.metadata,
+            description=tag_info.description,
+        )
+
+
+class _TagInfo:
+    """A tag as defined by a producer, with the tag to write it under."""
+
+    __slots__ = ("tag", "plugin_name", "metadata", "description")
+
+    def __init__(self, tag, plugin_name, metadata, description):
+        self.tag = tag
+        self.plugin_name = plugin_name
+        self.metadata = metadata or None
+        self.description = description or None
+
+
+class _Connection:
+    """Decodes the records received from one producer."""
+
+    def __init__(self, sock, aggregator, output):
+        self.socket = sock
+        self._aggregator = aggregator
+        self._output = output
+        self._rank = None
+        self._tags = {}
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Processes newly received bytes.
+
+        Raises:
+          ValueError: If the bytes are not valid records.
+        """
+        buf = self._buffer
+        buf += data
+        size = len(buf)
+        offset = 0
+        add = self._aggregator.add
+        while offset < size:
+            kind = buf[offset]
+            if kind == _SCALAR_KIND:
+                if offset + _SCALAR.size > size:
+                    break
+                (_, tag_id, step, wall_time, value) = _SCALAR.unpack_from(
+                    buf, offset
+                )
+                offset += _SCALAR.size
+                add(self._tags[tag_id], step, wall_time, value)
+            elif kind == _TAG_KIND:
+                if offset + _TAG.size > size:
+                    break
+                (_, tag_id, *lengths) = _TAG.unpack_from(buf, offset)
+                end = offset + _TAG.size + sum(lengths)
+                if end > size:
+                    break
+                offset += _TAG.size
+                strings = []
+                for length in lengths:
+                    strings.append(bytes(buf[offset : offset + length]))
+                    offset += length
+                (tag, plugin_name, metadata, description) = strings
+                self._tags[tag_id] = self._aggregator.define_tag(
+                    self._rank,
+                    tag.decode("utf-8"),
+                    plugin_name.decode("utf-8"),
+                    metadata,
+                    description.decode("utf-8"),
+                )
+            elif kind == _HELLO_KIND:
+                if offset + _HELLO.size > size:
+                    break
+                (_, self._rank) = _HELLO.unpack_from(buf, offset)
+                offset += _HELLO.size
+            elif kind == _FLUSH_KIND:
+                offset += _FLUSH.size
+                self._output.flush()
+                self.socket.sendall(_FLUSH_ACK)
+            else:
+                raise ValueError("Unknown record kind: %d" % kind)
+        del buf[:offset]
+
+
+def _serve(listener, control, logdir, reduce, num_ranks):
+    """Main function of the writer process of an `AggregationServer`."""
+    output = _output.DirectoryOutput(logdir)
+    aggregator = _Aggregator(output, reduce, num_ranks)
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    selector.register(control, selectors.EVENT_READ)
+    num_connections = 0
+    stopping = False
+    while not stopping or num_connections:
+        for key, _ in selector.select():
+            if key.fileobj is listener:
+                (sock, _) = listener.accept()
+                connection = _Connection(sock, aggregator, output)
+                selector.register(sock, selectors.EVENT_READ, connection)
+                num_connections += 1
+            elif key.fileobj is control:
+                # Stop accepting producers, but serve the connected ones.
+                selector.unregister(listener)
+                listener.close()
+                selector.unregister(control)
+                stopping = True
+            else:
+                connection = key.data
+                try:
+                    data = connection.socket.recv(_RECV_BYTES)
+                except ConnectionResetError:
+                    data = b""
+                if data:
+                    connection.feed(data)
+                else:
+                    selector.unregister(connection.socket)
+                    connection.socket.close()
+                    num_connections -= 1
+    aggregator.close()
+    output.close()
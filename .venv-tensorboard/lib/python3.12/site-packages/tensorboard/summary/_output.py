@@ -14,12 +14,37 @@
 # ==============================================================================
 """Generalized output options for writing tensor-formatted summary data."""
 
-from tensorboard.compat.proto import event_pb2
 from tensorboard.compat.proto import summary_pb2
 from tensorboard.summary.writer import event_file_writer
-from tensorboard.util import tensor_util
 
 import abc
+import struct
+
+# Wire-format fragments for hand-encoding scalar `Event` protos. Fields are
+# written in field number order and fields with default values are omitted,
+# as protobuf serialization does, so the output is byte-identical to
+# serializing the equivalent `Event`.
+#
+# `Event.wall_time` (1, double) and `Event.step` (2, int64).
+_WALL_TIME_FIELD = struct.Struct("<Bd")
+_WALL_TIME_KEY = 0x09
+_STEP_KEY = b"\x10"
+# `Event.summary` (5) and `Summary.value` (1), length-delimited.
+_SUMMARY_KEY = b"\x2a"
+_VALUE_KEY = b"\x0a"
+# `Summary.Value.tag` (1), `.tensor` (8) and `.metadata` (9).
+_TAG_KEY = b"\x0a"
+_METADATA_KEY = b"\x4a"
+# `Summary.Value.tensor`, holding a 10-byte `TensorProto` with `dtype`
+# `DT_FLOAT`, an empty (scalar) `tensor_shape` and one packed `float_val`
+# whose 4 bytes must follow.
+_FLOAT_TENSOR_PREFIX = b"\x42\x0a\x08\x01\x12\x00\x2a\x04"
+_FLOAT_TENSOR_SIZE = len(_FLOAT_TENSOR_PREFIX) + 4
+
+_FLOAT = struct.Struct("<f")
+
+# Bound on the serialized events pending in the background writer.
+_MAX_QUEUE_BYTES = 4 << 20
 
 
 class Output(abc.ABC):
@@ -64,6 +89,28 @@ class Output(abc.ABC):
         """
         pass
 
+    def emit_scalars(self, *, plugin_name, tag_to_data, step, wall_time):
+        """Emits scalar data points for several tags at the same step.
+
+        The default implementation calls `emit_scalar` once per tag.
+
+        Args:
+          plugin_name: string name to uniquely identify the type of time series
+            (historically associated with a TensorBoard plugin).
+          tag_to_data: mapping from string tags to `np.float32` scalar values.
+          step: `np.int64` scalar step value for these data points.
+          wall_time: `float` seconds since the Unix epoch, representing the
+            real-world timestamp for these data points.
+        """
+        for tag, data in tag_to_data.items():
+            self.emit_scalar(
+                plugin_name=plugin_name,
+                tag=tag,
+                data=data,
+                step=step,
+                wall_time=wall_time,
+            )
+
     @abc.abstractmethod
     def flush(self):
         """Flushes any data that has been buffered."""
@@ -84,7 +131,17 @@ class DirectoryOutput(Output):
 
     def __init__(self, path):
         """Creates a `DirectoryOutput` for the given path."""
-        self._ev_writer = event_file_writer.EventFileWriter(path)
+        # Scalars are small and frequent, so batch them in the background
+        # rather than handing each one to the writer thread separately.
+        self._ev_writer = event_file_writer.EventFileWriter(
+            path, max_queue_bytes=_MAX_QUEUE_BYTES
+        )
+        # Maps each scalar tag already written to the serialized prefix of
+        # its later `Summary.Value`s, which omit the summary metadata.
+        self._scalar_value_prefixes = {}
+        # Consecutive events usually share a step, so keep its encoding.
+        self._last_step = None
+        self._step_field = b""
 
     def emit_scalar(
         self,
@@ -98,7 +155,50 @@ class DirectoryOutput(Output):
         description=None,
     ):
         """See `Output`."""
-        # TODO(#4581): cache summary metadata to emit only once.
+        value = self._scalar_value(
+            plugin_name, tag, data, tag_metadata, description
+        )
+        self._ev_writer.add_serialized_event(
+            self._event(step, wall_time, value)
+        )
+
+    def emit_scalars(self, *, plugin_name, tag_to_data, step, wall_time):
+        """See `Output`."""
+        values = b"".join(
+            self._scalar_value(plugin_name, tag, data, None, None)
+            for tag, data in tag_to_data.items()
+        )
+        self._ev_writer.add_serialized_event(
+            self._event(step, wall_time, values)
+        )
+
+    def _event(self, step, wall_time, values):
+        """Returns a serialized `Event` with the given `Summary.Value`s."""
+        step = int(step)
+        if step != self._last_step:
+            self._last_step = step
+            self._step_field = _STEP_KEY + _varint(step) if step else b""
+        if wall_time:
+            wall_time_field = _WALL_TIME_FIELD.pack(_WALL_TIME_KEY, wall_time)
+        else:
+            wall_time_field = b""
+        return (
+            wall_time_field
+            + self._step_field
+            + _SUMMARY_KEY
+            + _varint(len(values))
+            + values
+        )
+
+    def _scalar_value(self, plugin_name, tag, data, tag_metadata, description):
+        """Returns a serialized `Summary.Value` field for a scalar.
+
+        The summary metadata is only included the first time a tag is seen.
+        """
+        prefix = self._scalar_value_prefixes.get(tag)
+        if prefix is not None:
+            return prefix + _FLOAT.pack(data)
+        tag_field = _length_delimited(_TAG_KEY, tag.encode("utf-8"))
         summary_metadata = summary_pb2.SummaryMetadata(
             plugin_data=summary_pb2.SummaryMetadata.PluginData(
                 plugin_name=plugin_name, content=tag_metadata
@@ -106,12 +206,22 @@ class DirectoryOutput(Output):
             summary_description=description,
             data_class=summary_pb2.DataClass.DATA_CLASS_SCALAR,
         )
-        tensor_proto = tensor_util.make_tensor_proto(data)
-        event = event_pb2.Event(wall_time=wall_time, step=step)
-        event.summary.value.add(
-            tag=tag, tensor=tensor_proto, metadata=summary_metadata
+        metadata_field = _length_delimited(
+            _METADATA_KEY, summary_metadata.SerializeToString()
+        )
+        self._scalar_value_prefixes[tag] = (
+            _VALUE_KEY
+            + _varint(len(tag_field) + _FLOAT_TENSOR_SIZE)
+            + tag_field
+            + _FLOAT_TENSOR_PREFIX
+        )
+        return _length_delimited(
+            _VALUE_KEY,
+            tag_field
+            + _FLOAT_TENSOR_PREFIX
+            + _FLOAT.pack(data)
+            + metadata_field,
         )
-        self._ev_writer.add_event(event)
 
     def flush(self):
         """See `Output`."""
@@ -122,3 +232,25 @@ class DirectoryOutput(Output):
         # No need to call flush first since EventFileWriter already
         # will do this for us when we call close().
         self._ev_writer.close()
+
+
+def _varint(n):
+    """Encodes an integer as a protobuf varint.
+
+    Negative values are encoded as 64-bit two's complement, like `int64`.
+    """
+    if n < 0:
+        n += 1 << 64
+    if n < 0x80:
+        return bytes((n,))
+    result = bytearray()
+    while n >= 0x80:
+        result.append((n & 0x7F) | 0x80)
+        n >>= 7
+    result.append(n)
+    return bytes(result)
+
+
+def _length_delimited(key, payload):
+    """Encodes a length-delimited protobuf field."""
+    return key + _varint(len(payload)) + payload
@@ -96,6 +96,36 @@ class Writer:
             description=description,
         )
 
+    def add_scalars(self, tag_to_value, step, *, wall_time=None):
+        """Adds scalar summaries for several tags at the same step.
+
+        This is equivalent to calling `add_scalar` for each tag, but the
+        values are written together, which is faster for many tags.
+
+        Args:
+          tag_to_value: mapping from string tags, each used to uniquely
+            identify a time series, to numeric scalar values. Accepts any
+            values that can be converted to `np.float32` scalars.
+          step: integer step value for these data points. Accepts any value
+            that can be converted to a `np.int64` scalar.
+          wall_time: optional `float` seconds since the Unix epoch, representing
+            the real-world timestamp for these data points. Defaults to None in
+            which case the current time will be used.
+        """
+        self._check_not_closed()
+        validated_data = {
+            tag: _validate_scalar_shape(np.float32(data), "data")
+            for tag, data in tag_to_value.items()
+        }
+        validated_step = _validate_scalar_shape(np.int64(step), "step")
+        wall_time = wall_time if wall_time is not None else time.time()
+        self._output.emit_scalars(
+            plugin_name=scalars_metadata.PLUGIN_NAME,
+            tag_to_data=validated_data,
+            step=validated_step,
+            wall_time=wall_time,
+        )
+
 
 def _validate_scalar_shape(ndarray, name):
     if ndarray.ndim != 0:
@@ -52,7 +52,12 @@ class EventFileWriter:
     """
 
     def __init__(
-        self, logdir, max_queue_size=10, flush_secs=120, filename_suffix=""
+        self,
+        logdir,
+        max_queue_size=10,
+        flush_secs=120,
+        filename_suffix="",
+        max_queue_bytes=None,
     ):
         """Creates a `EventFileWriter` and an event file to write to.
 
@@ -67,6 +72,12 @@ class EventFileWriter:
           max_queue_size: Integer. Size of the queue for pending events and summaries.
           flush_secs: Number. How often, in seconds, to flush the
             pending events and summaries to disk.
+          filename_suffix: A string. Suffix appended to the event file name.
+          max_queue_bytes: Optional integer. If given, events are written in
+            batched mode: the background thread drains all pending events at
+            once and writes them with a single write, and `add_event` only
+            blocks when the serialized pending events exceed this many bytes.
+            `max_queue_size` is then ignored.
         """
         self._logdir = logdir
         tf.io.gfile.makedirs(logdir)
@@ -84,9 +95,18 @@ class EventFileWriter:
             + filename_suffix
         )  # noqa E128
         self._general_file_writer = tf.io.gfile.GFile(self._file_name, "wb")
-        self._async_writer = _AsyncWriter(
-            RecordWriter(self._general_file_writer), max_queue_size, flush_secs
-        )
+        if max_queue_bytes is None:
+            self._async_writer = _AsyncWriter(
+                RecordWriter(self._general_file_writer),
+                max_queue_size,
+                flush_secs,
+            )
+        else:
+            self._async_writer = _BatchedAsyncWriter(
+                RecordWriter(self._general_file_writer),
+                max_queue_bytes,
+                flush_secs,
+            )
 
         # Initialize an event instance.
         _event = event_pb2.Event(
@@ -116,6 +136,27 @@ class EventFileWriter:
             )
         self._async_writer.write(event.SerializeToString())
 
+    def add_serialized_event(self, serialized_event):
+        """Adds an already serialized event to the event file.
+
+        This skips the type check and serialization of `add_event`, for
+        callers that encode `Event` protocol buffers themselves.
+
+        Args:
+          serialized_event: A `bytes` object holding a serialized `Event`
+            protocol buffer.
+        """
+        self._async_writer.write(serialized_event)
+
+    def get_stats(self):
+        """Returns counters of the background writer, or None.
+
+        Counters are only kept in batched mode (see `max_queue_bytes`);
+        see `_BatchedAsyncWriter.stats` for their meaning.
+        """
+        stats = getattr(self._async_writer, "stats", None)
+        return stats() if stats is not None else None
+
     def flush(self):
         """Flushes the event file to disk.
 
@@ -290,3 +331,202 @@ class _AsyncWriterThread(threading.Thread):
                     self._has_pending_data = False
                 # Do it again in flush_secs.
                 self._next_flush_time = now + self._flush_secs
+
+
+class _BatchedAsyncWriter:
+    """Writes bytes to a file asynchronously, in batches.
+
+    Like `_AsyncWriter`, but the background thread takes all pending
+    bytestrings at once and writes them as a single batch with
+    `RecordWriter.write_batch`, and the pending bytestrings are bounded by
+    their total size rather than by their count.
+    """
+
+    def __init__(self, record_writer, max_queue_bytes, flush_secs=120):
+        """Creates a `_BatchedAsyncWriter` and starts its thread.
+
+        Args:
+            record_writer: A RecordWriter instance
+            max_queue_bytes: Integer. Size in bytes of pending bytestrings
+                above which `write` blocks. A single bytestring larger than
+                this is still accepted once nothing else is pending.
+            flush_secs: Number. How often, in seconds, to flush the
+                pending bytestrings to disk.
+        """
+        self._writer = record_writer
+        self._max_queue_bytes = max_queue_bytes
+        self._flush_secs = flush_secs
+        self._closed = False
+        self._exception = None
+        # Serializes calls to the record writer.
+        self._io_lock = threading.Lock()
+        # Guards all of the fields below. Never acquire `_io_lock` while
+        # holding this.
+        self._cond = threading.Condition()
+        self._pending = []
+        self._pending_bytes = 0
+        # Number of bytestrings ever enqueued and ever written, to let
+        # `flush` wait for the ones enqueued before it.
+        self._enqueued = 0
+        self._written = 0
+        self._stopping = False
+        self._stats = {
+            "enqueue_stalls": 0,
+            "enqueue_stall_secs": 0.0,
+            "batches": 0,
+            "records": 0,
+            "bytes": 0,
+            "max_batch_records": 0,
+            "max_batch_bytes": 0,
+            "flushes": 0,
+            "flush_secs": 0.0,
+            "max_flush_secs": 0.0,
+        }
+        self._worker = threading.Thread(
+            target=self._run, name="BatchedAsyncWriter"
+        )
+        self._worker.daemon = True
+        self._worker.start()
+
+    def write(self, bytestring):
+        """Enqueue the given bytes to be written asychronously."""
+        size = len(bytestring)
+        with self._cond:
+            self._check_status()
+            if (
+                self._pending_bytes
+                and self._pending_bytes + size > self._max_queue_bytes
+            ):
+                start = time.time()
+                while (
+                    self._pending_bytes
+                    and self._pending_bytes + size > self._max_queue_bytes
+                    and self._exception is None
+                    and not self._closed
+                ):
+                    self._cond.wait()
+                self._stats["enqueue_stalls"] += 1
+                self._stats["enqueue_stall_secs"] += time.time() - start
+                self._check_status()
+            self._pending.append(bytestring)
+            self._pending_bytes += size
+            self._enqueued += 1
+            # The worker only waits for data while nothing is pending.
+            if len(self._pending) == 1:
+                self._cond.notify_all()
+
+    def flush(self):
+        """Write all the enqueued bytestring before this flush call to disk.
+
+        Block until all the above bytestring are written.
+        """
+        with self._cond:
+            self._check_status()
+            target = self._enqueued
+            while self._written < target and self._exception is None:
+                self._cond.wait()
+            self._check_status()
+        self._flush_writer()
+
+    def close(self):
+        """Closes the underlying writer, flushing any pending writes first."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._stopping = True
+            self._cond.notify_all()
+        self._worker.join()
+        self._flush_writer()
+        with self._io_lock:
+            self._writer.close()
+        if self._exception is not None:
+            raise self._exception
+
+    def stats(self):
+        """Returns a dict of counters describing the writes so far.
+
+        The counters are: `enqueue_stalls`, the number of `write` calls
+        that blocked on a full queue, and `enqueue_stall_secs`, the total
+        time they blocked; `batches`, `records` and `bytes` written, with
+        the largest batch in `max_batch_records` and `max_batch_bytes`; and
+        `flushes` of the file, with their total and largest latency in
+        `flush_secs` and `max_flush_secs`.
+        """
+        with self._cond:
+            return dict(self._stats)
+
+    def _check_status(self):
+        """Raises a pending exception of the worker, or if closed."""
+        if self._exception is not None:
+            raise self._exception
+        if self._closed:
+            raise IOError("Writer is closed")
+
+    def _flush_writer(self):
+        """Flushes the record writer, recording its latency."""
+        with self._io_lock:
+            start = time.time()
+            self._writer.flush()
+            duration = time.time() - start
+        with self._cond:
+            self._stats["flushes"] += 1
+            self._stats["flush_secs"] += duration
+            self._stats["max_flush_secs"] = max(
+                self._stats["max_flush_secs"], duration
+            )
+
+    def _run(self):
+        # The first data will be flushed immediately.
+        next_flush_time = 0
+        has_pending_data = False
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    timeout = next_flush_time - time.time()
+                    if has_pending_data and timeout <= 0:
+                        break
+                    self._cond.wait(timeout if has_pending_data else None)
+                batch = self._pending
+                batch_bytes = self._pending_bytes
+                self._pending = []
+                self._pending_bytes = 0
+                stopping = self._stopping
+                # Let blocked writers proceed while this batch is written.
+                self._cond.notify_all()
+            try:
+                if batch:
+                    with self._io_lock:
+                        self._writer.write_batch(batch)
+                    has_pending_data = True
+                now = time.time()
+                if has_pending_data and (stopping or now > next_flush_time):
+                    # Small optimization - if there are no pending data,
+                    # there's no need to flush, since each flush can be
+                    # expensive (e.g. uploading a new file to a server).
+                    self._flush_writer()
+                    has_pending_data = False
+                    next_flush_time = now + self._flush_secs
+            except Exception as e:
+                with self._cond:
+                    self._exception = e
+                    self._pending = []
+                    self._pending_bytes = 0
+                    self._cond.notify_all()
+                raise
+            with self._cond:
+                self._written += len(batch)
+                if batch:
+                    stats = self._stats
+                    stats["batches"] += 1
+                    stats["records"] += len(batch)
+                    stats["bytes"] += batch_bytes
+                    stats["max_batch_records"] = max(
+                        stats["max_batch_records"], len(batch)
+                    )
+                    stats["max_batch_bytes"] = max(
+                        stats["max_batch_bytes"], batch_bytes
+                    )
+                self._cond.notify_all()
+            if stopping:
+                return
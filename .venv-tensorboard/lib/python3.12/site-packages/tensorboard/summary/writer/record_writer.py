@@ -17,6 +17,15 @@ import struct
 from tensorboard.compat.tensorflow_stub.pywrap_tensorflow import masked_crc32c
 
 
+_LENGTH = struct.Struct("<Q")
+_HEADER = struct.Struct("<QI")
+_CRC = struct.Struct("<I")
+# Bytes added to each record by the framing described in `RecordWriter`.
+_FRAMING_SIZE = _HEADER.size + _CRC.size
+# Maximum number of record lengths whose header CRC is cached.
+_MAX_CACHED_HEADER_CRCS = 1024
+
+
 class RecordWriter:
     """Write encoded protobuf to a file with packing defined in tensorflow."""
 
@@ -27,6 +36,11 @@ class RecordWriter:
         writer: A file-like object that implements `write`, `flush` and `close`.
         """
         self._writer = writer
+        # Reusable buffer for `write_batch`.
+        self._buffer = bytearray()
+        # Maps record lengths to the masked CRCs of their encodings. Most
+        # summaries of a given kind serialize to a few distinct lengths.
+        self._header_crcs = {}
 
     # Format of a single record: (little-endian)
     # uint64    length
@@ -39,6 +53,40 @@ class RecordWriter:
         footer_crc = struct.pack("<I", masked_crc32c(data))
         self._writer.write(header + header_crc + data + footer_crc)
 
+    def write_batch(self, records):
+        """Writes many records with a single write to the underlying file.
+
+        The records are framed into a buffer that is reused across calls
+        and grown as needed.
+
+        Args:
+          records: A sequence of `bytes`, the records to write in order.
+        """
+        size = sum(len(data) for data in records) + _FRAMING_SIZE * len(records)
+        if len(self._buffer) < size:
+            self._buffer = bytearray(max(size, 2 * len(self._buffer)))
+        buf = self._buffer
+        offset = 0
+        for data in records:
+            n = len(data)
+            _HEADER.pack_into(buf, offset, n, self._header_crc(n))
+            offset += _HEADER.size
+            buf[offset : offset + n] = data
+            offset += n
+            _CRC.pack_into(buf, offset, masked_crc32c(data))
+            offset += _CRC.size
+        self._writer.write(bytes(memoryview(buf)[:size]))
+
+    def _header_crc(self, length):
+        """Returns the masked CRC of the encoded record length."""
+        crc = self._header_crcs.get(length)
+        if crc is None:
+            if len(self._header_crcs) >= _MAX_CACHED_HEADER_CRCS:
+                self._header_crcs.clear()
+            crc = masked_crc32c(_LENGTH.pack(length))
+            self._header_crcs[length] = crc
+        return crc
+
     def flush(self):
         self._writer.flush()
 
@@ -8,7 +8,8 @@ from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
 from sklearn.datasets import load_breast_cancer
-from torch.utils.tensorboard import SummaryWriter
+
+from experiment_logger import ExperimentLogger
 
 # --- 1. Konfigurasi & Parameter ---
 MAX_DEPTH = 5
@@ -31,8 +32,11 @@ mlflow.start_run(run_name="decision_tree_classifier")
 mlflow.log_param("max_depth", MAX_DEPTH)
 mlflow.log_param("random_state", RANDOM_STATE)
 
-# Setup TensorBoard
-writer = SummaryWriter('runs/decision_tree_classifier')
+# Satu logger untuk TensorBoard, MLFlow dan DVC
+logger = ExperimentLogger(
+    tensorboard_dir='runs/decision_tree_classifier',
+    dvc_metrics_path="metrics/classification_metrics.json",
+)
 
 print("Memulai pelatihan model klasifikasi...")
 
@@ -54,10 +58,9 @@ metrics = {
 
 print("Metrik:", json.dumps(metrics, indent=2))
 
-# Log metrik ke MLFlow & TensorBoard
-mlflow.log_metrics(metrics)
-for key, value in metrics.items():
-    writer.add_scalar(f'Metrics/{key}', value, 0)
+# Log metrik ke MLFlow & TensorBoard, dan simpan untuk DVC
+logger.log_metrics(metrics, step=0, tensorboard_prefix='Metrics/')
+logger.log_summary(metrics)
 
 # --- 6. Buat dan Log Confusion Matrix ---
 cm = confusion_matrix(y_test, y_pred)
@@ -83,17 +86,13 @@ print(f"Confusion matrix disimpan di {cm_image_path}")
 # Membaca gambar sebagai array numpy untuk TensorBoard
 from PIL import Image
 image_array = np.array(Image.open(cm_image_path))
-writer.add_image('Plots/ConfusionMatrix', image_array, 0, dataformats='HWC')
+logger.tensorboard_writer.add_image('Plots/ConfusionMatrix', image_array, 0, dataformats='HWC')
 
 # --- 7. Selesaikan Logging ---
 
-# Tutup writer TensorBoard
-writer.close()
-
-# Simpan metrik untuk DVC
-os.makedirs("metrics", exist_ok=True)
-with open("metrics/classification_metrics.json", "w") as f:
-    json.dump(metrics, f, indent=4)
+# Tunggu semua metrik tertulis (termasuk file metrik DVC), lalu tutup writer
+# TensorBoard
+logger.close()
 
 print("Metrik klasifikasi disimpan untuk DVC.")
 
@@ -0,0 +1,50 @@
+import argparse
+import os
+import time
+
+from tensorboard.compat.tensorflow_stub import pywrap_tensorflow
+
+# --- 1. Konfigurasi & Parameter ---
+parser = argparse.ArgumentParser(
+    description="Bandingkan kecepatan backend CRC-32C pembaca event TensorBoard."
+)
+parser.add_argument(
+    "--seconds",
+    type=float,
+    default=0.5,
+    help="Waktu minimum pengukuran per backend dan ukuran input.",
+)
+args = parser.parse_args()
+
+SIZES = [("64 B", 64), ("64 KiB", 64 * 1024), ("4 MiB", 4 * 1024 * 1024)]
+
+# --- 2. Buat Data Acak ---
+inputs = {label: os.urandom(size) for label, size in SIZES}
+expected = {label: pywrap_tensorflow.crc32c(data) for label, data in inputs.items()}
+
+# --- 3. Ukur Setiap Backend ---
+original_backend = pywrap_tensorflow.get_crc_backend()
+print(f"Backend bawaan: {original_backend}")
+print(f"{'backend':<10}" + "".join(f"{label:>14}" for label, _ in SIZES))
+
+for backend in pywrap_tensorflow.crc_backends():
+    pywrap_tensorflow.set_crc_backend(backend)
+    row = f"{backend:<10}"
+    for label, size in SIZES:
+        data = inputs[label]
+        # Pastikan hasilnya sama dengan backend bawaan sebelum diukur.
+        if pywrap_tensorflow.crc32c(data) != expected[label]:
+            raise SystemExit(f"Checksum {backend} untuk {label} salah")
+        iterations = 0
+        start_time = time.perf_counter()
+        while True:
+            pywrap_tensorflow.crc32c(data)
+            iterations += 1
+            elapsed = time.perf_counter() - start_time
+            if elapsed >= args.seconds:
+                break
+        mb_per_second = size * iterations / elapsed / 1e6
+        row += f"{mb_per_second:>9.1f} MB/s"
+    print(row)
+
+pywrap_tensorflow.set_crc_backend(original_backend)
@@ -0,0 +1,309 @@
+"""Batched, asynchronous metric logging for the training scripts.
+
+`ExperimentLogger` fans metrics out to TensorBoard (a `SummaryWriter`),
+to MLflow (batched `log_batch` calls) and to a DVC metrics JSON file.
+All of that happens on a background thread, so the training loop only
+pays for putting a tuple in a bounded queue.
+
+Values may be PyTorch tensors. They are not converted with `.item()` on
+the training thread (which would wait for the device on every call);
+the background thread converts all tensors of a batch with a single
+transfer instead. Tensors must not be modified in place after logging
+them; the fresh loss tensor of each step is fine.
+
+Usage:
+
+    mlflow.start_run(run_name="...")
+    logger = ExperimentLogger(
+        tensorboard_dir="runs/...",
+        dvc_metrics_path="metrics/....json",
+    )
+    for step in ...:
+        logger.log_metric("loss", loss, step, tensorboard_tag="Loss/train")
+    logger.log_summary({"final_loss": loss})
+    logger.close()
+    mlflow.end_run()
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import mlflow
+    from mlflow.entities import Metric
+    from mlflow.tracking import MlflowClient
+except ImportError:
+    mlflow = None
+
+# MLflow accepts at most this many metrics per `log_batch` call.
+_MLFLOW_MAX_METRICS_PER_BATCH = 1000
+
+_METRIC = "metric"
+_SUMMARY = "summary"
+_FLUSH = "flush"
+_STOP = "stop"
+
+
+class ExperimentLogger:
+    """Logs metrics to TensorBoard, MLflow and DVC from a background thread.
+
+    The logger is also a context manager that closes itself on exit, and
+    it is closed at interpreter exit if the script forgets to.
+    """
+
+    def __init__(
+        self,
+        tensorboard_dir=None,
+        mlflow_run_id=None,
+        dvc_metrics_path=None,
+        max_pending=10000,
+        flush_secs=5.0,
+    ):
+        """Creates a logger and starts its background thread.
+
+        Args:
+          tensorboard_dir: Directory for a TensorBoard `SummaryWriter`, or
+            None to not log to TensorBoard.
+          mlflow_run_id: ID of the MLflow run to log to. Defaults to the
+            active run, if MLflow is installed and a run is active; call
+            `mlflow.start_run` before creating the logger.
+          dvc_metrics_path: Path of the JSON file that DVC tracks as metrics,
+            or None. It holds the values given to `log_summary`.
+          max_pending: Maximum number of logged values not yet processed by
+            the background thread. Logging blocks once it is reached, so
+            that a slow sink cannot grow memory without bound.
+          flush_secs: How often, in seconds, the sinks are flushed.
+        """
+        self.tensorboard_writer = None
+        if tensorboard_dir is not None:
+            from torch.utils.tensorboard import SummaryWriter
+
+            self.tensorboard_writer = SummaryWriter(tensorboard_dir)
+        if mlflow_run_id is None and mlflow is not None:
+            active_run = mlflow.active_run()
+            if active_run is not None:
+                mlflow_run_id = active_run.info.run_id
+        self._mlflow_run_id = mlflow_run_id
+        self._mlflow_client = MlflowClient() if mlflow_run_id else None
+        self._dvc_metrics_path = dvc_metrics_path
+        self._summary = {}
+        self._summary_dirty = False
+        self._flush_secs = flush_secs
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._max_batch = max(1, max_pending)
+        self._exception = None
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="ExperimentLogger", daemon=True
+        )
+        self._worker.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def log_metric(self, name, value, step=None, tensorboard_tag=None):
+        """Logs one metric value.
+
+        Args:
+          name: Metric name, as shown in MLflow.
+          value: A number, or a PyTorch tensor with a single element.
+          step: Integer step, or None for step 0.
+          tensorboard_tag: Tag to use in TensorBoard instead of `name`.
+        """
+        self._check_open()
+        if torch is not None and isinstance(value, torch.Tensor):
+            value = value.detach()
+        self._queue.put(
+            (
+                _METRIC,
+                name,
+                value,
+                0 if step is None else step,
+                time.time(),
+                tensorboard_tag or name,
+            )
+        )
+
+    def log_metrics(self, metrics, step=None, tensorboard_prefix=""):
+        """Logs several metric values at the same step.
+
+        Args:
+          metrics: Dict from metric names to values, as in `log_metric`.
+          step: Integer step, or None for step 0.
+          tensorboard_prefix: Prefix of the TensorBoard tags, e.g.
+            "Metrics/"; the metric name follows it.
+        """
+        for name, value in metrics.items():
+            self.log_metric(
+                name, value, step, tensorboard_tag=tensorboard_prefix + name
+            )
+
+    def log_summary(self, metrics):
+        """Sets values of the DVC metrics file.
+
+        Values are merged into the values set before, and the file is
+        rewritten on the next flush.
+
+        Args:
+          metrics: Dict from metric names to values, as in `log_metric`.
+        """
+        self._check_open()
+        for name, value in metrics.items():
+            if torch is not None and isinstance(value, torch.Tensor):
+                value = value.detach()
+            self._queue.put((_SUMMARY, name, value))
+
+    def flush(self):
+        """Waits until everything logged so far has reached all sinks."""
+        self._check_open()
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        while not done.wait(0.1):
+            if not self._worker.is_alive():
+                break
+        self._check_open()
+
+    def close(self):
+        """Flushes all sinks and stops the background thread.
+
+        Raises:
+          The first exception raised by a sink, if any.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._worker.is_alive():
+            self._queue.put((_STOP,))
+            self._worker.join()
+        if self.tensorboard_writer is not None:
+            self.tensorboard_writer.close()
+        if self._exception is not None:
+            raise self._exception
+
+    def _check_open(self):
+        if self._exception is not None:
+            raise self._exception
+        if self._closed:
+            raise RuntimeError("ExperimentLogger is closed")
+
+    def _run(self):
+        next_flush_time = time.time() + self._flush_secs
+        try:
+            while True:
+                timeout = max(0.0, next_flush_time - time.time())
+                try:
+                    batch = [self._queue.get(timeout=timeout)]
+                except queue.Empty:
+                    batch = []
+                # Take whatever else is pending, to resolve and send it all
+                # at once.
+                while len(batch) < self._max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = self._process(batch)
+                now = time.time()
+                if (
+                    stop
+                    or now >= next_flush_time
+                    or any(item[0] == _FLUSH for item in batch)
+                ):
+                    self._flush_sinks()
+                    next_flush_time = now + self._flush_secs
+                for item in batch:
+                    if item[0] == _FLUSH:
+                        item[1].set()
+                if stop:
+                    return
+        except Exception as e:
+            self._exception = e
+            # Unblock any producers and flushes waiting on the queue.
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[0] == _FLUSH:
+                    item[1].set()
+
+    def _process(self, batch):
+        """Sends a batch of queued items to the sinks.
+
+        Returns:
+          Whether the batch contains the stop request.
+        """
+        metrics = [item for item in batch if item[0] == _METRIC]
+        summaries = [item for item in batch if item[0] == _SUMMARY]
+        values = _resolve(
+            [item[2] for item in metrics] + [item[2] for item in summaries]
+        )
+        metric_values = values[: len(metrics)]
+        if self.tensorboard_writer is not None:
+            for (_, _, _, step, wall_time, tag), value in zip(metrics, metric_values):
+                self.tensorboard_writer.add_scalar(tag, value, step, walltime=wall_time)
+        if self._mlflow_client is not None and metrics:
+            mlflow_metrics = [
+                Metric(name, value, int(wall_time * 1000), step)
+                for (_, name, _, step, wall_time, _), value in zip(
+                    metrics, metric_values
+                )
+            ]
+            for i in range(0, len(mlflow_metrics), _MLFLOW_MAX_METRICS_PER_BATCH):
+                self._mlflow_client.log_batch(
+                    self._mlflow_run_id,
+                    metrics=mlflow_metrics[i : i + _MLFLOW_MAX_METRICS_PER_BATCH],
+                )
+        for (_, name, _), value in zip(summaries, values[len(metrics) :]):
+            self._summary[name] = value
+            self._summary_dirty = True
+        return any(item[0] == _STOP for item in batch)
+
+    def _flush_sinks(self):
+        if self.tensorboard_writer is not None:
+            self.tensorboard_writer.flush()
+        if self._dvc_metrics_path is not None and self._summary_dirty:
+            directory = os.path.dirname(self._dvc_metrics_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Write a new file and move it into place, so that DVC never
+            # sees a partially written file.
+            temp_path = self._dvc_metrics_path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self._summary, f, indent=4)
+            os.replace(temp_path, self._dvc_metrics_path)
+            self._summary_dirty = False
+
+
+def _resolve(values):
+    """Converts logged values to Python floats.
+
+    All tensors on the same device are copied to the host with one
+    transfer, which waits for the device only once.
+    """
+    result = list(values)
+    by_device = {}
+    for i, value in enumerate(result):
+        if torch is not None and isinstance(value, torch.Tensor):
+            by_device.setdefault(value.device, []).append(i)
+        else:
+            result[i] = float(value)
+    for indices in by_device.values():
+        stacked = torch.stack([result[i].reshape(()).float() for i in indices])
+        for i, value in zip(indices, stacked.cpu().tolist()):
+            result[i] = value
+    return result
@@ -1,11 +1,12 @@
 import torch
 import mlflow
-import json
 import os
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, TrainingArguments, Trainer
 from datasets import load_dataset
 import evaluate
 
+from experiment_logger import ExperimentLogger
+
 
 def main():
     # 1. Load IndoNLI dataset
@@ -66,12 +67,11 @@ def main():
     print("Evaluating indoreoberta...")
     eval_results_roberta = trainer_roberta.evaluate()
     print(f"indoreoberta evaluation results: {eval_results_roberta}")
-    mlflow.log_metrics(eval_results_roberta)
-
-    # Save metrics for DVC
-    os.makedirs("metrics", exist_ok=True)
-    with open("metrics/roberta_metrics.json", "w") as f:
-        json.dump(eval_results_roberta, f, indent=4)
+    # Log to MLflow and save metrics for DVC in the background
+    logger = ExperimentLogger(dvc_metrics_path="metrics/roberta_metrics.json")
+    logger.log_metrics(eval_results_roberta)
+    logger.log_summary(eval_results_roberta)
+    logger.close()
 
     mlflow.end_run()
 
@@ -114,12 +114,11 @@ def main():
     print("Evaluating indoBERT...")
     eval_results_bert = trainer_bert.evaluate()
     print(f"indoBERT evaluation results: {eval_results_bert}")
-    mlflow.log_metrics(eval_results_bert)
-
-    # Save metrics for DVC
-    os.makedirs("metrics", exist_ok=True)
-    with open("metrics/bert_metrics.json", "w") as f:
-        json.dump(eval_results_bert, f, indent=4)
+    # Log to MLflow and save metrics for DVC in the background
+    logger = ExperimentLogger(dvc_metrics_path="metrics/bert_metrics.json")
+    logger.log_metrics(eval_results_bert)
+    logger.log_summary(eval_results_bert)
+    logger.close()
 
     mlflow.end_run()
 
@@ -129,82 +128,3 @@ if __name__ == "__main__":
     os.environ["CUDA_VISIBLE_DEVICES"] = "0"
 
     main()
-    )
-<<<<<<< HEAD
-
-    mlflow.start_run(run_name="indoreoberta-finetune")
-
-    trainer_roberta.train()
-    print("indoreoberta fine-tuning complete.")
-    print("Evaluating indoreoberta...")
-    eval_results_roberta = trainer_roberta.evaluate()
-    print(f"indoreoberta evaluation results: {eval_results_roberta}")
-    mlflow.log_metrics(eval_results_roberta)
-
-    # Save metrics for DVC
-    os.makedirs("metrics", exist_ok=True)
-    with open("metrics/roberta_metrics.json", "w") as f:
-        json.dump(eval_results_roberta, f, indent=4)
-
-    mlflow.end_run()
-
-    # 4. Fine-tune indoBERT
-    print("\n--- Fine-tuning indoBERT ---")
-    model_name_bert = "indobenchmark/indobert-base-p1"
-    tokenizer_bert = AutoTokenizer.from_pretrained(model_name_bert)
-    model_bert = AutoModelForSequenceClassification.from_pretrained(model_name_bert, num_labels=3)
-
-    tokenized_datasets_bert = dataset.map(lambda x: preprocess_function(x, tokenizer_bert), batched=True)
-
-    training_args_bert = TrainingArguments(
-        output_dir="./results_indobert",
-        eval_strategy="epoch",
-        save_strategy="epoch",
-        learning_rate=2e-5,
-        per_device_train_batch_size=16,
-        per_device_eval_batch_size=16,
-        num_train_epochs=1,  # CHANGED: Set to 1 epoch
-        weight_decay=0.01,
-        save_total_limit=1,
-        load_best_model_at_end=True,
-        metric_for_best_model="accuracy",
-        report_to=["mlflow", "tensorboard"],
-    )
-
-    trainer_bert = Trainer(
-        model=model_bert,
-        args=training_args_bert,
-        train_dataset=tokenized_datasets_bert["train"],
-        eval_dataset=tokenized_datasets_bert["validation"],
-        tokenizer=tokenizer_bert,
-        compute_metrics=compute_metrics,
-    )
-
-    mlflow.start_run(run_name="indobert-finetune")
-
-    trainer_bert.train()
-    print("indoBERT fine-tuning complete.")
-    print("Evaluating indoBERT...")
-    eval_results_bert = trainer_bert.evaluate()
-    print(f"indoBERT evaluation results: {eval_results_bert}")
-    mlflow.log_metrics(eval_results_bert)
-
-    # Save metrics for DVC
-    os.makedirs("metrics", exist_ok=True)
-    with open("metrics/bert_metrics.json", "w") as f:
-        json.dump(eval_results_bert, f, indent=4)
-
-    mlflow.end_run()
-=======
-    
-    # Log final results
-    logger.info(f"Best metric: {history['best_metric']:.4f} at epoch {history['best_epoch']}")
-    logger.info("Training completed!")
->>>>>>> 147e4c19ac7b1e058ebde56670c99049c449e4f9
-
-
-if __name__ == "__main__":
-    # ADD THIS LINE to prevent the out-of-memory error by only using the first GPU
-    os.environ["CUDA_VISIBLE_DEVICES"] = "0"
-
-    main()
\ No newline at end of file
@@ -1,14 +1,26 @@
+import argparse
+import time
+
 import torch
 import torch.nn as nn
 import numpy as np
 import mlflow
-from torch.utils.tensorboard import SummaryWriter
-import json
-import os
+
+from experiment_logger import ExperimentLogger
 
 # --- 1. Konfigurasi & Parameter ---
+parser = argparse.ArgumentParser()
+parser.add_argument("--epochs", type=int, default=100)
+parser.add_argument(
+    "--no-logging",
+    action="store_true",
+    help="Matikan logging metrik (untuk membandingkan langkah/detik).",
+)
+args = parser.parse_args()
+
 LEARNING_RATE = 0.01
-EPOCHS = 100
+EPOCHS = args.epochs
+LOGGING = not args.no_logging
 
 # --- 2. Buat Data Sintetis ---
 # y = 2x + 1 + noise
@@ -34,17 +46,22 @@ criterion = nn.MSELoss()
 optimizer = torch.optim.SGD(model.parameters(), lr=LEARNING_RATE)
 
 # --- 5. Setup Logging ---
-
-# Setup MLFlow
-mlflow.start_run(run_name="simple_linear_regression")
-mlflow.log_param("learning_rate", LEARNING_RATE)
-mlflow.log_param("epochs", EPOCHS)
-
-# Setup TensorBoard
-# Ini akan membuat direktori 'runs/simple_linear_regression'
-writer = SummaryWriter('runs/simple_linear_regression')
+if LOGGING:
+    # Setup MLFlow
+    mlflow.start_run(run_name="simple_linear_regression")
+    mlflow.log_param("learning_rate", LEARNING_RATE)
+    mlflow.log_param("epochs", EPOCHS)
+
+    # Satu logger untuk TensorBoard, MLFlow dan DVC. Logger ini akan membuat
+    # direktori 'runs/simple_linear_regression' dan menulis metrik dari
+    # thread latar belakang.
+    logger = ExperimentLogger(
+        tensorboard_dir='runs/simple_linear_regression',
+        dvc_metrics_path="metrics/simple_metrics.json",
+    )
 
 print("Memulai pelatihan model sederhana...")
+start_time = time.perf_counter()
 
 # --- 6. Training Loop ---
 for epoch in range(EPOCHS):
@@ -60,27 +77,25 @@ for epoch in range(EPOCHS):
     # Logging ke semua platform
     if (epoch + 1) % 10 == 0:
         print(f'Epoch [{epoch+1}/{EPOCHS}], Loss: {loss.item():.4f}')
-        
-        # Log ke MLFlow
-        mlflow.log_metric("loss", loss.item(), step=epoch)
-
-        # Log ke TensorBoard
-        writer.add_scalar("Loss/train", loss.item(), epoch)
 
-# --- 7. Selesaikan Logging ---
+        # Log ke MLFlow, TensorBoard dan DVC. Tensor loss diberikan langsung
+        # ke logger tanpa .item(); nilainya dibaca di thread latar belakang.
+        if LOGGING:
+            logger.log_metric("loss", loss, step=epoch, tensorboard_tag="Loss/train")
 
-# Tutup writer TensorBoard
-writer.close()
+elapsed = time.perf_counter() - start_time
+print(f"Kecepatan pelatihan: {EPOCHS / elapsed:.1f} langkah/detik")
 
-# Simpan metrik akhir untuk DVC
-final_metrics = {'final_loss': loss.item()}
-os.makedirs("metrics", exist_ok=True)
-with open("metrics/simple_metrics.json", "w") as f:
-    json.dump(final_metrics, f, indent=4)
+# --- 7. Selesaikan Logging ---
+if LOGGING:
+    # Simpan metrik akhir untuk DVC
+    logger.log_summary({'final_loss': loss})
 
-print("Metrik akhir disimpan untuk DVC di metrics/simple_metrics.json")
+    # Tunggu semua metrik tertulis, lalu tutup writer TensorBoard
+    logger.close()
+    print("Metrik akhir disimpan untuk DVC di metrics/simple_metrics.json")
 
-# Akhiri run MLFlow
-mlflow.end_run()
+    # Akhiri run MLFlow
+    mlflow.end_run()
 
 print("Pelatihan selesai. Semua log telah disimpan.")